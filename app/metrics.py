@@ -0,0 +1,298 @@
+# app/metrics.py
+
+import functools
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# gecikme histogramı üst sınırları (saniye)
+LATENCY_BUCKETS = (
+    1e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 0.1, 0.5, 1.0, 5.0,
+)
+# taranan / döndürülen kayıt sayısı histogramı üst sınırları
+SIZE_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+class Histogram:
+    """ Sabit sınırlı histogram: kova sayıları, toplam ve adet """
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # son kova: +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """ Prometheus biçiminde (le, kümülatif adet) çiftleri """
+        result = []
+        running = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            running += count
+            result.append(("+Inf" if bound == float("inf") else repr(bound), running))
+        return result
+
+
+class MethodStats:
+    """ Bir metodun çağrı, hata sayısı ve gecikme / kayıt sayısı histogramları """
+
+    __slots__ = ("calls", "errors", "latency", "scanned", "returned")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.scanned: Optional[Histogram] = None
+        self.returned: Optional[Histogram] = None
+
+
+class MetricsRegistry:
+    """
+    Servis ve repository metotları için isteğe bağlı (opt-in) ölçüm.
+
+    instrument(nesne) nesnenin public metotlarını yalnızca o nesne
+    üzerinde (örnek özniteliği olarak) sarar; çağrı sayısı, hata sayısı ve
+    gecikme histogramı tutulur. Liste/sözlük döndüren metotlarda sonuç
+    boyutu, sınıfın _metric_scans listesindeki metotlarda ayrıca çağrı
+    öncesinde dolaşılacak koleksiyonun boyutu (erken çıkan aramalarda üst
+    sınır) kaydedilir; O(n) yollar böylece doğrudan görülür.
+
+    _metric_scans metot adlarından oluşan bir demet (boyut count() ile
+    alınır) ya da metot adı -> boyut metodu adı (None: count()) sözlüğüdür.
+    Boyut metodu ölçülen metotla aynı argümanları alır; ör. yalnızca aktif
+    hasta kovalarını dolaşan bir çağrı toplam hasta sayısı yerine o
+    kovaların boyutunu bildirir.
+
+    Ölçülmeyen nesnelerde hiçbir değişiklik olmaz, yani ölçüm kapalıyken ek
+    maliyet yoktur; uninstrument ile sarmalar kaldırılır.
+
+    render() tüm metrikleri Prometheus metin biçiminde döndürür,
+    MetricsDumper bunu periyodik olarak dosyaya yazar.
+    """
+
+    def __init__(self, namespace: str = "hospital"):
+        self._namespace = namespace
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], MethodStats] = {}
+        self._wrapped: Dict[int, Tuple[object, List[str]]] = {}
+
+    # ölçüm ekleme / kaldırma
+    def instrument(self, target, component: Optional[str] = None):
+        """ target'ın public metotlarını sarar ve target'ı döndürür.
+        component verilmezse sınıf adı (snake_case) kullanılır. """
+        component = component or _snake_case(type(target).__name__)
+        scans = getattr(type(target), "_metric_scans", ())
+        if not isinstance(scans, dict):
+            scans = dict.fromkeys(scans)
+        names = []
+        for name in dir(type(target)):
+            if name.startswith("_") or name in vars(target):
+                continue
+            attr = getattr(type(target), name)
+            if isinstance(attr, property) or not callable(attr):
+                continue
+            method = getattr(target, name)
+            scan_size = _scan_size(target, scans[name]) if name in scans else None
+            setattr(target, name, self._wrap(method, component, name, scan_size))
+            names.append(name)
+
+        with self._lock:
+            self._wrapped[id(target)] = (target, names)
+        return target
+
+    def uninstrument(self, target):
+        """ instrument ile eklenen sarmaları kaldırır """
+        with self._lock:
+            _, names = self._wrapped.pop(id(target), (None, ()))
+        for name in names:
+            vars(target).pop(name, None)
+
+    def _wrap(self, method: Callable, component: str, name: str, scan_size: Optional[Callable]):
+        stats = self._stats_for(component, name)
+        lock = self._lock
+        clock = time.perf_counter
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            scanned = scan_size(*args, **kwargs) if scan_size is not None else None
+            start = clock()
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                elapsed = clock() - start
+                with lock:
+                    stats.calls += 1
+                    stats.errors += 1
+                    stats.latency.observe(elapsed)
+                raise
+            elapsed = clock() - start
+
+            returned = len(result) if isinstance(result, (list, dict, tuple)) else None
+            with lock:
+                stats.calls += 1
+                stats.latency.observe(elapsed)
+                if scanned is not None:
+                    if stats.scanned is None:
+                        stats.scanned = Histogram(SIZE_BUCKETS)
+                    stats.scanned.observe(scanned)
+                if returned is not None:
+                    if stats.returned is None:
+                        stats.returned = Histogram(SIZE_BUCKETS)
+                    stats.returned.observe(returned)
+            return result
+
+        return wrapper
+
+    def _stats_for(self, component: str, name: str) -> MethodStats:
+        with self._lock:
+            stats = self._stats.get((component, name))
+            if stats is None:
+                stats = self._stats[component, name] = MethodStats()
+            return stats
+
+    # okuma
+    def stats(self, component: str, method: str) -> Optional[MethodStats]:
+        return self._stats.get((component, method))
+
+    def reset(self):
+        """ Tüm sayaçları sıfırlar (sarmalar yerinde kalır) """
+        with self._lock:
+            for stats in self._stats.values():
+                stats.__init__()
+
+    def render(self) -> str:
+        """ Metrikleri Prometheus metin biçiminde döndürür """
+        ns = self._namespace
+        with self._lock:
+            rows = [
+                (component, method, stats.calls, stats.errors,
+                 stats.latency.cumulative(), stats.latency.total,
+                 _snapshot(stats.scanned), _snapshot(stats.returned))
+                for (component, method), stats in sorted(self._stats.items())
+            ]
+
+        lines = [
+            f"# HELP {ns}_calls_total Metot çağrı sayısı",
+            f"# TYPE {ns}_calls_total counter",
+        ]
+        lines += [
+            f'{ns}_calls_total{_labels(c, m)} {calls}'
+            for c, m, calls, *_ in rows
+        ]
+        lines += [
+            f"# HELP {ns}_errors_total Hata ile biten çağrı sayısı",
+            f"# TYPE {ns}_errors_total counter",
+        ]
+        lines += [
+            f'{ns}_errors_total{_labels(c, m)} {errors}'
+            for c, m, _, errors, *_ in rows
+        ]
+
+        lines += [
+            f"# HELP {ns}_call_duration_seconds Metot çağrı süresi",
+            f"# TYPE {ns}_call_duration_seconds histogram",
+        ]
+        for c, m, calls, _, buckets, total, _, _ in rows:
+            lines += _histogram_lines(f"{ns}_call_duration_seconds", c, m, buckets, total, calls)
+
+        for metric, index, help_text in (
+            ("scanned_records", 6, "Metodun dolaştığı koleksiyonun boyutu"),
+            ("returned_records", 7, "Metodun döndürdüğü kayıt sayısı"),
+        ):
+            sized = [row for row in rows if row[index] is not None]
+            if not sized:
+                continue
+            lines += [
+                f"# HELP {ns}_{metric} {help_text}",
+                f"# TYPE {ns}_{metric} histogram",
+            ]
+            for row in sized:
+                buckets, total, count = row[index]
+                lines += _histogram_lines(f"{ns}_{metric}", row[0], row[1], buckets, total, count)
+
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str):
+        """ Metrikleri dosyaya yazar (geçici dosya + yer değiştirme) """
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+
+class MetricsDumper:
+    """
+    Kayıt defterindeki metrikleri interval saniyede bir Prometheus metin
+    dosyasına (ör. node_exporter textfile collector dizini) yazan arka
+    plan iş parçacığı. close() son durumu da yazar.
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: str, interval: float = 15.0):
+        self._registry = registry
+        self._path = path
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.wait(self._interval):
+            self._registry.write(self._path)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self._registry.write(self._path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# yardımcı fonksiyonlar
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def _scan_size(target, size_name: Optional[str]) -> Callable:
+    """ Ölçülen metodun argümanlarıyla çağrılıp dolaşılacak kayıt sayısını
+    döndüren fonksiyon. Metotlar sınıf üzerinden çağrılır; sarılmışlarsa
+    ölçüme karışmaz. """
+    if size_name is None:
+        count = type(target).count
+        return lambda *args, **kwargs: count(target)
+    return functools.partial(getattr(type(target), size_name), target)
+
+
+def _labels(component: str, method: str, **extra) -> str:
+    pairs = [("component", component), ("method", method)] + list(extra.items())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+
+
+def _snapshot(histogram: Optional[Histogram]):
+    if histogram is None:
+        return None
+    return histogram.cumulative(), histogram.total, histogram.count
+
+
+def _histogram_lines(metric: str, component: str, method: str, buckets, total, count) -> List[str]:
+    lines = [
+        f"{metric}_bucket{_labels(component, method, le=le)} {value}"
+        for le, value in buckets
+    ]
+    lines.append(f"{metric}_sum{_labels(component, method)} {total!r}")
+    lines.append(f"{metric}_count{_labels(component, method)} {count}")
+    return lines
@@ -0,0 +1,281 @@
+# app/modules/patient/analytics.py
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsiyonel bir bağımlılıktır
+    np = None
+
+from .base import PatientBase
+from .emergency_patient import EmergencyPatient
+from .storage import PatientStorage
+
+
+_NO_TIME = 2 ** 63 - 1
+_HOUR_US = 3600 * 1_000_000
+
+
+class PatientAnalytics:
+    """
+    Durum geçmişleri üzerinde vektörel yatış süresi ve geçiş analizleri.
+
+    Tüm hastaların durum geçmişi tek bir geçiş tablosunda tutulur:
+    kayıt (satır) numarası, durum kodu ve epoch mikrosaniye zaman. Her
+    kaydın geçişleri ardışık ve zaman sıralıdır; starts[i]:starts[i + 1]
+    i. kaydın geçişleridir. Kayıt başına id, tip ve triyaj alanı ayrı
+    dizilerde tutulur.
+
+    Aynı id'ye sahip kayıtlar tek hasta sayılır. Acilden yatışa alınan
+    hasta tek yatan hasta kaydıdır: geçmişi acil durumlarıyla başlar,
+    yatış zamanı ilk "aktif" geçişidir (Inpatient.admitted_at). emergency
+    dizisi acil kaydı olan (acil hasta ya da acilden yatan) kayıtları işaretler.
+
+    Süreler saat cinsinden, group_by ile (None, "type", "triage_area")
+    grup etiketi -> dizi sözlüğü olarak döner. Hesaplar Python döngüsü
+    olmadan NumPy ile yapılır; yalnızca hasta nesnelerinden tabloyu
+    oluşturmak (from_patients) hasta başına döngü gerektirir.
+    """
+
+    _statuses = PatientBase._valid_statuses
+    _end_statuses = ("taburcu", "tamamlandı")
+    _all_label = "tümü"
+
+    def __init__(
+        self,
+        ids,
+        kinds,
+        areas,
+        starts,
+        codes,
+        times,
+        kind_labels: Sequence[str],
+        area_labels: Sequence[str],
+        emergency=None
+    ):
+        if np is None:
+            raise ImportError("PatientAnalytics için numpy kurulu olmalıdır")
+
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.kinds = np.asarray(kinds, dtype=np.int8)
+        self.areas = np.asarray(areas, dtype=np.int8)
+        self.starts = np.asarray(starts, dtype=np.int64)
+        self.codes = np.asarray(codes, dtype=np.int8)
+        self.times = np.asarray(times, dtype=np.int64)
+        self.kind_labels = list(kind_labels)
+        self.area_labels = list(area_labels)
+        self.emergency = (
+            self._kind_mask("EmergencyPatient") if emergency is None
+            else np.asarray(emergency, dtype=bool)
+        )
+
+        if len(self.starts) != len(self.ids) + 1 or self.starts[-1] != len(self.codes):
+            raise ValueError("Kayıt başlangıçları geçiş tablosuyla uyumsuz")
+
+        # geçiş -> kayıt numarası
+        self.rows = np.repeat(
+            np.arange(len(self.ids), dtype=np.int32), np.diff(self.starts)
+        )
+        # kayıt -> hasta (aynı id'li kayıtlar tek hasta)
+        self._patient_ids, self._keys = np.unique(self.ids, return_inverse=True)
+
+    @classmethod
+    def from_patients(cls, patients: Iterable[PatientBase]) -> "PatientAnalytics":
+        """ Hasta nesnelerinden geçiş tablosu oluşturur """
+        if np is None:
+            raise ImportError("PatientAnalytics için numpy kurulu olmalıdır")
+
+        kind_labels: List[str] = []
+        kind_codes: Dict[type, int] = {}
+        area_labels: List[str] = []
+        area_codes: Dict[str, int] = {}
+
+        ids = array("q")
+        kinds = array("b")
+        areas = array("b")
+        emergency = array("b")
+        lengths = array("q")
+        log = array("q")
+
+        for patient in patients:
+            kind = kind_codes.get(patient.__class__)
+            if kind is None:
+                kind = kind_codes[patient.__class__] = len(kind_labels)
+                kind_labels.append(patient.__class__.__name__)
+
+            record = getattr(patient, "emergency_record", None)
+            if record is not None:
+                area = record.triage_area
+            else:
+                area = getattr(patient, "triage_area", None)
+            if area is not None:
+                code = area_codes.get(area)
+                if code is None:
+                    code = area_codes[area] = len(area_labels)
+                    area_labels.append(area)
+                area = code
+
+            ids.append(patient.patient_id)
+            kinds.append(kind)
+            areas.append(-1 if area is None else area)
+            emergency.append(record is not None or isinstance(patient, EmergencyPatient))
+            lengths.append(len(patient._status_log))
+            log.extend(patient._status_log)
+
+        packed = np.frombuffer(log, dtype=np.int64)
+        bits = PatientBase._status_code_bits
+        starts = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(np.frombuffer(lengths, dtype=np.int64), out=starts[1:])
+
+        return cls(
+            np.frombuffer(ids, dtype=np.int64),
+            np.frombuffer(kinds, dtype=np.int8),
+            np.frombuffer(areas, dtype=np.int8),
+            starts,
+            (packed & ((1 << bits) - 1)).astype(np.int8),
+            packed >> bits,
+            kind_labels,
+            area_labels,
+            np.frombuffer(emergency, dtype=np.int8).astype(bool),
+        )
+
+    @classmethod
+    def from_storage(cls, storage: PatientStorage) -> "PatientAnalytics":
+        return cls.from_patients(storage.list_all())
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    # analizler
+    def length_of_stay(self, group_by: Optional[str] = None) -> Dict[str, "np.ndarray"]:
+        """ İlk durum kaydından ilk taburcu/tamamlandı durumuna kadar geçen
+        süre (saat). Henüz bitmemiş yatışlar dahil edilmez. """
+        first = self._per_patient(np.minimum, self.times[self.starts[:-1]], _NO_TIME)
+        end = self._per_patient(np.minimum, self._first_time_of(self._end_statuses), _NO_TIME)
+        done = end != _NO_TIME
+        return self._group((end - first) / _HOUR_US, done, group_by)
+
+    def time_to_stabilize(self, group_by: Optional[str] = None) -> Dict[str, "np.ndarray"]:
+        """ Acil kaydı olan hastaların ilk kayıttan ilk "stabil" durumuna
+        süresi (saat); acilden yatışa alınanlar dahildir """
+        emergency = self.emergency
+        row_first = self.times[self.starts[:-1]]
+        stable = self._first_time_of(("stabil",))
+        rows = emergency & (stable != _NO_TIME)
+        first = self._per_patient(np.minimum, np.where(emergency, row_first, _NO_TIME), _NO_TIME)
+        stabilized = self._per_patient(np.minimum, np.where(rows, stable, _NO_TIME), _NO_TIME)
+        done = stabilized != _NO_TIME
+        return self._group((stabilized - first) / _HOUR_US, done, group_by)
+
+    def time_to_admission(self, group_by: Optional[str] = None) -> Dict[str, "np.ndarray"]:
+        """ Acilden yatışa alınan hastaların ilk "acil" durumundan yatışa
+        (acil geçmişinden sonraki ilk "aktif" durumuna) kadar süresi (saat) """
+        admitted_rows = self.emergency & self._kind_mask("Inpatient")
+        acil = self._first_time_of(("acil",))
+        active = self._first_time_of(("aktif",))
+
+        arrived = self._per_patient(
+            np.minimum, np.where(self.emergency, acil, _NO_TIME), _NO_TIME
+        )
+        admitted = self._per_patient(
+            np.minimum, np.where(admitted_rows, active, _NO_TIME), _NO_TIME
+        )
+        done = (arrived != _NO_TIME) & (admitted != _NO_TIME) & (admitted >= arrived)
+        return self._group((admitted - arrived) / _HOUR_US, done, group_by)
+
+    def readmission_rate(
+        self, window_days: float = 30, group_by: Optional[str] = None
+    ) -> Dict[str, float]:
+        """ Taburcu olan hastalardan window_days içinde tekrar aktif/acil
+        duruma geçenlerin oranı """
+        codes = PatientBase._status_codes
+        discharged = self.codes == codes["taburcu"]
+        active = np.isin(self.codes, [codes[s] for s in PatientBase._active_statuses])
+
+        # aynı kayıtta taburcu -> aktif geçişi ve arada geçen süre
+        same_row = self.rows[1:] == self.rows[:-1]
+        returns = (
+            same_row & discharged[:-1] & active[1:]
+            & (np.diff(self.times) <= window_days * 24 * _HOUR_US)
+        )
+        readmitted_rows = np.zeros(len(self.ids), dtype=bool)
+        readmitted_rows[self.rows[1:][returns]] = True
+        discharged_rows = np.zeros(len(self.ids), dtype=bool)
+        discharged_rows[self.rows[discharged]] = True
+
+        readmitted = self._per_patient(np.maximum, readmitted_rows, False)
+        ever_discharged = self._per_patient(np.maximum, discharged_rows, False)
+
+        labels, groups = self._patient_groups(group_by)
+        rates = {}
+        for code, label in enumerate(labels):
+            member = (groups == code) & ever_discharged
+            total = int(member.sum())
+            rates[label] = float(readmitted[member].sum() / total) if total else 0.0
+        return rates
+
+    @staticmethod
+    def summarize(durations: Dict[str, "np.ndarray"]) -> Dict[str, Dict[str, float]]:
+        """ Grup başına adet, ortalama, medyan, 90. yüzdelik ve en büyük değer """
+        summary = {}
+        for label, values in durations.items():
+            if len(values):
+                p50, p90 = np.percentile(values, (50, 90))
+                summary[label] = {
+                    "count": len(values), "mean": float(values.mean()),
+                    "median": float(p50), "p90": float(p90), "max": float(values.max()),
+                }
+            else:
+                summary[label] = {"count": 0}
+        return summary
+
+    # yardımcı metotlar
+    def _kind_mask(self, name: str):
+        if name not in self.kind_labels:
+            return np.zeros(len(self.ids), dtype=bool)
+        return self.kinds == self.kind_labels.index(name)
+
+    def _first_time_of(self, statuses: Sequence[str]):
+        """ Kayıt başına verilen durumlardan birine ilk geçiş zamanı """
+        wanted = [PatientBase._status_codes[s] for s in statuses]
+        index = np.flatnonzero(np.isin(self.codes, wanted))
+        rows = self.rows[index]
+        first = np.ones(len(rows), dtype=bool)
+        first[1:] = rows[1:] != rows[:-1]
+
+        result = np.full(len(self.ids), _NO_TIME, dtype=np.int64)
+        result[rows[first]] = self.times[index[first]]
+        return result
+
+    def _per_patient(self, ufunc, row_values, initial):
+        """ Kayıt değerlerini aynı id'li kayıtlar üzerinden birleştirir """
+        result = np.full(len(self._patient_ids), initial, dtype=np.asarray(row_values).dtype)
+        ufunc.at(result, self._keys, row_values)
+        return result
+
+    def _patient_groups(self, group_by: Optional[str]):
+        """ (etiketler, hasta başına grup kodu) döndürür; tip hastanın son
+        kaydından, triyaj alanı ise alanı olan kaydından alınır. """
+        if group_by is None:
+            return [self._all_label], np.zeros(len(self._patient_ids), dtype=np.int64)
+        if group_by == "type":
+            last_row = self._per_patient(
+                np.maximum, np.arange(len(self.ids), dtype=np.int64), -1
+            )
+            return self.kind_labels, self.kinds[last_row].astype(np.int64)
+        if group_by == "triage_area":
+            area = self._per_patient(np.maximum, self.areas, -1).astype(np.int64)
+            labels = self.area_labels + ["-"]
+            return labels, np.where(area < 0, len(labels) - 1, area)
+        raise ValueError(f"Geçersiz gruplama: {group_by}")
+
+    def _group(self, values, mask, group_by: Optional[str]) -> Dict[str, "np.ndarray"]:
+        labels, groups = self._patient_groups(group_by)
+        values, groups = values[mask], groups[mask]
+        order = np.argsort(groups, kind="stable")
+        bounds = np.searchsorted(groups[order], np.arange(len(labels) + 1))
+        return {
+            label: values[order[bounds[i]:bounds[i + 1]]]
+            for i, label in enumerate(labels)
+        }
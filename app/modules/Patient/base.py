@@ -1,31 +1,66 @@
 # app/modules/patient/base.py
 
+import time
 from abc import ABC, abstractmethod
+from array import array
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .text import turkish_capitalize, turkish_title
 
 
 class PatientBase(ABC):
     """
     Soyut Hasta Sınıfı
     Tüm hasta tipleri için ortak davranışları ve kuralları içerir.
+
+    Bellek kullanımı için __slots__ kullanılır. Durum geçmişi tek bir
+    array('q') içinde tutulur: her kayıt (epoch mikrosaniye << 3) | durum kodu.
+
+    Her alan değişikliğinde (_notify) artan bir sürüm numarası tutulur.
+    detailed_info ve summary_line metinleri bu sürümle önbelleğe alınır;
+    hasta değişmediği sürece tekrar oluşturulmaz.
     """
 
+    __slots__ = (
+        "_patient_id", "_watchers", "_name", "_age", "_gender",
+        "_status", "_status_log", "_version", "_rendered",
+        "__weakref__",  # depolamaların zayıf kimlik haritaları için
+    )
+
     # class attributes
     _hospital_name = "Ada Hospital"
     
     # sistemde geçerli hasta durumları
     _valid_statuses = ("aktif", "acil", "stabil", "taburcu", "iptal", "tamamlandı")
 
+    # aktif bakım sürecindeki durumlar
+    _active_statuses = ("aktif", "acil", "stabil")
+
+    # durum geçmişinde kullanılan kodlar (3 bit)
+    _status_codes = {s: i for i, s in enumerate(_valid_statuses)}
+    _status_code_bits = 3
+
+    # tip adı (küçük harf) -> hasta sınıfı, from_dict tip seçimi için
+    _registry: dict = {}
+
     def __init__(self, patient_id: Optional[int], name: str, age: int, gender: str, status: str = "aktif"):
         self._patient_id = patient_id
+        self._watchers: Tuple[Callable, ...] = ()
+        self._version = 0
+        self._rendered: Optional[Tuple[int, Dict[str, str]]] = None
+        self._name = self._age = self._gender = None
         self.name = name                  
         self.age = age                   
         self.gender = gender
         self._status = None
-        self._status_history: list[tuple[str, datetime]] = []
+        self._status_log = array("q")
         self.update_status(status)
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        PatientBase._registry[cls.__name__.lower()] = cls
+
     # property metotları
     @property
     def patient_id(self) -> Optional[int]:
@@ -39,7 +74,7 @@ class PatientBase(ABC):
     def name(self, value: str):
         if not value or not value.strip():
             raise ValueError("İsim alanı boş bırakılamaz")
-        self._name = self.normalize_name(value)
+        self._set_field("_name", "name", self.normalize_name(value))
 
     @property
     def age(self) -> int:
@@ -49,7 +84,7 @@ class PatientBase(ABC):
     def age(self, value: int):
         if not self.validate_age(value):
             raise ValueError("Geçersiz yaş değeri")
-        self._age = value
+        self._set_field("_age", "age", value)
 
     @property
     def gender(self) -> str:
@@ -57,9 +92,10 @@ class PatientBase(ABC):
 
     @gender.setter
     def gender(self, value: str):
-        if value.capitalize() not in ("Erkek", "Kadın"):
+        value = turkish_capitalize(value.strip())
+        if value not in ("Erkek", "Kadın"):
             raise ValueError("Geçersiz cinsiyet")
-        self._gender = value.capitalize()
+        self._set_field("_gender", "gender", value)
     
     @property
     def status(self) -> str:
@@ -68,15 +104,63 @@ class PatientBase(ABC):
     # durum yönetimi
     def update_status(self, new_status: str):
         """ Hasta durumunu günceller ve geçmişe kaydeder """
-        if new_status not in self._valid_statuses:
+        code = self._status_codes.get(new_status)
+        if code is None:
             raise ValueError(f"Geçersiz hasta durumu: {new_status}")
 
-        self._status = new_status
-        self._status_history.append((new_status, datetime.now()))
+        old_status = self._status
+        self._status = self._valid_statuses[code]
+        self._status_log.append(
+            (time.time_ns() // 1000) << self._status_code_bits | code
+        )
+        self._notify("status", old_status, self._status)
 
-    def get_status_history(self):
+    def get_status_history(self) -> List[Tuple[str, datetime]]:
         """ Hastanın tüm durum geçmişini döndürür """
-        return list(self._status_history)
+        return [
+            (self._valid_statuses[code], self._from_epoch_us(micros))
+            for code, micros in self.iter_status_log()
+        ]
+
+    def iter_status_log(self):
+        """ Durum geçmişini ham (durum kodu, epoch mikrosaniye) çiftleri olarak verir """
+        mask = (1 << self._status_code_bits) - 1
+        for value in self._status_log:
+            yield value & mask, value >> self._status_code_bits
+
+    @staticmethod
+    def _from_epoch_us(micros: int) -> datetime:
+        seconds, micro = divmod(micros, 1_000_000)
+        return datetime.fromtimestamp(seconds).replace(microsecond=micro)
+
+    # değişiklik bildirimi
+    def add_watcher(self, watcher: Callable):
+        """ watcher(hasta, alan, eski, yeni) şeklinde çağrılacak dinleyici ekler """
+        self._watchers += (watcher,)
+
+    def remove_watcher(self, watcher: Callable):
+        """ Daha önce eklenen dinleyiciyi kaldırır """
+        watchers = list(self._watchers)
+        watchers.remove(watcher)
+        self._watchers = tuple(watchers)
+
+    def _notify(self, field: str, old_value, new_value):
+        """ Alan değişikliğini dinleyicilere bildirir, sürümü artırır """
+        self._version += 1
+        for watcher in self._watchers:
+            watcher(self, field, old_value, new_value)
+
+    def _assign_id(self, patient_id: int):
+        """ Depolamanın ürettiği ID'yi atar (kayıt öncesi, bildirim yapılmaz) """
+        self._patient_id = patient_id
+        self._version += 1
+
+    def _set_field(self, attr: str, field: str, value):
+        """ Alanı değiştirir, değer farklıysa bildirim yapar """
+        old_value = getattr(self, attr)
+        setattr(self, attr, value)
+        if old_value != value:
+            self._notify(field, old_value, value)
 
     # abstract metotlar
     @abstractmethod
@@ -96,15 +180,68 @@ class PatientBase(ABC):
 
     @classmethod
     def from_dict(cls, data: dict):
-        """ Dictionary üzerinden hasta oluşturur """
+        """ Dictionary üzerinden hasta oluşturur.
+        PatientBase üzerinden çağrılırsa "type" alanına göre alt sınıf seçilir """
+        if cls is PatientBase:
+            return cls.resolve_type(data.get("type")).from_dict(data)
+
         return cls(
-            patient_id=data["patient_id"],
+            patient_id=data.get("patient_id"),
             name=data["name"],
             age=data["age"],
             gender=data["gender"],
             status=data.get("status", "aktif"),
         )
 
+    def to_dict(self) -> dict:
+        """ Hastayı tekrar oluşturulabilir bir dictionary'ye çevirir.
+        status_log, durum geçmişinin ham (paketlenmiş) halidir. """
+        return {
+            "type": self.__class__.__name__,
+            "patient_id": self._patient_id,
+            "name": self._name,
+            "age": self._age,
+            "gender": self._gender,
+            "status": self._status,
+            "status_log": self._status_log.tolist(),
+        }
+
+    @classmethod
+    def restore(cls, data: dict):
+        """ to_dict çıktısından doğrulama yapmadan hasta oluşturur.
+        Depolama katmanları (veritabanı, journal, snapshot) için kullanılır. """
+        if cls is PatientBase:
+            return cls.resolve_type(data["type"]).restore(data)
+
+        patient = cls.__new__(cls)
+        patient._restore_state(data)
+        return patient
+
+    def _restore_state(self, data: dict):
+        self._patient_id = data["patient_id"]
+        self._watchers = ()
+        self._version = 0
+        self._rendered = None
+        self._name = data["name"]
+        self._age = data["age"]
+        self._gender = data["gender"]
+        self._status = self._valid_statuses[self._status_codes[data["status"]]]
+
+        log = data.get("status_log", ())
+        if isinstance(log, (bytes, bytearray, memoryview)):
+            self._status_log = array("q")
+            self._status_log.frombytes(log)
+        else:
+            self._status_log = array("q", log)
+
+    @classmethod
+    def resolve_type(cls, type_name: Optional[str]) -> type:
+        """ Tip adından hasta sınıfını bulur (büyük/küçük harf duyarsız) """
+        patient_cls = cls._registry.get(str(type_name or "").lower())
+        if patient_cls is None:
+            raise ValueError(f"Geçersiz hasta tipi: {type_name}")
+        return patient_cls
+
     # static metotlar
     @staticmethod
     def validate_age(age: int) -> bool:
@@ -112,21 +249,42 @@ class PatientBase(ABC):
 
     @staticmethod
     def normalize_name(name: str) -> str:
-        return name.strip().title()
+        return turkish_title(name)
 
     def is_active(self) -> bool:
         """ Hastanın aktif bakım sürecinde olup olmadığını döndürür """
-        return self._status in ("aktif", "acil", "stabil")
+        return self._status in self._active_statuses
 
     # yardımcı fonksiyon
     def __lt__(self, other):
         """ Önceliğe göre karşılaştırma """
         return self.get_priority() < other.get_priority()
     
+    @property
+    def version(self) -> int:
+        """ Her alan değişikliğinde artan sürüm numarası """
+        return self._version
+
     def detailed_info(self) -> str:
         """
-        Hastaya ait temel bilgileri alt alta döndürür.
+        Hastaya ait bilgileri alt alta döndürür (sürüm değişene kadar önbellekten).
         """
+        return self._view("info", self._render_info)
+
+    def summary_line(self) -> str:
+        """ Liste görünümü için tek satırlık özet (sürüm değişene kadar önbellekten) """
+        return self._view("line", self._render_line)
+
+    def _view(self, name: str, render: Callable[[], str]) -> str:
+        cached = self._rendered
+        if cached is None or cached[0] != self._version:
+            cached = self._rendered = (self._version, {})
+        text = cached[1].get(name)
+        if text is None:
+            text = cached[1][name] = render()
+        return text
+
+    def _render_info(self) -> str:
         return (
             f"Hasta ID      : {self.patient_id}\n"
             f"İsim          : {self.name}\n"
@@ -134,4 +292,16 @@ class PatientBase(ABC):
             f"Cinsiyet      : {self.gender}\n"
             f"Durum         : {self.status}"
         )
+
+    def _render_line(self) -> str:
+        room_info, emergency_info = self._line_details()
+        return (
+            f"ID={self.patient_id} | {self.name} | Yaş={self.age} | "
+            f"Cinsiyet={self.gender} | Durum={self.status} | "
+            f"{room_info} | {emergency_info}"
+        )
+
+    def _line_details(self) -> Tuple[str, str]:
+        """ Liste satırındaki (oda, acil) sütunları """
+        return "-", "-"
     
\ No newline at end of file
@@ -0,0 +1,367 @@
+# app/modules/patient/census.py
+
+import heapq
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime
+from operator import itemgetter
+from typing import Dict, List, Optional, Tuple
+
+from .base import PatientBase
+from .storage import PatientStorage
+
+
+class CensusSummary:
+    """
+    Anlık hasta sayımları:
+    - total: toplam hasta
+    - active: taburcu edilmemiş hasta
+    - emergency: taburcu edilmemiş acil hasta
+    - inpatients: yatan hasta kaydı (taburcu edilenler dahil)
+    - by_status: duruma göre hasta sayısı
+    - by_triage_area: taburcu edilmemiş acil hastaların triyaj alanına göre sayısı
+    """
+
+    def __init__(
+        self,
+        total: int,
+        active: int,
+        emergency: int,
+        inpatients: int,
+        by_status: Dict[str, int],
+        by_triage_area: Dict[str, int]
+    ):
+        self.total = total
+        self.active = active
+        self.emergency = emergency
+        self.inpatients = inpatients
+        self.by_status = by_status
+        self.by_triage_area = by_triage_area
+
+    def __repr__(self):
+        return (
+            f"CensusSummary(total={self.total}, active={self.active}, "
+            f"emergency={self.emergency}, inpatients={self.inpatients})"
+        )
+
+
+class PatientCensus:
+    """
+    Depolamaya gözlemci olarak bağlanan canlı sayaçlar.
+
+    Tip, durum, tip + durum ve triyaj alanı sayaçları kayıt, silme, durum
+    ve triyaj değişikliklerinde artırılıp azaltılır; summary() nüfustan
+    bağımsız olarak sabit sürede döner. Bildirimler depolamanın kilidi
+    altında geldiği için summary() da aynı kilitle tutarlı bir anlık
+    görüntü alır.
+    """
+
+    _discharged = "taburcu"
+    _emergency_type = "EmergencyPatient"
+
+    def __init__(self, storage: PatientStorage):
+        self._storage = storage
+        self._total = 0
+        self._by_type: Counter = Counter()
+        self._by_status: Counter = Counter()
+        self._by_type_status: Counter = Counter()
+        self._by_area: Counter = Counter()
+
+        with storage.lock:
+            self._load()
+            storage.attach_observer(self)
+
+    def detach(self):
+        self._storage.detach_observer(self)
+
+    def summary(self) -> CensusSummary:
+        with self._storage.lock:
+            emergency_type = self._emergency_type
+            return CensusSummary(
+                total=self._total,
+                active=self._total - self._by_status[self._discharged],
+                emergency=(
+                    self._by_type[emergency_type]
+                    - self._by_type_status[emergency_type, self._discharged]
+                ),
+                inpatients=self._by_type["Inpatient"],
+                by_status={s: n for s, n in self._by_status.items() if n},
+                by_triage_area={a: n for a, n in self._by_area.items() if n},
+            )
+
+    # repository gözlemci metotları
+    def on_patient_added(self, patient: PatientBase):
+        self._count(patient, patient.status, 1)
+
+    def on_patient_removed(self, patient: PatientBase):
+        self._count(patient, patient.status, -1)
+
+    def on_patient_changed(self, patient: PatientBase, field: str, old, new):
+        if field == "status":
+            kind = patient.__class__.__name__
+            self._by_status[old] -= 1
+            self._by_status[new] += 1
+            self._by_type_status[kind, old] -= 1
+            self._by_type_status[kind, new] += 1
+            self._count_area(self._area_of(patient, old), -1)
+            self._count_area(self._area_of(patient, new), 1)
+        elif field == "triage_area" and patient.status != self._discharged:
+            self._count_area(old, -1)
+            self._count_area(new, 1)
+
+    # yardımcı metotlar
+    def _load(self):
+        """ Başlangıç sayımları. Tip + durum sayıları count_by ile alınır,
+        böylece SQLite/mmap depolamada hasta nesnesi oluşturulmaz; yalnızca
+        taburcu edilmemiş acil hastalar triyaj alanı için okunur. """
+        for cls in PatientBase._registry.values():
+            kind = cls.__name__
+            for status in PatientBase._valid_statuses:
+                count = self._storage.count_by((kind,), (status,))
+                if count:
+                    self._total += count
+                    self._by_type[kind] += count
+                    self._by_status[status] += count
+                    self._by_type_status[kind, status] += count
+
+        active = [s for s in PatientBase._valid_statuses if s != self._discharged]
+        for patient in self._storage.filter_by((self._emergency_type,), active):
+            self._count_area(patient.triage_area, 1)
+
+    def _count(self, patient: PatientBase, status: str, delta: int):
+        kind = patient.__class__.__name__
+        self._total += delta
+        self._by_type[kind] += delta
+        self._by_status[status] += delta
+        self._by_type_status[kind, status] += delta
+        self._count_area(self._area_of(patient, status), delta)
+
+    def _area_of(self, patient: PatientBase, status: str) -> Optional[str]:
+        """ Hasta verilen durumdayken sayıldığı triyaj alanı """
+        if status == self._discharged:
+            return None
+        return getattr(patient, "triage_area", None)
+
+    def _count_area(self, area: Optional[str], delta: int):
+        if area is not None:
+            self._by_area[area] += delta
+
+
+class StatusTimeline:
+    """
+    Tüm hastaların durum geçişlerini zamana göre sıralı tutan geçiş kaydı.
+
+    Her geçiş (zaman, hasta id, eski durum kodu, yeni durum kodu) olarak
+    paralel array'lerde tutulur; kayda eklenmemiş (ilk durum) ve silinmiş
+    hasta için kod -1'dir. Her block_size geçişte bir o ana kadarki durum
+    sayımları ve duruma giriş sayıları kaydedilir (checkpoint). Bir T anı
+    için sayım: bisect ile T'ye kadarki geçiş sayısı bulunur, önceki
+    checkpoint'ten itibaren en fazla block_size geçiş uygulanır; yani
+    O(log n + block_size), hasta geçmişlerini tekrar oynatmaya gerek yoktur.
+
+    Kayıt depolamaya gözlemci olarak bağlanır: eklenen hastanın mevcut
+    geçmişi, update_status ile gelen geçişler ve silinme (o anda durumdan
+    çıkış) kaydedilir; silinen hastaların geçmişi korunur. Zaman sırasına
+    uymayan geçişler (geçmişi olan hasta eklenmesi, iş parçacıkları
+    arasındaki küçük sapmalar) bekleme listesine alınır ve ilk sorguda
+    yalnızca etkilenen kuyruk yeniden sıralanır.
+    """
+
+    def __init__(self, storage: PatientStorage, block_size: int = 128):
+        self._storage = storage
+        self._block = block_size
+        self._statuses = PatientBase._valid_statuses
+        self._code_bits = PatientBase._status_code_bits
+        self._code_mask = (1 << self._code_bits) - 1
+
+        self._times = array("q")
+        self._ids = array("q")
+        self._old = array("b")
+        self._new = array("b")
+        self._checkpoints: List[Tuple[Tuple[int, ...], Tuple[int, ...]]] = []
+        self._levels = [0] * len(self._statuses)
+        self._entered = [0] * len(self._statuses)
+        self._pending: List[Tuple[int, int, int, int]] = []
+
+        # hasta id -> ilk geçmiş kaydı (aynı hastanın yeniden eklenmesini ayırt etmek için)
+        self._seen: Dict[int, int] = {}
+
+        with storage.lock:
+            for patient in storage.list_all():
+                self.on_patient_added(patient)
+            storage.attach_observer(self)
+
+    def __len__(self) -> int:
+        return len(self._times) + len(self._pending)
+
+    def detach(self):
+        self._storage.detach_observer(self)
+
+    # sorgular
+    def census_at(self, when: datetime) -> Dict[str, int]:
+        """ when anında her durumda bulunan hasta sayısı """
+        with self._storage.lock:
+            self._settle()
+            levels, _ = self._state_at(bisect_right(self._times, self._micros(when)))
+        return dict(zip(self._statuses, levels))
+
+    def census_between(self, start: datetime, end: datetime) -> Dict[str, int]:
+        """ [start, end] aralığında her durumda bulunmuş hasta sayısı:
+        start anındaki sayım + aralıkta o duruma giriş sayısı. Aralıkta aynı
+        duruma birden fazla giren hasta her girişinde sayılır. """
+        with self._storage.lock:
+            self._settle()
+            first = bisect_right(self._times, self._micros(start))
+            last = bisect_right(self._times, self._micros(end), first)
+            levels, entered_before = self._state_at(first)
+            _, entered_after = self._state_at(last)
+        return {
+            status: levels[code] + entered_after[code] - entered_before[code]
+            for code, status in enumerate(self._statuses)
+        }
+
+    def transitions_between(
+        self, start: datetime, end: datetime
+    ) -> List[Tuple[datetime, int, Optional[str], Optional[str]]]:
+        """ (start, end] aralığındaki geçişler: (zaman, hasta id, eski, yeni) """
+        with self._storage.lock:
+            self._settle()
+            first = bisect_right(self._times, self._micros(start))
+            last = bisect_right(self._times, self._micros(end), first)
+            return [
+                (
+                    PatientBase._from_epoch_us(self._times[i]),
+                    self._ids[i],
+                    self._status_name(self._old[i]),
+                    self._status_name(self._new[i]),
+                )
+                for i in range(first, last)
+            ]
+
+    # repository gözlemci metotları
+    def on_patient_added(self, patient: PatientBase):
+        log = patient._status_log
+        if not log:
+            return
+        pid = patient.patient_id
+
+        # aynı hasta nesnesi silinip yeniden eklendiyse geçmişi zaten
+        # kayıtlıdır; yalnızca eklenme anında güncel durumuna giriş yazılır
+        if self._seen.get(pid) == log[0]:
+            self._append(
+                time.time_ns() // 1000, pid, -1, PatientBase._status_codes[patient.status]
+            )
+        else:
+            old = -1
+            for value in log:
+                code = value & self._code_mask
+                self._append(value >> self._code_bits, pid, old, code)
+                old = code
+        self._seen[pid] = log[0]
+
+    def on_patient_removed(self, patient: PatientBase):
+        code = PatientBase._status_codes[patient.status]
+        self._append(time.time_ns() // 1000, patient.patient_id, code, -1)
+
+    def on_patient_replaced(self, old_patient: PatientBase, new_patient: PatientBase):
+        # acilden yatışta yeni kayıt eski geçmişi devralır; yalnızca
+        # devralınan kısımdan sonraki geçişler yazılır
+        old_log, new_log = old_patient._status_log, new_patient._status_log
+        inherited = len(old_log)
+        if (
+            new_patient.patient_id != old_patient.patient_id
+            or not old_log
+            or new_log[:inherited] != old_log
+        ):
+            self.on_patient_removed(old_patient)
+            self.on_patient_added(new_patient)
+            return
+
+        old = old_log[-1] & self._code_mask
+        for value in new_log[inherited:]:
+            code = value & self._code_mask
+            self._append(value >> self._code_bits, new_patient.patient_id, old, code)
+            old = code
+
+    def on_patient_changed(self, patient: PatientBase, field: str, old, new):
+        if field != "status":
+            return
+        value = patient._status_log[-1]
+        self._append(
+            value >> self._code_bits, patient.patient_id,
+            -1 if old is None else PatientBase._status_codes[old],
+            value & self._code_mask
+        )
+
+    # yardımcı metotlar
+    def _status_name(self, code: int) -> Optional[str]:
+        return None if code < 0 else self._statuses[code]
+
+    @staticmethod
+    def _micros(when: datetime) -> int:
+        return round(when.timestamp() * 1_000_000)
+
+    def _append(self, micros: int, pid: int, old: int, new: int):
+        if self._pending or (self._times and micros < self._times[-1]):
+            self._pending.append((micros, pid, old, new))
+        else:
+            self._push(micros, pid, old, new)
+
+    def _push(self, micros: int, pid: int, old: int, new: int):
+        """ Zaman sırasına uyan geçişi sona ekler ve sayımları günceller """
+        if len(self._times) % self._block == 0:
+            self._checkpoints.append((tuple(self._levels), tuple(self._entered)))
+        self._times.append(micros)
+        self._ids.append(pid)
+        self._old.append(old)
+        self._new.append(new)
+        if old >= 0:
+            self._levels[old] -= 1
+        if new >= 0:
+            self._levels[new] += 1
+            self._entered[new] += 1
+
+    def _settle(self):
+        """ Bekleyen geçişleri sıralı kayda yerleştirir. Yalnızca en eski
+        bekleyen geçişin düştüğü bloktan sonrası yeniden hesaplanır. """
+        if not self._pending:
+            return
+        pending = sorted(self._pending, key=itemgetter(0))
+        self._pending = []
+
+        cut = bisect_right(self._times, pending[0][0])
+        block = cut // self._block
+        start = block * self._block
+        if block < len(self._checkpoints):
+            levels, entered = self._checkpoints[block]
+        else:
+            levels, entered = self._levels, self._entered
+
+        tail = list(zip(
+            self._times[start:], self._ids[start:], self._old[start:], self._new[start:]
+        ))
+        for column in (self._times, self._ids, self._old, self._new):
+            del column[start:]
+        del self._checkpoints[block:]
+        self._levels, self._entered = list(levels), list(entered)
+
+        for entry in heapq.merge(tail, pending, key=itemgetter(0)):
+            self._push(*entry)
+
+    def _state_at(self, index: int) -> Tuple[List[int], List[int]]:
+        """ İlk index geçiş uygulandıktan sonraki (durum sayımları, giriş sayıları) """
+        block = index // self._block
+        if block >= len(self._checkpoints):
+            return list(self._levels), list(self._entered)
+
+        levels, entered = map(list, self._checkpoints[block])
+        old, new = self._old, self._new
+        for i in range(block * self._block, index):
+            if old[i] >= 0:
+                levels[old[i]] -= 1
+            if new[i] >= 0:
+                levels[new[i]] += 1
+                entered[new[i]] += 1
+        return levels, entered
@@ -0,0 +1,204 @@
+# app/modules/patient/columnar.py
+
+from typing import Dict, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsiyonel bir bağımlılıktır
+    np = None
+
+from .base import PatientBase
+from .repository import PatientRepository
+
+
+class ColumnarPatientStore:
+    """
+    Repository'deki hastaların kolon bazlı (struct-of-arrays) kopyası.
+
+    Her alan ayrı bir NumPy dizisinde tutulur; yaş dağılımı, durum sayıları
+    gibi toplu sorgular Python döngüsü olmadan vektörel çalışır. Store,
+    repository'ye gözlemci olarak bağlanır ve ekleme/silme/değiştirme ile
+    durum güncellemelerinde senkron kalır. Silinen satırın yerine son satır
+    taşındığı için tüm işlemler O(1)'dir.
+    """
+
+    _status_codes = PatientBase._status_codes
+    _gender_codes = {"Erkek": 0, "Kadın": 1}
+    _genders = ("Erkek", "Kadın")
+
+    def __init__(self, repository: PatientRepository, initial_capacity: int = 1024):
+        if np is None:
+            raise ImportError("ColumnarPatientStore için numpy kurulu olmalıdır")
+
+        self._size = 0
+        self._rows: Dict[int, int] = {}
+        self._types: list = []
+        self._type_codes: Dict[str, int] = {}
+        self._repository = repository
+
+        # yükleme ile bağlanma arasındaki değişiklikler kaçmasın
+        with repository.lock:
+            self._allocate(max(initial_capacity, repository.count()))
+            for patient in repository.list_all():
+                self.on_patient_added(patient)
+            repository.attach_observer(self)
+
+    def close(self):
+        """ Repository ile senkronizasyonu bırakır """
+        self._repository.detach_observer(self)
+
+    def __len__(self) -> int:
+        return self._size
+
+    # kolonlar (yalnızca dolu satırlar, kopyasız görünüm)
+    @property
+    def ids(self):
+        return self._ids[:self._size]
+
+    @property
+    def ages(self):
+        return self._ages[:self._size]
+
+    @property
+    def genders(self):
+        return self._genders_col[:self._size]
+
+    @property
+    def statuses(self):
+        return self._statuses[:self._size]
+
+    @property
+    def types(self):
+        return self._types_col[:self._size]
+
+    @property
+    def emergency_levels(self):
+        return self._levels[:self._size]
+
+    # vektörel sorgular
+    def mask(
+        self,
+        status: Optional[str] = None,
+        patient_type: Optional[str] = None,
+        gender: Optional[str] = None,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        emergency_level: Optional[int] = None
+    ):
+        """ Verilen koşulların hepsini sağlayan satırlar için bool dizisi """
+        result = np.ones(self._size, dtype=bool)
+
+        if status is not None:
+            result &= self.statuses == self._status_codes[status]
+        if patient_type is not None:
+            code = self._type_codes.get(patient_type.lower(), -1)
+            result &= self.types == code
+        if gender is not None:
+            result &= self.genders == self._gender_codes[gender.capitalize()]
+        if min_age is not None:
+            result &= self.ages >= min_age
+        if max_age is not None:
+            result &= self.ages <= max_age
+        if emergency_level is not None:
+            result &= self.emergency_levels == emergency_level
+
+        return result
+
+    def select_ids(self, **conditions):
+        """ mask ile aynı koşulları sağlayan hasta ID'leri """
+        return self.ids[self.mask(**conditions)]
+
+    def count_by_status(self, mask=None) -> Dict[str, int]:
+        return self._group_count(
+            self.statuses, PatientBase._valid_statuses, mask
+        )
+
+    def count_by_type(self, mask=None) -> Dict[str, int]:
+        return self._group_count(self.types, self._types, mask)
+
+    def count_by_gender(self, mask=None) -> Dict[str, int]:
+        return self._group_count(self.genders, self._genders, mask)
+
+    def age_histogram(self, bins=12, age_range=(0, 120), mask=None):
+        """ Yaş histogramı: (sayılar, sınırlar) """
+        ages = self.ages if mask is None else self.ages[mask]
+        return np.histogram(ages, bins=bins, range=age_range)
+
+    def mean_age(self, mask=None) -> float:
+        ages = self.ages if mask is None else self.ages[mask]
+        return float(ages.mean()) if len(ages) else 0.0
+
+    # repository gözlemci metotları
+    def on_patient_added(self, patient: PatientBase):
+        if self._size == len(self._ids):
+            self._grow()
+
+        row = self._size
+        self._rows[patient.patient_id] = row
+        self._size += 1
+
+        self._ids[row] = patient.patient_id
+        self._ages[row] = patient.age
+        self._genders_col[row] = self._gender_codes[patient.gender]
+        self._statuses[row] = self._status_codes[patient.status]
+        self._types_col[row] = self._type_code(patient)
+        self._levels[row] = getattr(patient, "emergency_level", 0)
+
+    def on_patient_removed(self, patient: PatientBase):
+        row = self._rows.pop(patient.patient_id)
+        last = self._size - 1
+
+        if row != last:
+            for column in self._columns():
+                column[row] = column[last]
+            self._rows[int(self._ids[row])] = row
+
+        self._size -= 1
+
+    def on_patient_changed(self, patient: PatientBase, field: str, old, new):
+        row = self._rows[patient.patient_id]
+
+        if field == "status":
+            self._statuses[row] = self._status_codes[new]
+        elif field == "emergency_level":
+            self._levels[row] = new
+        elif field == "age":
+            self._ages[row] = new
+        elif field == "gender":
+            self._genders_col[row] = self._gender_codes[new]
+
+    # yardımcı metotlar
+    def _type_code(self, patient: PatientBase) -> int:
+        key = patient.__class__.__name__.lower()
+        code = self._type_codes.get(key)
+        if code is None:
+            code = len(self._types)
+            self._type_codes[key] = code
+            self._types.append(patient.__class__.__name__)
+        return code
+
+    def _group_count(self, column, labels: Sequence[str], mask) -> Dict[str, int]:
+        values = column if mask is None else column[mask]
+        counts = np.bincount(values, minlength=len(labels))
+        return {label: int(counts[i]) for i, label in enumerate(labels)}
+
+    def _columns(self):
+        return (
+            self._ids, self._ages, self._genders_col,
+            self._statuses, self._types_col, self._levels
+        )
+
+    def _allocate(self, capacity: int):
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._ages = np.zeros(capacity, dtype=np.int16)
+        self._genders_col = np.zeros(capacity, dtype=np.int8)
+        self._statuses = np.zeros(capacity, dtype=np.int8)
+        self._types_col = np.zeros(capacity, dtype=np.int8)
+        self._levels = np.zeros(capacity, dtype=np.int8)
+
+    def _grow(self):
+        """ Kapasiteyi iki katına çıkarır """
+        old = self._columns()
+        self._allocate(max(2 * len(self._ids), 1))
+        for new_column, old_column in zip(self._columns(), old):
+            new_column[:len(old_column)] = old_column
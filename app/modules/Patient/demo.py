@@ -3,45 +3,16 @@ from .service import PatientService
 from .inpatient import Inpatient
 from .outpatient import Outpatient
 from .emergency_patient import EmergencyPatient
+from .render import write_patient_list
 from datetime import datetime
 
 def print_patient_list(title, patients):
-    print(f"\n{title}")
-
-    if not patients:
-        print("Kayıt bulunamadı.")
-        return
-
-    for i, p in enumerate(patients, start=1):
-        room_info = "-"
-        emergency_info = "-"
-
-        if hasattr(p, "room_number") and p.room_number is not None:
-            room_info = f"Oda={p.room_number}"
-
-        if hasattr(p, "emergency_level"):
-            emergency_info = f"Seviye={p.emergency_level}"
-            if hasattr(p, "triage_area") and p.triage_area:
-                emergency_info += f" | Alan={p.triage_area}"
-
-        print(
-            f"{i}. "
-            f"ID={p.patient_id} | "
-            f"{p.name} | "
-            f"Yaş={p.age} | "
-            f"Cinsiyet={p.gender} | "
-            f"Durum={p.status} | "
-            f"{room_info} | "
-            f"{emergency_info}"
-        )
+    write_patient_list(patients, title=title)
 
 def show_header(service):
     now = datetime.now()
 
-    total = service.total_patient_count()
-    active = len(service.list_active_patients())
-    emergency = len(service.list_emergency_patients())
-    inpatients = len(service.list_patients_by_type("Inpatient"))
+    census = service.census()
 
     print("-" * 42)
     print("        ADA HOSPITAL")
@@ -53,10 +24,10 @@ def show_header(service):
     print()
     print("📊 Sistem Özeti")
     print("-" * 42)
-    print(f"• Toplam Hasta     : {total}")
-    print(f"• Aktif Hasta      : {active}")
-    print(f"• Acil Hasta       : {emergency}")
-    print(f"• Yatan Hasta      : {inpatients}")
+    print(f"• Toplam Hasta     : {census.total}")
+    print(f"• Aktif Hasta      : {census.active}")
+    print(f"• Acil Hasta       : {census.emergency}")
+    print(f"• Yatan Hasta      : {census.inpatients}")
     print("-" * 42)
     
 def main_menu():
@@ -162,7 +133,7 @@ def handle_patient(patient, service: PatientService):
             elif c == "3":
                 inpatient = service.admit_emergency_patient(patient.patient_id)
                 print("Hasta yatışa alındı:")
-                print(patient.detailed_info())
+                print(inpatient.detailed_info())
                 break
 
             elif c == "4":
@@ -241,6 +212,7 @@ def run_demo():
                         )
                         symptoms = input("Semptomlar (virgül ile): ").split(",")
                         p.add_symptoms([s.strip() for s in symptoms])
+                        p.determine_triage_area()
                         service.register_patient(p)
                         print("\nHasta başarıyla eklendi ✔")
                         print("\nHasta Bilgileri")
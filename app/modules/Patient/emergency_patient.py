@@ -1,8 +1,10 @@
 # app/modules/patient/emergency_patient.py
 
+import sys
 from .base import PatientBase
+from .triage import DEFAULT_RULEBOOK, TriageRulebook
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 class EmergencyPatient(PatientBase):
     """
@@ -10,6 +12,11 @@ class EmergencyPatient(PatientBase):
     Semptomlara göre Yeşil / Sarı / Kırmızı alan belirler
     """
 
+    __slots__ = ("_emergency_level", "_arrival_time", "_symptoms", "_triage_area")
+
+    # acil seviyeye göre öncelik puanları
+    _priority_by_level = {1: 100, 2: 80, 3: 60}
+
     def __init__(
         self,
         patient_id: Optional[int],
@@ -28,7 +35,7 @@ class EmergencyPatient(PatientBase):
 
         self._emergency_level = emergency_level
         self._arrival_time = arrival_time or datetime.now()
-        self._symptoms: List[str] = []
+        self._symptoms: Tuple[str, ...] = ()
         self._triage_area: Optional[str] = None
 
     # property metotları
@@ -44,7 +51,7 @@ class EmergencyPatient(PatientBase):
     def emergency_level(self, value: int):
         if value not in (1, 2, 3):
             raise ValueError("Acil seviye 1-3 arasında olmalıdır")
-        self._emergency_level = value
+        self._set_emergency_level(value)
 
     @property
     def arrival_time(self) -> datetime:
@@ -56,42 +63,78 @@ class EmergencyPatient(PatientBase):
 
     def get_priority(self) -> int:
         """Acil seviyeye göre hastanın öncelik puanını döndürür"""
-        return {
-            1: 100, 
-            2: 80,   
-            3: 60    
-        }[self._emergency_level]
-
-    def detailed_info(self) -> str:
-        base_info = super().detailed_info()
+        return self._priority_by_level[self._emergency_level]
+
+    def _render_info(self) -> str:
+        base_info = super()._render_info()
         return (
             f"{base_info}\n"
             f"Acil Seviye   : {self.emergency_level}\n"
-            f"Triyaj Alanı  : {self.triage_area or self.determine_triage_area()}\n"
+            f"Triyaj Alanı  : {self.triage_area or '-'}\n"
             f"Geliş Zamanı : {self.arrival_time.strftime('%Y-%m-%d %H:%M')}"
         )
+
+    def _line_details(self):
+        emergency_info = f"Seviye={self._emergency_level}"
+        if self._triage_area:
+            emergency_info += f" | Alan={self._triage_area}"
+        return "-", emergency_info
         
     
+    @classmethod
+    def from_dict(cls, data: dict):
+        """ Dictionary üzerinden acil hasta oluşturur """
+        arrival_time = data.get("arrival_time")
+        if isinstance(arrival_time, str):
+            arrival_time = datetime.fromisoformat(arrival_time)
+
+        patient = cls(
+            patient_id=data.get("patient_id"),
+            name=data["name"],
+            age=data["age"],
+            gender=data["gender"],
+            emergency_level=data["emergency_level"],
+            arrival_time=arrival_time,
+            status=data.get("status", "acil"),
+        )
+        if data.get("symptoms"):
+            patient.add_symptoms(data["symptoms"])
+        return patient
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["emergency_level"] = self._emergency_level
+        data["arrival_time"] = self._arrival_time.isoformat()
+        data["symptoms"] = list(self._symptoms)
+        data["triage_area"] = self._triage_area
+        return data
+
+    def _restore_state(self, data: dict):
+        super()._restore_state(data)
+        self._emergency_level = data["emergency_level"]
+        arrival_time = data.get("arrival_time")
+        if isinstance(arrival_time, str):
+            arrival_time = datetime.fromisoformat(arrival_time)
+        self._arrival_time = arrival_time or datetime.now()
+        self._symptoms = tuple(sys.intern(s) for s in data.get("symptoms") or ())
+        self._triage_area = data.get("triage_area")
+
     def add_symptoms(self, symptoms: List[str]):
         """Hastaya bir veya birden fazla semptom ekler"""
-        self._symptoms.extend(symptoms)
-
-    def determine_triage_area(self) -> str:
-        """Semptomlara göre triyaj alanını ve acil seviyeyi belirler"""
-        text = " ".join(s.lower() for s in self._symptoms)
-
-        if any(k in text for k in ["göğüs ağrısı", "nefes darlığı", "bilinç kaybı", "şiddetli kanama"]):
-            self._emergency_level = 3
-            self._triage_area = "Kırmızı"
-        elif any(k in text for k in ["yüksek ateş", "şiddetli ağrı", "kusma", "baş dönmesi"]):
-            self._emergency_level = 2
-            self._triage_area = "Sarı"
-        else:
-            self._emergency_level = 1
-            self._triage_area = "Yeşil"
-
+        # tekrar eden semptom metinleri hastalar arasında paylaşılır
+        self._symptoms += tuple(sys.intern(s) for s in symptoms)
+
+    def determine_triage_area(self, rulebook: Optional[TriageRulebook] = None) -> str:
+        """Semptomlara göre triyaj alanını ve acil seviyeyi belirler.
+        Kurallar verilmezse varsayılan (Kırmızı/Sarı/Yeşil) kurallar kullanılır."""
+        area, level = (rulebook or DEFAULT_RULEBOOK).classify(self._symptoms)
+        self._apply_triage(area, level)
         return self._triage_area
 
+    def _apply_triage(self, area: str, level: int):
+        self._set_emergency_level(level)
+        self._set_field("_triage_area", "triage_area", area)
+
     def update_status(self, new_status: str):
         """Acil hastanın durumunu günceller"""
         super().update_status(new_status)
@@ -104,5 +147,12 @@ class EmergencyPatient(PatientBase):
     def escalate(self):
         """Hastanın acil seviyesini yükseltir"""
         if self._emergency_level > 1:
-            self._emergency_level -= 1
+            self._set_emergency_level(self._emergency_level - 1)
             self.update_status("acil")
+
+    def _set_emergency_level(self, value: int):
+        """ Acil seviyeyi değiştirir ve öncelik değişimini bildirir """
+        old_level = self._emergency_level
+        self._emergency_level = value
+        if old_level != value:
+            self._notify("emergency_level", old_level, value)
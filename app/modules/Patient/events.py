@@ -0,0 +1,327 @@
+# app/modules/patient/events.py
+
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, List, Optional, Tuple, Type
+
+from .base import PatientBase
+from .emergency_patient import EmergencyPatient
+from .inpatient import Inpatient
+from .storage import PatientStorage
+
+
+# olay tipleri
+class PatientEvent:
+    """
+    Hasta değişiklik olaylarının ortak sınıfı. seq, olayın yayınlandığı
+    EventBus'taki sıra numarasıdır (1'den başlar, boşluksuz artar);
+    abonenin kaçırdığı olaylar sıra numaralarındaki boşluktan anlaşılır.
+    """
+
+    __slots__ = ("patient", "patient_id", "timestamp", "seq")
+
+    def __init__(self, patient: PatientBase):
+        self.patient = patient
+        self.patient_id = patient.patient_id
+        self.timestamp = time.time()
+        self.seq = 0
+
+    def _details(self) -> str:
+        return ""
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(seq={self.seq}, "
+            f"patient_id={self.patient_id}{self._details()})"
+        )
+
+
+class PatientRegistered(PatientEvent):
+    """ Hasta depolamaya eklendi """
+    __slots__ = ()
+
+
+class PatientRemoved(PatientEvent):
+    """ Hasta depolamadan silindi """
+    __slots__ = ()
+
+
+class StatusChanged(PatientEvent):
+    """ Hasta durumu değişti (update_status) """
+    __slots__ = ("old", "new")
+
+    def __init__(self, patient: PatientBase, old: Optional[str], new: str):
+        super().__init__(patient)
+        self.old = old
+        self.new = new
+
+    def _details(self) -> str:
+        return f", {self.old} -> {self.new}"
+
+
+class RoomAssigned(PatientEvent):
+    """ Yatan hastaya yatak ayrıldı """
+    __slots__ = ("room_number",)
+
+    def __init__(self, patient: PatientBase, room_number: int):
+        super().__init__(patient)
+        self.room_number = room_number
+
+    def _details(self) -> str:
+        return f", oda={self.room_number}"
+
+
+class RoomReleased(RoomAssigned):
+    """ Yatan hastanın yatağı boşaldı (taburcu, oda değişikliği, silme) """
+    __slots__ = ()
+
+
+class EmergencyAdmitted(PatientEvent):
+    """ Acil hasta yatışa alındı. patient yeni Inpatient nesnesidir,
+    emergency_patient yerine geçtiği acil kaydıdır. """
+    __slots__ = ("emergency_patient", "room_number")
+
+    def __init__(self, emergency_patient: PatientBase, inpatient: PatientBase):
+        super().__init__(inpatient)
+        self.emergency_patient = emergency_patient
+        self.room_number = inpatient.room_number
+
+    def _details(self) -> str:
+        return f", oda={self.room_number}"
+
+
+class PatientUpdated(PatientEvent):
+    """ Diğer alan değişiklikleri (isim, yaş, acil seviye, triyaj alanı...) """
+    __slots__ = ("field", "old", "new")
+
+    def __init__(self, patient: PatientBase, field: str, old, new):
+        super().__init__(patient)
+        self.field = field
+        self.old = old
+        self.new = new
+
+    def _details(self) -> str:
+        return f", {self.field}: {self.old!r} -> {self.new!r}"
+
+
+# yayın / abonelik
+class Subscription:
+    """
+    Bir abonenin sınırlı olay tamponu.
+
+    handler verilirse olaylar ayrı bir iş parçacığında batch_size'a kadar
+    partiler halinde handler(olaylar) ile teslim edilir; verilmezse abone
+    poll() ile kendisi çeker. Tampon doluysa en eski olay atılır ve dropped
+    artırılır: yayıncı (depolama kilidi altında) hiçbir zaman yavaş aboneyi
+    beklemez. Olay kaçıran abone durumu depolamadan yeniden okumalıdır.
+    """
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        handler: Optional[Callable[[List[PatientEvent]], None]],
+        event_types: Optional[Iterable[Type[PatientEvent]]],
+        buffer_size: int,
+        batch_size: int
+    ):
+        if buffer_size < 1 or batch_size < 1:
+            raise ValueError("Tampon ve parti boyutu pozitif olmalıdır")
+
+        self._bus = bus
+        self._handler = handler
+        self._types: Optional[Tuple[type, ...]] = (
+            None if event_types is None else tuple(event_types)
+        )
+        self._buffer: deque = deque()
+        self._buffer_size = buffer_size
+        self._batch_size = batch_size
+
+        lock = threading.Lock()
+        self._ready = threading.Condition(lock)
+        self._idle = threading.Condition(lock)
+        self._busy = False
+        self._closed = False
+
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.last_error: Optional[BaseException] = None
+
+        self._thread: Optional[threading.Thread] = None
+        if handler is not None:
+            self._thread = threading.Thread(target=self._deliver_loop, daemon=True)
+            self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def _offer(self, event: PatientEvent):
+        if self._types is not None and not isinstance(event, self._types):
+            return
+        with self._ready:
+            if self._closed:
+                return
+            if len(self._buffer) >= self._buffer_size:
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append(event)
+            # bekleyen taraf yalnızca tampon boşken uyur
+            if len(self._buffer) == 1:
+                self._ready.notify()
+
+    def _take(self) -> List[PatientEvent]:
+        count = min(self._batch_size, len(self._buffer))
+        return [self._buffer.popleft() for _ in range(count)]
+
+    def poll(self, timeout: Optional[float] = 0) -> List[PatientEvent]:
+        """ Tampondaki en fazla batch_size olayı alır. Tampon boşsa timeout
+        saniye (None: süresiz) bekler; yine boşsa boş liste döner. """
+        if self._handler is not None:
+            raise ValueError("handler ile oluşturulan abonelikte poll kullanılamaz")
+        with self._ready:
+            if not self._buffer and timeout != 0:
+                self._ready.wait_for(lambda: self._buffer or self._closed, timeout)
+            batch = self._take()
+            self.delivered += len(batch)
+            return batch
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """ Tampondaki olaylar handler'a teslim edilene kadar bekler """
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: not self._buffer and not self._busy, timeout
+            )
+
+    def close(self):
+        """ Aboneliği bitirir; tampondaki olaylar yine de teslim edilir """
+        self._bus._remove(self)
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _deliver_loop(self):
+        while True:
+            with self._ready:
+                self._ready.wait_for(lambda: self._buffer or self._closed)
+                if not self._buffer:
+                    return
+                batch = self._take()
+                self._busy = True
+
+            try:
+                self._handler(batch)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = e
+
+            with self._idle:
+                self.delivered += len(batch)
+                self._busy = False
+                self._idle.notify_all()
+
+
+class EventBus:
+    """
+    Süreç içi yayın/abonelik: yayınlanan her olay sıra numarası alır ve
+    tüm abonelerin tamponlarına eklenir. Aboneler birbirini ve yayıncıyı
+    yavaşlatmaz; her birinin kendi sınırlı tamponu vardır (Subscription).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions: Tuple[Subscription, ...] = ()
+        self._seq = itertools.count(1)
+
+    def subscribe(
+        self,
+        handler: Optional[Callable[[List[PatientEvent]], None]] = None,
+        event_types: Optional[Iterable[Type[PatientEvent]]] = None,
+        buffer_size: int = 10_000,
+        batch_size: int = 256
+    ) -> Subscription:
+        """ Yeni abone ekler. event_types verilirse yalnızca bu tiplerdeki
+        (ve alt tiplerindeki) olaylar tampona alınır. """
+        subscription = Subscription(self, handler, event_types, buffer_size, batch_size)
+        with self._lock:
+            self._subscriptions += (subscription,)
+        return subscription
+
+    def _remove(self, subscription: Subscription):
+        with self._lock:
+            self._subscriptions = tuple(
+                s for s in self._subscriptions if s is not subscription
+            )
+
+    def publish(self, event: PatientEvent):
+        with self._lock:
+            event.seq = next(self._seq)
+            subscriptions = self._subscriptions
+        for subscription in subscriptions:
+            subscription._offer(event)
+
+    def close(self):
+        """ Tüm abonelikleri kapatır """
+        for subscription in self._subscriptions:
+            subscription.close()
+
+
+class ChangeCapture:
+    """
+    Depolamaya gözlemci olarak bağlanıp değişiklikleri tipli olaylar
+    halinde EventBus'a yayınlayan köprü (change data capture).
+
+    - add: PatientRegistered (+ yatağı varsa RoomAssigned)
+    - remove: PatientRemoved (+ yatağı varsa RoomReleased)
+    - update_status: StatusChanged
+    - oda değişikliği / taburcu: RoomReleased, RoomAssigned
+    - admit_emergency_patient: EmergencyAdmitted + RoomAssigned
+    - diğer alanlar: PatientUpdated
+
+    Olaylar depolamanın kilidi altında üretildiğinden depolamadaki
+    değişiklik sırasıyla yayınlanır.
+    """
+
+    def __init__(self, storage: PatientStorage, bus: EventBus):
+        self._storage = storage
+        self._bus = bus
+        storage.attach_observer(self)
+
+    def detach(self):
+        self._storage.detach_observer(self)
+
+    # repository gözlemci metotları
+    def on_patient_added(self, patient: PatientBase):
+        self._bus.publish(PatientRegistered(patient))
+        room = getattr(patient, "room_number", None)
+        if room is not None:
+            self._bus.publish(RoomAssigned(patient, room))
+
+    def on_patient_removed(self, patient: PatientBase):
+        room = getattr(patient, "room_number", None)
+        if room is not None:
+            self._bus.publish(RoomReleased(patient, room))
+        self._bus.publish(PatientRemoved(patient))
+
+    def on_patient_replaced(self, old_patient: PatientBase, new_patient: PatientBase):
+        if isinstance(old_patient, EmergencyPatient) and isinstance(new_patient, Inpatient):
+            self._bus.publish(EmergencyAdmitted(old_patient, new_patient))
+            if new_patient.room_number is not None:
+                self._bus.publish(RoomAssigned(new_patient, new_patient.room_number))
+        else:
+            self.on_patient_removed(old_patient)
+            self.on_patient_added(new_patient)
+
+    def on_patient_changed(self, patient: PatientBase, field: str, old, new):
+        if field == "status":
+            self._bus.publish(StatusChanged(patient, old, new))
+        elif field == "room_number":
+            if old is not None:
+                self._bus.publish(RoomReleased(patient, old))
+            if new is not None:
+                self._bus.publish(RoomAssigned(patient, new))
+        else:
+            self._bus.publish(PatientUpdated(patient, field, old, new))
@@ -1,29 +1,41 @@
 # app/modules/patient/inpatient.py
 
+import sys
+from array import array
+from datetime import datetime
+from typing import NamedTuple, Optional, Tuple
+
 from .base import PatientBase
-from typing import Optional
 from .emergency_patient import EmergencyPatient
 
+
+class EmergencyRecord(NamedTuple):
+    """ Acilden yatışa alınan hastanın acil kaydı bilgileri """
+    emergency_level: int
+    arrival_time: datetime
+    symptoms: Tuple[str, ...]
+    triage_area: Optional[str]
+
+
 class Inpatient(PatientBase):
     """
     Yatan hasta sınıfı
+
+    Acilden yatışa alınan hastalarda (from_emergency) acil kaydı
+    emergency_record'da saklanır; durum geçmişi acil kaydından devam eder.
     """
-    
-    _max_capacity = 16
-    _current_inpatients = 0
+
+    __slots__ = ("_room_number", "_is_discharged", "_emergency")
 
     def __init__(self, patient_id: Optional[int], name: str, age: int, gender: str, room_number: Optional[int] = None, status: str = "aktif"
     ):
-        # kapasite kontrolü
-        if Inpatient._current_inpatients >= Inpatient._max_capacity:
-            raise ValueError("Yatan hasta kapasitesi dolu! Yeni hasta kabul edilemiyor.")
-
+        # update_status override'ı base __init__ içinde çağrılır
+        self._room_number = None
+        self._is_discharged = False
+        self._emergency: Optional[EmergencyRecord] = None
         super().__init__(patient_id, name, age, gender, status)
 
         self.room_number = room_number
-        self._is_discharged = False 
-
-        Inpatient._current_inpatients += 1
 
     # property metotları
     @property
@@ -34,34 +46,56 @@ class Inpatient(PatientBase):
     def room_number(self, value):
         if value is not None and value <= 0:
             raise ValueError("Oda numarası pozitif bir sayı olmalıdır.")
-        self._room_number = value
+        self._change_room(value)
+
+    @property
+    def is_discharged(self) -> bool:
+        return self._is_discharged
+
+    @property
+    def emergency_record(self) -> Optional[EmergencyRecord]:
+        """ Acilden yatışa alındıysa acil kaydı, aksi halde None """
+        return self._emergency
+
+    @property
+    def admitted_at(self) -> Optional[datetime]:
+        """ Acilden yatış zamanı: acil geçmişinden sonraki ilk "aktif"
+        durum kaydı (acil hastalar "aktif" durumunu kullanmaz) """
+        if self._emergency is None:
+            return None
+        active = self._status_codes["aktif"]
+        for code, micros in self.iter_status_log():
+            if code == active:
+                return self._from_epoch_us(micros)
+        return None
 
     # abstract method override
     def get_priority(self) -> int:
         """Inpatient için orta öncelik"""
         return 2
 
-    def detailed_info(self) -> str:
-        base_info = super().detailed_info()
-        return (
+    def _render_info(self) -> str:
+        base_info = super()._render_info()
+        info = (
             f"{base_info}\n"
             f"Oda No        : {self.room_number}"
         )
+        record = self._emergency
+        if record is not None:
+            info += (
+                f"\nAcil Seviye   : {record.emergency_level}\n"
+                f"Triyaj Alanı  : {record.triage_area or '-'}\n"
+                f"Geliş Zamanı : {record.arrival_time.strftime('%Y-%m-%d %H:%M')}"
+            )
+        return info
 
-    # class methods
-    @classmethod
-    def get_capacity_info(cls):
-        return f"Aktif yatan hasta sayısı: {cls._current_inpatients}/{cls._max_capacity}"
-
-    @classmethod
-    def _decrease_capacity(cls):
-        if cls._current_inpatients > 0:
-            cls._current_inpatients -= 1
+    def _line_details(self):
+        room_info = "-" if self._room_number is None else f"Oda={self._room_number}"
+        return room_info, "-"
 
     # base davranışı override
     def update_status(self, new_status: str):
         if new_status == "taburcu" and not self._is_discharged:
-            Inpatient._decrease_capacity()
             self._is_discharged = True
             self.clear_room()
 
@@ -69,23 +103,99 @@ class Inpatient(PatientBase):
         
     def clear_room(self):
         """ Hasta taburcu edildiğinde oda bilgisini temizler """
-        self._room_number = None
+        self._change_room(None)
+
+    def _change_room(self, value: Optional[int]):
+        """ Oda bilgisini değiştirir ve dinleyicilere bildirir.
+        Dinleyici (ör. repository) odayı reddederse eski oda geri yüklenir. """
+        old_room = self._room_number
+        if old_room == value:
+            return
+
+        self._room_number = value
+        try:
+            self._notify("room_number", old_room, value)
+        except Exception:
+            self._room_number = old_room
+            raise
         
+    @classmethod
+    def from_dict(cls, data: dict):
+        """ Dictionary üzerinden yatan hasta oluşturur """
+        patient = cls(
+            patient_id=data.get("patient_id"),
+            name=data["name"],
+            age=data["age"],
+            gender=data["gender"],
+            room_number=data.get("room_number"),
+            status=data.get("status", "aktif"),
+        )
+        patient._emergency = cls._emergency_from_dict(data)
+        return patient
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["room_number"] = self._room_number
+        data["is_discharged"] = self._is_discharged
+
+        # acil kaydı, acil hasta ile aynı alanlarla saklanır
+        record = self._emergency
+        if record is not None:
+            data["emergency_level"] = record.emergency_level
+            data["arrival_time"] = record.arrival_time.isoformat()
+            data["symptoms"] = list(record.symptoms)
+            data["triage_area"] = record.triage_area
+        return data
+
+    def _restore_state(self, data: dict):
+        super()._restore_state(data)
+        self._room_number = data.get("room_number")
+        self._is_discharged = bool(data.get("is_discharged", False))
+        self._emergency = self._emergency_from_dict(data)
+
+    @staticmethod
+    def _emergency_from_dict(data: dict) -> Optional[EmergencyRecord]:
+        if data.get("emergency_level") is None:
+            return None
+        arrival_time = data.get("arrival_time")
+        if isinstance(arrival_time, str):
+            arrival_time = datetime.fromisoformat(arrival_time)
+        return EmergencyRecord(
+            data["emergency_level"],
+            arrival_time or datetime.now(),
+            tuple(sys.intern(s) for s in data.get("symptoms") or ()),
+            data.get("triage_area"),
+        )
+
     @classmethod
     def from_emergency(
         cls,
         emergency_patient: "EmergencyPatient",
-        room_number: int
+        room_number: Optional[int]
     ):
-        """ Emergency hastayı Inpatient'a dönüştürür """
-        inpatient = cls(
-            patient_id=emergency_patient.patient_id,
-            name=emergency_patient.name,
-            age=emergency_patient.age,
-            gender=emergency_patient.gender,
-            room_number=room_number,
-            status="aktif"
-        )
+        """ Acil hastayı yatan hastaya dönüştürür.
 
+        ID, kişisel bilgiler ve durum geçmişi korunur; acil kaydı
+        emergency_record'a taşınır ve geçmişe yatış ("aktif") eklenir.
+        Alanlar acil hastada doğrulandığı için setter'lar çalıştırılmaz;
+        dinleyiciler (repository) replace_patient ile bağlanır. """
+        inpatient = cls.__new__(cls)
+        inpatient._patient_id = emergency_patient.patient_id
+        inpatient._watchers = ()
+        inpatient._version = 0
+        inpatient._rendered = None
+        inpatient._name = emergency_patient.name
+        inpatient._age = emergency_patient.age
+        inpatient._gender = emergency_patient.gender
+        inpatient._status = emergency_patient.status
+        inpatient._status_log = array("q", emergency_patient._status_log)
+        inpatient._room_number = room_number
+        inpatient._is_discharged = False
+        inpatient._emergency = EmergencyRecord(
+            emergency_patient.emergency_level,
+            emergency_patient.arrival_time,
+            emergency_patient._symptoms,
+            emergency_patient.triage_area,
+        )
+        inpatient.update_status("aktif")
         return inpatient
-    
\ No newline at end of file
@@ -0,0 +1,236 @@
+# app/modules/patient/intake.py
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .emergency_patient import EmergencyPatient
+from .service import PatientService
+from .triage import TriageRulebook, triage_patients
+
+
+_STOP = object()
+
+
+class StageStats:
+    """
+    Bir aşamanın istatistikleri: işlenen kayıt ve parti sayısı, kaydın
+    aşamanın kuyruğuna girişinden aşamadan çıkışına kadar geçen süre
+    (bekleme + işleme) ve kuyruk derinliği
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.processed = 0
+        self.batches = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.processed if self.processed else 0.0
+
+    def __repr__(self):
+        return (
+            f"StageStats({self.name}: processed={self.processed}, "
+            f"batches={self.batches}, mean_latency={self.mean_latency * 1000:.2f} ms, "
+            f"max_latency={self.max_latency * 1000:.2f} ms, "
+            f"queue_depth={self.queue_depth}/{self.max_queue_depth})"
+        )
+
+
+class IntakePipeline:
+    """
+    Acil başvurular için asyncio tabanlı kabul hattı:
+
+        parse -> validate -> triage -> register -> admit
+
+    Aşamalar sınırlı (maxsize) kuyruklarla bağlıdır; bir aşama yetişemezse
+    önündeki kuyruk dolar ve submit() bekler (backpressure). Her aşama
+    kuyruğunda biriken kayıtları batch_size'a kadar tek parti halinde alır;
+    triyaj triage_patients, kayıt register_many ile toplu yapılır.
+
+    admit aşaması, triyaj alanı admit_areas içinde olan hastaları boş yatak
+    varsa admit_emergency_patient ile yatışa alır. Depolamaya yazan (kilit
+    bekleyebilen) register ve admit aşamaları olay döngüsünü bloklamamak
+    için ayrı iş parçacığında (asyncio.to_thread) çalışır.
+
+    Geçersiz ve kaydedilemeyen başvurular errors listesinde (ham kayıt,
+    mesaj) olarak tutulur. Bir partide beklenmeyen hata olursa partinin
+    tüm kayıtları hata olarak eklenir, aşama çalışmaya devam eder.
+    """
+
+    stage_names = ("parse", "validate", "triage", "register", "admit")
+    _blocking_stages = frozenset(("register", "admit"))
+
+    def __init__(
+        self,
+        service: PatientService,
+        queue_size: int = 1000,
+        batch_size: int = 64,
+        rulebook: Optional[TriageRulebook] = None,
+        admit_areas: Iterable[str] = ("Kırmızı",)
+    ):
+        self._service = service
+        self._queue_size = queue_size
+        self._batch_size = batch_size
+        self._rulebook = rulebook
+        self._admit_areas = frozenset(admit_areas)
+
+        self.stats: Dict[str, StageStats] = {n: StageStats(n) for n in self.stage_names}
+        self.registered: List[EmergencyPatient] = []
+        self.admitted: list = []
+        self.errors: List[Tuple[Any, str]] = []
+
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+
+    # yaşam döngüsü
+    async def start(self):
+        """ Aşama görevlerini başlatır """
+        if self._tasks:
+            raise ValueError("Kabul hattı zaten çalışıyor")
+
+        handlers = (self._parse, self._validate, self._triage, self._register, self._admit)
+        self._queues = [asyncio.Queue(self._queue_size) for _ in handlers]
+        for index, handler in enumerate(handlers):
+            self._tasks.append(asyncio.create_task(self._run_stage(index, handler)))
+
+    async def submit(self, raw):
+        """ Başvuruyu (dictionary ya da JSON metni) hatta ekler.
+        İlk kuyruk doluysa yer açılana kadar bekler. """
+        await self._queues[0].put((time.perf_counter(), raw, raw))
+        self._update_depth(0)
+
+    async def close(self):
+        """ Kuyruktaki tüm başvurular işlenene kadar bekler ve aşamaları kapatır """
+        await self._queues[0].put(_STOP)
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+
+    async def run(self, records: Iterable) -> "IntakePipeline":
+        """ Başvuruları sırayla hatta verir ve hat boşalana kadar bekler """
+        await self.start()
+        for raw in records:
+            await self.submit(raw)
+        await self.close()
+        return self
+
+    def queue_depths(self) -> Dict[str, int]:
+        """ Aşamaların kuyruklarında bekleyen kayıt sayısı """
+        return {name: q.qsize() for name, q in zip(self.stage_names, self._queues)}
+
+    # aşama çalıştırıcı
+    async def _run_stage(self, index: int, handler: Callable[[list], list]):
+        """ Kuyruktan parti alır, handler ile işler, sonuçları sonraki
+        kuyruğa aktarır. Kayıtlar (kuyruğa giriş zamanı, ham kayıt, değer)
+        üçlüsü olarak taşınır. """
+        name = self.stage_names[index]
+        stats = self.stats[name]
+        blocking = name in self._blocking_stages
+        queue = self._queues[index]
+        output = self._queues[index + 1] if index + 1 < len(self._queues) else None
+        stopping = False
+
+        while not stopping:
+            batch = [await queue.get()]
+            while len(batch) < self._batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            stats.queue_depth = queue.qsize()
+
+            if batch[-1] is _STOP:
+                batch.pop()
+                stopping = True
+
+            results = await self._process(name, handler, batch, blocking) if batch else []
+
+            now = time.perf_counter()
+            stats.batches += bool(batch)
+            stats.processed += len(batch)
+            for entered, _, _ in batch:
+                latency = now - entered
+                stats.total_latency += latency
+                if latency > stats.max_latency:
+                    stats.max_latency = latency
+
+            if output is not None:
+                for _, raw, value in results:
+                    await output.put((now, raw, value))
+                    self._update_depth(index + 1)
+
+            # diğer görevlerin (ör. submit) çalışabilmesi için kontrol bırakılır
+            await asyncio.sleep(0)
+
+        if output is not None:
+            await output.put(_STOP)
+
+    async def _process(self, name: str, handler, batch: list, blocking: bool) -> list:
+        """ Partiyi işler; hata partiyi düşürür, aşamayı durdurmaz """
+        try:
+            if blocking:
+                return await asyncio.to_thread(handler, batch)
+            return handler(batch)
+        except Exception as e:
+            message = f"{name} aşamasında hata: {e}"
+            self.errors.extend((raw, message) for _, raw, _ in batch)
+            return []
+
+    def _update_depth(self, index: int):
+        stats = self.stats[self.stage_names[index]]
+        stats.queue_depth = self._queues[index].qsize()
+        if stats.queue_depth > stats.max_queue_depth:
+            stats.max_queue_depth = stats.queue_depth
+
+    # aşamalar
+    def _parse(self, batch: list) -> list:
+        results = []
+        for entered, raw, value in batch:
+            try:
+                record = json.loads(value) if isinstance(value, (str, bytes)) else dict(value)
+            except (ValueError, TypeError) as e:
+                self.errors.append((raw, f"Geçersiz kayıt: {e}"))
+                continue
+            results.append((entered, raw, record))
+        return results
+
+    def _validate(self, batch: list) -> list:
+        results = []
+        for entered, raw, record in batch:
+            try:
+                patient = EmergencyPatient.from_dict(record)
+            except (ValueError, KeyError, TypeError) as e:
+                self.errors.append((raw, f"Geçersiz kayıt: {e}"))
+                continue
+            results.append((entered, raw, patient))
+        return results
+
+    def _triage(self, batch: list) -> list:
+        triage_patients((patient for _, _, patient in batch), self._rulebook)
+        return batch
+
+    def _register(self, batch: list) -> list:
+        result = self._service.register_many(patient for _, _, patient in batch)
+        for index, message in result.errors:
+            self.errors.append((batch[index][1], message))
+
+        failed = {index for index, _ in result.errors}
+        registered = [item for index, item in enumerate(batch) if index not in failed]
+        self.registered.extend(patient for _, _, patient in registered)
+        return registered
+
+    def _admit(self, batch: list) -> list:
+        for _, raw, patient in batch:
+            if patient.triage_area not in self._admit_areas:
+                continue
+            if self._service.free_bed_count() <= 0:
+                continue
+            try:
+                self.admitted.append(
+                    self._service.admit_emergency_patient(patient.patient_id)
+                )
+            except ValueError as e:
+                self.errors.append((raw, str(e)))
+        return batch
@@ -0,0 +1,292 @@
+# app/modules/patient/journal.py
+
+import glob
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from .base import PatientBase
+from .repository import PatientRepository
+
+
+class RecoveryStats:
+    """
+    Kurtarma (recover) sonucu: snapshot'tan okunan hasta sayısı,
+    journal'dan tekrar oynatılan olay sayısı ve toplam süre
+    """
+
+    def __init__(self, snapshot_patients: int, replayed_events: int, seconds: float):
+        self.snapshot_patients = snapshot_patients
+        self.replayed_events = replayed_events
+        self.seconds = seconds
+
+    def __repr__(self):
+        return (
+            f"RecoveryStats(snapshot_patients={self.snapshot_patients}, "
+            f"replayed_events={self.replayed_events}, seconds={self.seconds:.3f})"
+        )
+
+
+class PatientJournal:
+    """
+    In-memory PatientRepository için write-behind journal ve snapshot yönetimi.
+
+    Repository'ye gözlemci olarak bağlanır; add/remove/replace_patient ve
+    hasta üzerindeki her değişiklik (update_status dahil) JSON satırı olarak
+    journal'a eklenir. Değişiklik kayıtları hastanın tam görüntüsünü
+    (to_dict) taşır, böylece tekrar oynatma yan etkilere bağlı değildir.
+
+    Yazmalar bellekte biriktirilir; arka plandaki yazıcı iş parçacığı
+    commit_interval saniyede bir ya da group_size kayda ulaşıldığında hepsini
+    tek seferde yazıp fsync yapar (group commit). Değişiklik, kaydı diske
+    yazılmadan döner (write-behind); son fsync'ten sonraki kayıtlar çökme
+    durumunda kaybolabilir. Kalıcılık gereken yerde wait_durable() çağıran
+    iş parçacığının son kaydı fsync edilene kadar bekler; flush() bekleyen
+    her şeyi hemen yazar.
+
+    checkpoint() tüm repository'yi snapshot dosyasına yazar ve eski journal
+    segmentlerini siler. start_compaction() bunu periyodik olarak yapar.
+    recover() en son snapshot'ı yükleyip yalnızca sonrasındaki kayıtları
+    tekrar oynatır; journal recover() çağrısıyla çalışmaya başlar.
+    """
+
+    _snapshot_name = "snapshot.jsonl"
+    _segment_pattern = "journal-*.jsonl"
+
+    def __init__(
+        self,
+        directory: str,
+        commit_interval: float = 0.005,
+        group_size: int = 1024
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self._directory = directory
+        self._commit_interval = commit_interval
+        self._group_size = group_size
+
+        # kilit sırası: depolama kilidi -> _io_lock -> _lock
+        # _lock yalnızca tamponu korur; disk yazması _io_lock altında,
+        # _lock bırakılmış halde yapılır, böylece _append beklemez
+        self._lock = threading.Lock()
+        self._io_lock = threading.RLock()
+        self._checkpoint_lock = threading.Lock()
+        self._wakeup = threading.Condition(threading.Lock())
+        self._synced = threading.Condition(self._lock)
+        self._buffer: list = []
+        self._seq = 0
+        self._synced_seq = 0
+        self._local = threading.local()
+        self._segment = None
+        self._repository: Optional[PatientRepository] = None
+        self._closed = False
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._compactor: Optional[threading.Thread] = None
+        self._stop_compaction = threading.Event()
+
+    # kurtarma
+    def recover(self, repository: PatientRepository) -> RecoveryStats:
+        """ Snapshot ve journal'dan boş repository'yi doldurur, ardından
+        repository'yi dinlemeye başlar """
+        if repository.count():
+            raise ValueError("Kurtarma için repository boş olmalıdır")
+
+        start = time.perf_counter()
+        images: Dict[int, dict] = {}
+        snapshot_seq = self._load_snapshot(images)
+        snapshot_patients = len(images)
+        replayed = self._replay(images, snapshot_seq)
+
+        repository.add_many(PatientBase.restore(image) for image in images.values())
+
+        self._open_segment()
+        self._repository = repository
+        repository.attach_observer(self)
+        self._writer.start()
+
+        return RecoveryStats(snapshot_patients, replayed, time.perf_counter() - start)
+
+    def _load_snapshot(self, images: Dict[int, dict]) -> int:
+        path = os.path.join(self._directory, self._snapshot_name)
+        if not os.path.exists(path):
+            return 0
+
+        with open(path, encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            for line in f:
+                image = json.loads(line)
+                images[image["patient_id"]] = image
+        self._seq = header["seq"]
+        return header["seq"]
+
+    def _replay(self, images: Dict[int, dict], after_seq: int) -> int:
+        replayed = 0
+        for path in self._segments():
+            with open(path, "rb+") as f:
+                offset = 0
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("satır sonu yok")
+                        record = json.loads(line)
+                    except ValueError:
+                        # çökme sırasında yarım kalmış son satır kesilir;
+                        # aksi halde sonraki yazmalar bu satıra eklenir
+                        f.truncate(offset)
+                        os.fsync(f.fileno())
+                        break
+                    offset += len(line)
+                    if record["seq"] <= after_seq:
+                        continue
+
+                    # kayıtlar tam görüntü taşıdığı için tekrar oynatma idempotenttir
+                    if record["op"] == "remove":
+                        images.pop(record["id"], None)
+                    else:
+                        image = record["patient"]
+                        images[image["patient_id"]] = image
+
+                    self._seq = record["seq"]
+                    replayed += 1
+        return replayed
+
+    # repository gözlemci metotları
+    def on_patient_added(self, patient: PatientBase):
+        self._append({"op": "add", "patient": patient.to_dict()})
+
+    def on_patient_removed(self, patient: PatientBase):
+        self._append({"op": "remove", "id": patient.patient_id})
+
+    def on_patient_changed(self, patient: PatientBase, field: str, old, new):
+        self._append({"op": "change", "field": field, "patient": patient.to_dict()})
+
+    # yazma
+    def _append(self, record: dict):
+        with self._lock:
+            self._seq += 1
+            record["seq"] = self._seq
+            self._buffer.append(json.dumps(record, ensure_ascii=False))
+            pending = len(self._buffer)
+        self._local.seq = record["seq"]
+
+        if pending >= self._group_size:
+            with self._wakeup:
+                self._wakeup.notify()
+
+    def flush(self):
+        """ Bekleyen kayıtları yazar ve diske kalıcı hale getirir (fsync) """
+        with self._io_lock:
+            self._write_pending()
+
+    def wait_durable(self, timeout: Optional[float] = None) -> bool:
+        """ Çağıran iş parçacığının journal'a eklediği son kayıt fsync
+        edilene kadar bekler. Depolama kilidi tutulurken çağrılmamalıdır.
+        Zaman aşımında False döner. """
+        seq = getattr(self._local, "seq", 0)
+        with self._wakeup:
+            self._wakeup.notify()
+        with self._synced:
+            return self._synced.wait_for(lambda: self._synced_seq >= seq, timeout)
+
+    def _write_pending(self):
+        """ Tamponu alıp segmente yazar (_io_lock altında çağrılır) """
+        if self._segment is None:
+            return
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+            last_seq = self._seq
+        if lines:
+            self._segment.write("\n".join(lines) + "\n")
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+        with self._synced:
+            if last_seq > self._synced_seq:
+                self._synced_seq = last_seq
+                self._synced.notify_all()
+
+    def _write_loop(self):
+        while not self._closed:
+            with self._wakeup:
+                self._wakeup.wait(self._commit_interval)
+            self.flush()
+
+    # snapshot / sıkıştırma
+    def checkpoint(self):
+        """ Tüm repository'yi snapshot olarak yazar, eski journal'ı siler.
+
+        Hasta görüntüleri ve seq depolama kilidi altında (journal
+        kilitlerinden önce) alınır ve yeni segmente geçilir; snapshot
+        dosyası kilitler bırakıldıktan sonra yazılır. """
+        self._require_recovered()
+        with self._checkpoint_lock:
+            with self._repository.lock, self._io_lock:
+                self._write_pending()
+                seq = self._seq
+                images = [patient.to_dict() for patient in self._repository.list_all()]
+                # seq'ten sonraki kayıtlar yeni segmente yazılır
+                self._open_segment()
+                current = self._segment.name
+
+            path = os.path.join(self._directory, self._snapshot_name)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"seq": seq}) + "\n")
+                for image in images:
+                    f.write(json.dumps(image, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+
+            # snapshot kalıcı olduktan sonra eski segmentler silinebilir
+            for segment in self._segments():
+                if segment != current:
+                    os.remove(segment)
+
+    def start_compaction(self, interval: float = 60.0):
+        """ Arka planda interval saniyede bir checkpoint alır """
+        self._require_recovered()
+
+        def loop():
+            while not self._stop_compaction.wait(interval):
+                self.checkpoint()
+
+        self._compactor = threading.Thread(target=loop, daemon=True)
+        self._compactor.start()
+
+    def close(self):
+        """ Bekleyenleri yazar, arka plan iş parçacıklarını durdurur """
+        self._stop_compaction.set()
+        if self._compactor is not None:
+            self._compactor.join()
+
+        self._closed = True
+        with self._wakeup:
+            self._wakeup.notify()
+        if self._writer.is_alive():
+            self._writer.join()
+
+        with self._io_lock:
+            self._write_pending()
+            if self._repository is not None:
+                self._repository.detach_observer(self)
+            if self._segment is not None:
+                self._segment.close()
+                self._segment = None
+
+    # yardımcı metotlar
+    def _require_recovered(self):
+        if self._repository is None:
+            raise ValueError("Önce recover() çağrılmalıdır")
+
+    def _segments(self):
+        """ Journal segmentleri başlangıç sırasına göre """
+        paths = glob.glob(os.path.join(self._directory, self._segment_pattern))
+        return sorted(paths, key=lambda p: int(p.rsplit("-", 1)[1].split(".")[0]))
+
+    def _open_segment(self):
+        if self._segment is not None:
+            self._segment.close()
+        path = os.path.join(self._directory, f"journal-{self._seq + 1}.jsonl")
+        self._segment = open(path, "a", encoding="utf-8")
@@ -0,0 +1,270 @@
+# app/modules/patient/mapped_repository.py
+
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from .base import PatientBase
+from .outpatient import parse_appointment_date
+from .snapshot import PatientSnapshot, write_snapshot
+from .storage import PatientStorage, synchronized
+
+
+class MappedPatientRepository(PatientStorage):
+    """
+    İkili snapshot dosyası üzerinde çalışan depolama katmanı.
+
+    Dosya mmap ile açılır; açılışta yalnızca taburcu edilmemiş yatan
+    hastalar (oda doluluğu ve kapasite için) nesneye dönüştürülür. Diğer
+    kayıtlar get_by_id, list_all ya da filtre sonuçlarında erişildikçe
+    oluşturulur ve kimlik haritasında tutulur.
+
+    Oluşturulan hastalar üzerindeki değişiklikler, yeni eklenen ve silinen
+    hastalar bellekte tutulur; kalıcı hale getirmek için save_snapshot ile
+    yeni bir dosya yazılır.
+
+    Filtreler ve sayımlar, henüz oluşturulmamış kayıtlar için dosyadaki
+    tip/durum kolonlarını okur; hasta nesnesi oluşturmaz.
+    """
+
+    # snapshot kolonlarını baştan sona tarayan metotlar (app.metrics ile
+    # ölçümde taranan kayıt sayısı tutulur)
+    _metric_scans = (
+        "list_all", "filter_by", "count_by", "list_patients_by_priority",
+        "filter_by_appointment_date",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        wards: Optional[List[dict]] = None,
+        max_inpatients: Optional[int] = None
+    ):
+        super().__init__(wards, max_inpatients)
+        self._snapshot = PatientSnapshot(path)
+        self._cache: Dict[int, PatientBase] = {}
+        self._added: Dict[int, PatientBase] = {}
+        self._removed: Set[int] = set()
+        self._next_id = max(2501, self._snapshot.next_id)
+
+        for index in self._snapshot.inpatient_indexes:
+            self._reserve(self._materialize(index), check_capacity=False)
+
+    @synchronized
+    def close(self):
+        self._snapshot.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @synchronized
+    def save_snapshot(self, path: str):
+        """ Güncel durumu yeni bir snapshot dosyasına yazar """
+        write_snapshot(path, self._iter_patients(), self._next_id)
+
+    # hasta id oluşturma
+    @synchronized
+    def generate_id(self) -> int:
+        pid = self._next_id
+        self._next_id += 1
+        return pid
+
+    # temel işlemler
+    @synchronized
+    def add(self, patient: PatientBase):
+        """ Yeni hasta ekler. ID yoksa otomatik ID atar. """
+        if patient.patient_id is None:
+            patient._assign_id(self.generate_id())
+
+        if self._contains(patient.patient_id):
+            raise ValueError(
+                f"Aynı ID'ye sahip hasta zaten mevcut: {patient.patient_id}"
+            )
+        if patient.patient_id >= self._next_id:
+            self._next_id = patient.patient_id + 1
+
+        self._reserve(patient)
+        self._added[patient.patient_id] = patient
+        self._track(patient)
+
+        for observer in self._observers:
+            observer.on_patient_added(patient)
+
+    @synchronized
+    def remove(self, patient_id: int):
+        """ ID'ye göre hasta siler. """
+        patient = self.get_by_id(patient_id)
+        if patient is None:
+            raise ValueError(f"Silinecek hasta bulunamadı: {patient_id}")
+
+        self._untrack(patient)
+        self._unreserve(patient)
+
+        for observer in self._observers:
+            observer.on_patient_removed(patient)
+
+    @synchronized
+    def get_by_id(self, patient_id: int) -> Optional[PatientBase]:
+        """ ID'ye göre hasta döndürür (gerekirse dosyadan oluşturur) """
+        patient = self._cache.get(patient_id)
+        if patient is not None or patient_id in self._removed:
+            return patient
+
+        index = self._snapshot.index_of(patient_id)
+        return None if index is None else self._materialize(index)
+
+    @synchronized
+    def replace_patient(self, old_patient, new_patient):
+        """ Bir hasta kaydını başka bir hasta nesnesiyle değiştirir.
+        ID aynıysa list_all içindeki yeri korunur. """
+        if self.get_by_id(old_patient.patient_id) is not old_patient:
+            raise ValueError("Değiştirilecek hasta bulunamadı")
+
+        if (
+            new_patient.patient_id != old_patient.patient_id
+            and self._contains(new_patient.patient_id)
+        ):
+            raise ValueError(
+                f"Aynı ID'ye sahip hasta zaten mevcut: {new_patient.patient_id}"
+            )
+
+        self._unreserve(old_patient)
+        try:
+            self._reserve(new_patient)
+        except ValueError:
+            self._reserve(old_patient, check_capacity=False)
+            raise
+
+        pid = new_patient.patient_id
+        if pid == old_patient.patient_id:
+            # aynı ID: snapshot ya da eklenenler içindeki yeri korunur
+            old_patient.remove_watcher(self._on_patient_changed)
+            if pid in self._added:
+                self._added[pid] = new_patient
+        else:
+            self._untrack(old_patient)
+            self._added[pid] = new_patient
+        self._track(new_patient)
+
+        self._notify_replaced(old_patient, new_patient)
+
+    @synchronized
+    def list_all(self) -> List[PatientBase]:
+        """ Tüm hastaları listeler (snapshot kayıtları, ardından yeni eklenenler) """
+        return list(self._iter_patients())
+
+    @synchronized
+    def count(self) -> int:
+        return len(self._snapshot) - len(self._removed) + len(self._added)
+
+    # filtreler
+    @synchronized
+    def filter_by(
+        self,
+        patient_types: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None
+    ) -> List[PatientBase]:
+        return [
+            self._cache.get(pid) or self._materialize(index)
+            for pid, index in self._select(patient_types, statuses)
+        ]
+
+    @synchronized
+    def count_by(
+        self,
+        patient_types: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None
+    ) -> int:
+        return sum(1 for _ in self._select(patient_types, statuses))
+
+    @synchronized
+    def filter_by_appointment_date(self, day: Union[str, date]) -> List[PatientBase]:
+        """ Randevu tarihi day olan ayaktan hastalar. Snapshot dosyasında
+        tarih kolonu olmadığı için ayaktan hastalar oluşturularak taranır. """
+        ordinal = parse_appointment_date(day).toordinal()
+        return [
+            patient for patient in self.filter_by(patient_types=("outpatient",))
+            if patient._appointment_date == ordinal
+        ]
+
+    @synchronized
+    def list_patients_by_priority(self, only_active: bool = False) -> List[PatientBase]:
+        """ Hastaları öncelik değerine göre (büyükten küçüğe) sıralar """
+        statuses = PatientBase._active_statuses if only_active else None
+        patients = self.filter_by(statuses=statuses)
+        return sorted(patients, key=lambda p: p.get_priority(), reverse=True)
+
+    # yardımcı metotlar
+    def _contains(self, patient_id: int) -> bool:
+        if patient_id in self._cache:
+            return True
+        if patient_id in self._removed:
+            return False
+        return self._snapshot.index_of(patient_id) is not None
+
+    def _iter_patients(self) -> Iterator[PatientBase]:
+        snapshot = self._snapshot
+        for index in range(len(snapshot)):
+            pid = snapshot.patient_id(index)
+            if pid not in self._removed:
+                yield self._cache.get(pid) or self._materialize(index)
+        yield from self._added.values()
+
+    def _select(self, patient_types, statuses):
+        """ Seçime uyan (id, kayıt sırası) çiftleri. Oluşturulmuş hastalar
+        için güncel nesne, diğerleri için dosyadaki kolonlar kullanılır.
+        Yeni eklenen hastalar için kayıt sırası None'dır. """
+        snapshot = self._snapshot
+        type_codes = snapshot.type_codes(patient_types)
+        status_codes = snapshot.status_codes(statuses)
+        types = None if patient_types is None else {t.lower() for t in patient_types}
+        wanted = None if statuses is None else set(statuses)
+
+        def live_match(patient):
+            return (
+                (types is None or self._type_key(patient) in types)
+                and (wanted is None or patient.status in wanted)
+            )
+
+        for index in range(len(snapshot)):
+            pid = snapshot.patient_id(index)
+            if pid in self._removed:
+                continue
+            patient = self._cache.get(pid)
+            if patient is not None:
+                if live_match(patient):
+                    yield pid, index
+            elif snapshot.matches(index, type_codes, status_codes):
+                yield pid, index
+
+        for pid, patient in self._added.items():
+            if live_match(patient):
+                yield pid, None
+
+    @staticmethod
+    def _type_key(patient: PatientBase) -> str:
+        return patient.__class__.__name__.lower()
+
+    def _materialize(self, index: int) -> PatientBase:
+        patient = self._snapshot.materialize(index)
+        self._track(patient)
+        return patient
+
+    def _track(self, patient: PatientBase):
+        self._cache[patient.patient_id] = patient
+        patient.add_watcher(self._on_patient_changed)
+
+    def _untrack(self, patient: PatientBase):
+        patient.remove_watcher(self._on_patient_changed)
+        del self._cache[patient.patient_id]
+        if self._added.pop(patient.patient_id, None) is None:
+            self._removed.add(patient.patient_id)
+
+    @synchronized
+    def _on_patient_changed(self, patient: PatientBase, field: str, old, new):
+        self._apply_change(patient, field, old, new)
+
+        for observer in self._observers:
+            observer.on_patient_changed(patient, field, old, new)
@@ -0,0 +1,273 @@
+# app/modules/patient/name_index.py
+
+import heapq
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .base import PatientBase
+from .storage import PatientStorage
+from .text import ASCII_FOLD, tokenize
+
+
+class _TrieNode:
+    __slots__ = ("children", "ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.ids: Optional[Set[int]] = None
+
+
+class NameIndex:
+    """
+    Hasta isimleri için önek ve hataya toleranslı arama indeksi.
+
+    İsimler Türkçe kurallarıyla küçük harfe çevrilip (İ/ı, I/i) kelimelere
+    ayrılır. Her kelime kelime trie'sine, çok kelimeli isimlerin kelime
+    sonekleri ("ali veli kaya" -> "ali veli kaya", "veli kaya") ise ifade
+    trie'sine eklenir. İndeks repository'ye gözlemci olarak bağlanır; ekleme,
+    silme, değiştirme ve isim güncellemelerinde senkron kalır.
+
+    - prefix_search: sorgu ardışık kelimelerin önekiyse doğrudan ifade
+      trie'sinden, değilse en seçici kelime üzerinden cevaplanır. Sonuçlar
+      genişlik öncelikli toplandığından tam eşleşen ve kısa isimler önce
+      gelir; limit dolunca arama durur.
+    - fuzzy_search: kelime trie'si üzerinde satır satır Levenshtein mesafesi
+      hesaplanır, mesafe sınırını aşan dallar budanır. Sonuçlar toplam
+      mesafeye göre sıralanır.
+    """
+
+    def __init__(self, repository: PatientStorage):
+        self._root = _TrieNode()
+        self._phrases = _TrieNode()
+        self._patients: Dict[int, PatientBase] = {}
+        self._tokens: Dict[int, Tuple[str, ...]] = {}
+
+        with repository.lock:
+            for patient in repository.list_all():
+                self.on_patient_added(patient)
+            repository.attach_observer(self)
+
+    def __len__(self) -> int:
+        return len(self._patients)
+
+    # repository gözlemci metotları
+    def on_patient_added(self, patient: PatientBase):
+        pid = patient.patient_id
+        tokens = tuple(tokenize(patient.name))
+        self._patients[pid] = patient
+        self._tokens[pid] = tokens
+        for token in set(tokens):
+            self._insert(self._root, token, pid)
+        for phrase in self._phrase_keys(tokens):
+            self._insert(self._phrases, phrase, pid)
+
+    def on_patient_removed(self, patient: PatientBase):
+        pid = patient.patient_id
+        self._patients.pop(pid, None)
+        tokens = self._tokens.pop(pid, ())
+        for token in set(tokens):
+            self._delete(self._root, token, pid)
+        for phrase in self._phrase_keys(tokens):
+            self._delete(self._phrases, phrase, pid)
+
+    def on_patient_changed(self, patient: PatientBase, field: str, old, new):
+        if field == "name":
+            self.on_patient_removed(patient)
+            self.on_patient_added(patient)
+
+    # sorgular
+    def prefix_search(self, query: str, limit: int = 20) -> List[PatientBase]:
+        """ Her kelimesi sorgudaki kelimelerle başlayan hastaları döndürür """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        if len(words) > 1:
+            node = self._find(self._phrases, " ".join(words))
+            if node is not None:
+                return self._take(self._collect(node), (), limit)
+
+        # en uzun (en seçici) kelime trie'de aranır, diğerleri sonuçta kontrol edilir
+        anchor = max(words, key=len)
+        others = list(words)
+        others.remove(anchor)
+
+        node = self._find(self._root, anchor)
+        if node is None:
+            return []
+        return self._take(self._collect(node), others, limit)
+
+    def _take(self, ids: Iterator[int], others, limit: int) -> List[PatientBase]:
+        """ Diğer sorgu kelimelerini de önek olarak içeren ilk limit hasta """
+        result = []
+        seen = set()
+        for pid in ids:
+            if pid in seen:
+                continue
+            seen.add(pid)
+            tokens = self._tokens[pid]
+            if all(any(t.startswith(w) for t in tokens) for w in others):
+                result.append(self._patients[pid])
+                if len(result) >= limit:
+                    break
+        return result
+
+    def fuzzy_search(
+        self, query: str, limit: int = 20, max_distance: int = 2
+    ) -> List[PatientBase]:
+        """ Yazım hatalarına toleranslı arama. İzin verilen mesafe kelime
+        uzunluğuna göre artar (1-2 harf: 0, 3-7 harf: 1, 8+ harf: 2) ve
+        max_distance ile sınırlanır. """
+        words = tokenize(query)
+        if not words:
+            return []
+
+        matches = []
+        for word in words:
+            similar = self._similar_tokens(word, self._allowed_distance(word, max_distance))
+            if not similar:
+                return []
+            matches.append(similar)
+
+        # en az hastaya uyan kelimenin eşleşmelerinden aday toplanır
+        anchor = min(
+            range(len(words)),
+            key=lambda i: sum(len(n.ids) for _, n in matches[i].values())
+        )
+        # mesafesi küçük eşleşmelerden başlanır; toplam skor çapa kelimenin
+        # mesafesinden küçük olamayacağı için limit dolunca erken durulur
+        scores: Dict[int, int] = {}
+        tier = None
+        for distance, node in sorted(matches[anchor].values(), key=lambda m: m[0]):
+            if distance != tier:
+                if len(scores) >= limit and heapq.nsmallest(limit, scores.values())[-1] <= distance:
+                    break
+                tier = distance
+            for pid in node.ids:
+                if pid in scores:
+                    continue
+                total = self._score(pid, matches)
+                if total is not None:
+                    scores[pid] = total
+
+        best = heapq.nsmallest(
+            limit, scores, key=lambda pid: (scores[pid], self._patients[pid].name, pid)
+        )
+        return [self._patients[pid] for pid in best]
+
+    # trie işlemleri
+    @staticmethod
+    def _allowed_distance(word: str, max_distance: int) -> int:
+        if len(word) < 3:
+            return 0
+        return min(max_distance, 1 + len(word) // 8)
+
+    @staticmethod
+    def _phrase_keys(tokens: Tuple[str, ...]) -> List[str]:
+        return [" ".join(tokens[i:]) for i in range(len(tokens) - 1)]
+
+    @staticmethod
+    def _insert(root: _TrieNode, token: str, pid: int):
+        node = root
+        for char in token:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+        if node.ids is None:
+            node.ids = set()
+        node.ids.add(pid)
+
+    @staticmethod
+    def _delete(root: _TrieNode, token: str, pid: int):
+        path = [root]
+        for char in token:
+            node = path[-1].children.get(char)
+            if node is None:
+                return
+            path.append(node)
+
+        leaf = path[-1]
+        if leaf.ids is not None:
+            leaf.ids.discard(pid)
+            if not leaf.ids:
+                leaf.ids = None
+
+        # boşalan dallar budanır
+        for depth in range(len(token), 0, -1):
+            node = path[depth]
+            if node.ids is not None or node.children:
+                break
+            del path[depth - 1].children[token[depth - 1]]
+
+    @staticmethod
+    def _find(root: _TrieNode, prefix: str) -> Optional[_TrieNode]:
+        node = root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def _collect(node: _TrieNode) -> Iterator[int]:
+        """ Alt ağaçtaki id'leri kelime uzunluğu sırasıyla (BFS) üretir """
+        queue = deque([node])
+        while queue:
+            node = queue.popleft()
+            if node.ids:
+                yield from sorted(node.ids)
+            queue.extend(node.children[c] for c in sorted(node.children))
+
+    def _similar_tokens(self, word: str, max_distance: int) -> Dict[str, Tuple[int, _TrieNode]]:
+        """ word'e en fazla max_distance Levenshtein mesafesindeki kelimeler.
+        Türkçe harf ile ASCII karşılığı (ı/i, ş/s...) aynı kabul edilir.
+        Yalnızca köşegen etrafındaki |i - derinlik| <= max_distance bandı
+        hesaplanır; bandın dışı zaten sınırı aşar. """
+        result = {}
+        word = "".join(ASCII_FOLD.get(c, c) for c in word)
+        size = len(word)
+        cap = max_distance + 1
+        first_row = [min(i, cap) for i in range(size + 1)]
+        stack = [
+            (child, char, first_row, char)
+            for char, child in self._root.children.items()
+        ]
+
+        while stack:
+            node, char, previous, token = stack.pop()
+            depth = len(token)
+            char = ASCII_FOLD.get(char, char)
+            row = [min(depth, cap)] + [cap] * size
+            best = row[0]
+            for i in range(max(1, depth - max_distance), min(size, depth + max_distance) + 1):
+                value = previous[i - 1] + (word[i - 1] != char)
+                if row[i - 1] + 1 < value:
+                    value = row[i - 1] + 1
+                if previous[i] + 1 < value:
+                    value = previous[i] + 1
+                if value > cap:
+                    value = cap
+                row[i] = value
+                if value < best:
+                    best = value
+
+            if node.ids and row[size] <= max_distance:
+                result[token] = (row[size], node)
+            if best <= max_distance:
+                stack.extend(
+                    (child, c, row, token + c) for c, child in node.children.items()
+                )
+        return result
+
+    def _score(self, pid: int, matches) -> Optional[int]:
+        """ Her sorgu kelimesi için hastanın en yakın kelimesinin mesafe
+        toplamı; eşleşmeyen kelime varsa None """
+        tokens = self._tokens[pid]
+        total = 0
+        for similar in matches:
+            distances = [similar[t][0] for t in tokens if t in similar]
+            if not distances:
+                return None
+            total += min(distances)
+        return total
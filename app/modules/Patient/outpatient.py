@@ -1,44 +1,80 @@
 # app/modules/patient/outpatient.py
 
 from .base import PatientBase
-from datetime import datetime
-from typing import Optional, List
+from array import array
+from datetime import date, datetime
+from typing import Optional, List, Union
+
+
+def parse_appointment_date(value: Union[str, date]) -> date:
+    """ 'YYYY-MM-DD' metnini ya da date nesnesini date'e çevirir.
+    Metinler strptime yerine date.fromisoformat ile (hızlı yol) okunur;
+    fromisoformat'ın kabul ettiği diğer ISO biçimleri reddedilir. """
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and len(value) == 10 and value[4] == value[7] == "-":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    raise ValueError("Randevu tarihi 'YYYY-MM-DD' formatında olmalıdır.")
+
 
 class Outpatient(PatientBase):
     """
     Ayaktan hasta sınıfı
+    Randevu tarihi tarih ordinal'i (int), geçmiş randevular ordinal
+    olarak array('l') içinde tutulur. Randevu tarihi değişikliği
+    "appointment_date" alanı (eski, yeni date) olarak bildirilir; iptal /
+    tamamlandı durumunda randevu geçmişe taşınır ve durum bildirilir.
     """
 
-    def __init__(self, patient_id: Optional[int],  name: str, age: int, gender: str, appointment_date: Optional[str] = None, status: str = "aktif"
+    __slots__ = ("_appointment_date", "_appointment_history")
+
+    def __init__(self, patient_id: Optional[int],  name: str, age: int, gender: str, appointment_date: Optional[Union[str, date]] = None, status: str = "aktif"
     ):
+        # update_status override'ı base __init__ içinde çağrılır
+        self._appointment_date: Optional[int] = None
+        self._appointment_history: Optional[array] = None
         super().__init__(patient_id, name, age, gender, status)
 
-        self._appointment_history: List[str] = []
         self.appointment_date = appointment_date
 
     # property
     @property
     def appointment_date(self) -> Optional[str]:
-        return self._appointment_date
+        """ Randevu tarihi ('YYYY-MM-DD') """
+        day = self.appointment_day
+        return None if day is None else day.isoformat()
 
     @appointment_date.setter
-    def appointment_date(self, value: Optional[str]):
-        if value is not None:
-            try:
-                datetime.strptime(value, "%Y-%m-%d")
-            except ValueError:
-                raise ValueError(
-                    "Randevu tarihi 'YYYY-MM-DD' formatında olmalıdır."
-                )
-        self._appointment_date = value
+    def appointment_date(self, value: Optional[Union[str, date]]):
+        ordinal = None if value is None else parse_appointment_date(value).toordinal()
+        old = self._appointment_date
+        if old == ordinal:
+            return
+        self._appointment_date = ordinal
+        self._notify(
+            "appointment_date",
+            None if old is None else date.fromordinal(old),
+            None if ordinal is None else date.fromordinal(ordinal),
+        )
+
+    @property
+    def appointment_day(self) -> Optional[date]:
+        """ Randevu tarihi (date) """
+        ordinal = self._appointment_date
+        return None if ordinal is None else date.fromordinal(ordinal)
 
     # abstract method override
     def get_priority(self) -> int:
         """Outpatient için düşük öncelik"""
         return 3
 
-    def detailed_info(self) -> str:
-        base_info = super().detailed_info()
+    def _render_info(self) -> str:
+        base_info = super()._render_info()
         return (
             f"{base_info}\n"
             f"Randevu Tarihi: {self.appointment_date or '-'}"
@@ -47,15 +83,55 @@ class Outpatient(PatientBase):
     # base davranışı override
     def update_status(self, new_status: str):
         if new_status in ("iptal", "tamamlandı") and self._appointment_date:
+            if self._appointment_history is None:
+                self._appointment_history = array("l")
             self._appointment_history.append(self._appointment_date)
+            # ayrı bildirim yapılmaz; dinleyiciler durum bildiriminde
+            # randevunun geçmişe taşındığını görür
             self._appointment_date = None
 
         super().update_status(new_status)
 
+    @classmethod
+    def from_dict(cls, data: dict):
+        """ Dictionary üzerinden ayaktan hasta oluşturur """
+        return cls(
+            patient_id=data.get("patient_id"),
+            name=data["name"],
+            age=data["age"],
+            gender=data["gender"],
+            appointment_date=data.get("appointment_date"),
+            status=data.get("status", "aktif"),
+        )
+
+    def to_dict(self) -> dict:
+        data = super().to_dict()
+        data["appointment_date"] = self.appointment_date
+        data["appointment_history"] = self.get_appointment_history()
+        return data
+
+    def _restore_state(self, data: dict):
+        super()._restore_state(data)
+        appointment_date = data.get("appointment_date")
+        self._appointment_date = (
+            date.fromisoformat(appointment_date).toordinal()
+            if appointment_date else None
+        )
+        history = data.get("appointment_history")
+        self._appointment_history = (
+            array("l", (date.fromisoformat(d).toordinal() for d in history))
+            if history else None
+        )
+
     # yardımcı davranış
     def has_appointment(self) -> bool:
         return self._appointment_date is not None
 
     def get_appointment_history(self) -> List[str]:
         """ Hastanın geçmiş randevularını döndürür """
-        return list(self._appointment_history)
+        if self._appointment_history is None:
+            return []
+        return [
+            date.fromordinal(ordinal).isoformat()
+            for ordinal in self._appointment_history
+        ]
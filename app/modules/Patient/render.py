@@ -0,0 +1,45 @@
+# app/modules/patient/render.py
+
+import sys
+from typing import IO, Iterable, Optional
+
+from .base import PatientBase
+
+
+def write_patient_list(
+    patients: Iterable[PatientBase],
+    out: Optional[IO[str]] = None,
+    title: Optional[str] = None,
+    detailed: bool = False,
+    chunk_size: int = 500
+) -> int:
+    """
+    Hasta listesini satır satır out'a (varsayılan: terminal) yazar ve
+    yazılan hasta sayısını döndürür.
+
+    Liste bellekte tek metin olarak oluşturulmaz; satırlar chunk_size'lık
+    parçalar halinde yazılır, patients bir üreteç (generator) olabilir.
+    Satırlar hastaların önbellekteki summary_line / detailed_info
+    metinlerinden oluşturulur.
+    """
+    out = out or sys.stdout
+    if title is not None:
+        out.write(f"\n{title}\n")
+
+    chunk = []
+    count = 0
+    for count, patient in enumerate(patients, start=1):
+        if detailed:
+            chunk.append(f"\n{patient.detailed_info()}\n")
+        else:
+            chunk.append(f"{count}. {patient.summary_line()}\n")
+        if len(chunk) >= chunk_size:
+            out.write("".join(chunk))
+            chunk.clear()
+
+    if chunk:
+        out.write("".join(chunk))
+    if count == 0:
+        out.write("Kayıt bulunamadı.\n")
+    out.flush()
+    return count
@@ -1,125 +1,332 @@
 # app/modules/patient/repository.py
 
-from typing import List, Optional
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Union
 from .base import PatientBase
-from .inpatient import Inpatient
+from .outpatient import parse_appointment_date
+from .triage_queue import TriageQueue
+from .storage import PatientStorage, synchronized
 
-class PatientRepository:
+class PatientRepository(PatientStorage):
     """
-    Hasta verilerinin in-memory olarak yönetildiği repository sınıfı
+    Hasta verilerinin in-memory olarak yönetildiği repository sınıfı.
+    Hastalar ID -> hasta sözlüğünde tutulur; sözlük eklenme sırasını
+    koruduğu için list_all sıralaması değişmez, arama/ekleme/silme O(1)'dir.
+
+    Tip ve durum filtreleri için tip -> durum -> {id: hasta} kovaları tutulur.
+    Kovalar hastaların update_status bildirimleriyle güncellenir, böylece
+    filtreler toplam hasta sayısına değil sonuç sayısına bağlı çalışır;
+    sonuçlar kayıt sırası (seq) ile birleştirilir.
+
+    Ayaktan hastalar randevu tarihi (ordinal) -> {id: hasta} indeksinde
+    tutulur; tarih değişikliği ve update_status ile randevunun geçmişe
+    taşınması bildirimlerle izlenir, günlük poliklinik listeleri sonuç
+    sayısına bağlı çalışır.
+
+    Aktif hastalar ayrıca TriageQueue üzerinde öncelik sırasıyla tutulur.
+    Aktif öncelik listesi kuyruğun önbellekli sıralı görünümünden gelir;
+    pop ile çağrılan hastalar aktif kaldıkça listede kalır.
+    Oda/yatak doluluğu RoomAllocator tarafından servis tanımına göre izlenir.
+
+    Ek yapılar (ör. kolon bazlı analiz deposu) attach_observer ile bağlanıp
+    on_patient_added / on_patient_removed / on_patient_changed çağrılarıyla
+    repository ile senkron tutulur.
+
+    Otomatik ID'ler id_start'tan başlayıp id_step adımla artar. Birden fazla
+    repository'nin ID'leri çakışmamalıysa (ör. hastane shard'ları) her biri
+    farklı başlangıç ve ortak adımla oluşturulur.
     """
 
-    def __init__(self):
-        self._patients: List[PatientBase] = []
-        self._next_id: int = 2501 
-        self._all_rooms = [
-            101,102,103,104,
-            201,202,203,204,
-            301,302,303,304,
-            401,402,403,404
-        ]
-        
+    # hasta dolaşan metotlar -> dolaşılan kayıt sayısı (app.metrics ile
+    # ölçümde tutulur; None: count())
+    _metric_scans = {
+        "list_all": None,
+        "list_patients_by_priority": "_priority_scan_size",
+    }
+
+    def __init__(
+        self,
+        wards: Optional[List[dict]] = None,
+        max_inpatients: Optional[int] = None,
+        id_start: int = 2501,
+        id_step: int = 1
+    ):
+        super().__init__(wards, max_inpatients)
+        self._patients: Dict[int, PatientBase] = {}
+        self._buckets: Dict[str, Dict[str, Dict[int, PatientBase]]] = {}
+        self._triage = TriageQueue()
+        self._by_date: Dict[int, Dict[int, PatientBase]] = {}
+        self._date_of: Dict[int, int] = {}
+        self._seq: Dict[int, int] = {}
+        self._next_seq: int = 0
+        self._next_id: int = id_start
+        self._id_step: int = id_step
+
     # hasta id oluşturma
+    @synchronized
     def generate_id(self) -> int:
         pid = self._next_id
-        self._next_id += 1
+        self._next_id += self._id_step
         return pid
 
+    @synchronized
     def add(self, patient: PatientBase):
         """ Yeni hasta ekler.
         ID yoksa otomatik ID atar. """
         if patient.patient_id is None:
-            patient._patient_id = self.generate_id()
+            patient._assign_id(self.generate_id())
 
-        if self.get_by_id(patient.patient_id) is not None:
+        if patient.patient_id in self._patients:
             raise ValueError(
                 f"Aynı ID'ye sahip hasta zaten mevcut: {patient.patient_id}"
             )
 
-        self._patients.append(patient)
+        # dışarıdan verilen ID'ler sonraki otomatik ID'lerle çakışmasın
+        if patient.patient_id >= self._next_id:
+            skipped = (patient.patient_id - self._next_id) // self._id_step + 1
+            self._next_id += skipped * self._id_step
+
+        self._reserve(patient)
+        self._patients[patient.patient_id] = patient
+        self._attach(patient)
+
+        for observer in self._observers:
+            observer.on_patient_added(patient)
 
+    @synchronized
     def remove(self, patient_id: int):
         """ ID'ye göre hasta siler. """
-        patient = self.get_by_id(patient_id)
+        patient = self._patients.pop(patient_id, None)
         if patient is None:
             raise ValueError(f"Silinecek hasta bulunamadı: {patient_id}")
-        self._patients.remove(patient)
+        self._detach(patient)
+        self._unreserve(patient)
+
+        for observer in self._observers:
+            observer.on_patient_removed(patient)
 
     def get_by_id(self, patient_id: int) -> Optional[PatientBase]:
-        """ ID'ye göre hasta döndürür. """
-        for patient in self._patients:
-            if patient.patient_id == patient_id:
-                return patient
-        return None
+        """ ID'ye göre hasta döndürür.
+        Tek bir sözlük okuması atomik olduğu için kilit alınmaz. """
+        return self._patients.get(patient_id)
 
+    @synchronized
     def list_all(self) -> List[PatientBase]:
         """ Tüm hastaları listeler. """
-        return list(self._patients)
+        return list(self._patients.values())
+
+    @synchronized
+    def filter_by(
+        self,
+        patient_types: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None
+    ) -> List[PatientBase]:
+        """ Tip ve/veya durum kümesine göre kovalardan hasta toplar.
+        None verilen boyut filtrelenmez. Sonuç kayıt sırasındadır. """
+        if patient_types is None:
+            type_buckets = list(self._buckets.values())
+        else:
+            type_buckets = [
+                self._buckets[t.lower()] for t in patient_types
+                if t.lower() in self._buckets
+            ]
+
+        result = []
+        for by_status in type_buckets:
+            if statuses is None:
+                for bucket in by_status.values():
+                    result.extend(bucket.values())
+            else:
+                for status in statuses:
+                    bucket = by_status.get(status)
+                    if bucket:
+                        result.extend(bucket.values())
 
-    def filter_by_status(self, status: str) -> List[PatientBase]:
-        """ Duruma göre hasta filtreler. """
-        return [p for p in self._patients if p.status == status]
+        # kovalar kendi içinde bile kayıt sırasında değildir (durum
+        # değişen hasta yeni kovanın sonuna eklenir); seq ile sıralanır
+        if len(result) > 1:
+            result.sort(key=lambda p, seq=self._seq: seq[p.patient_id])
+        return result
 
-    def filter_by_type(self, patient_type: str) -> List[PatientBase]:
-        """ Hasta tipine göre filtreleme 
-        (Inpatient, Outpatient, EmergencyPatient) """
-        return [
-            p for p in self._patients
-            if p.__class__.__name__.lower() == patient_type.lower()
-        ]
+    @synchronized
+    def count_by(
+        self,
+        patient_types: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None
+    ) -> int:
+        """ filter_by ile aynı seçimin yalnızca sayısını döndürür """
+        if patient_types is None:
+            type_buckets = list(self._buckets.values())
+        else:
+            type_buckets = [
+                self._buckets[t.lower()] for t in patient_types
+                if t.lower() in self._buckets
+            ]
+
+        total = 0
+        for by_status in type_buckets:
+            if statuses is None:
+                total += sum(len(b) for b in by_status.values())
+            else:
+                total += sum(len(by_status.get(s, ())) for s in statuses)
+        return total
 
     def count(self) -> int:
         """ Toplam hasta sayısını döndürür. """
         return len(self._patients)
+
+    @synchronized
+    def filter_by_appointment_date(self, day: Union[str, date]) -> List[PatientBase]:
+        """ Randevu tarihi day olan ayaktan hastalar (tarih indeksinden) """
+        bucket = self._by_date.get(parse_appointment_date(day).toordinal())
+        return list(bucket.values()) if bucket else []
     
-    def release_room_if_inpatient(self, patient: PatientBase):
-        """ Taburcu olan hasta Inpatient ise odasını boşaltır """
-        if isinstance(patient, Inpatient):
-            patient.clear_room()
-    
+    @synchronized
     def replace_patient(self, old_patient, new_patient):
-        """ Bir hasta kaydını başka bir hasta nesnesiyle değiştirir  """
-        if old_patient not in self._patients:
+        """ Bir hasta kaydını başka bir hasta nesnesiyle değiştirir.
+        ID aynıysa (ör. acilden yatış) kayıt yerinde değişir: list_all
+        sırası ve triyaj sırası korunur, indeksler O(1) güncellenir. """
+        if self._patients.get(old_patient.patient_id) is not old_patient:
             raise ValueError("Değiştirilecek hasta bulunamadı")
 
-        self._patients.remove(old_patient)
-        self._patients.append(new_patient)
-        
-    def get_available_room(self) -> int:
-        used_rooms = {
-            p.room_number for p in self._patients
-            if isinstance(p, Inpatient) and p.room_number is not None
-        }
-
-        for room in self._all_rooms:
-            if room not in used_rooms:
-                return room
+        if (
+            new_patient.patient_id != old_patient.patient_id
+            and new_patient.patient_id in self._patients
+        ):
+            raise ValueError(
+                f"Aynı ID'ye sahip hasta zaten mevcut: {new_patient.patient_id}"
+            )
 
-        raise ValueError("Boş oda bulunamadı")
-    
-    def list_rooms(self):
-        """ Oda numaralarına göre yatan hastaları döndürür """
-        rooms = {}
+        self._unreserve(old_patient)
+        try:
+            self._reserve(new_patient)
+        except ValueError:
+            self._reserve(old_patient, check_capacity=False)
+            raise
 
-        for patient in self._patients:
-            if isinstance(patient, Inpatient) and patient.room_number is not None:
-                rooms[patient.room_number] = patient
+        if new_patient.patient_id == old_patient.patient_id:
+            self._swap(old_patient, new_patient)
+        else:
+            del self._patients[old_patient.patient_id]
+            self._detach(old_patient)
+            self._patients[new_patient.patient_id] = new_patient
+            self._attach(new_patient)
 
-        return rooms
-    
+        self._notify_replaced(old_patient, new_patient)
+        
+    @synchronized
     def list_patients_by_priority(self, only_active: bool = False):
         """
         Hastaları öncelik değerine göre sıralar.
         Emergency > Inpatient > Outpatient gibi çalışır.
         """
-        patients = self._patients
-
         if only_active:
-            patients = [p for p in patients if p.is_active()]
+            return self._triage.ordered()
+
+        return sorted(
+            self._patients.values(), key=lambda p: p.get_priority(), reverse=True
+        )
+
+    def _priority_scan_size(self, only_active: bool = False) -> int:
+        """ list_patients_by_priority'nin sıraladığı kayıt sayısı """
+        return len(self._triage) if only_active else len(self._patients)
+
+    @synchronized
+    def peek_next_patients(self, k: int = 1) -> List[PatientBase]:
+        """ Triyaj kuyruğundaki en öncelikli k aktif hastayı döndürür """
+        return self._triage.peek(k)
+
+    @synchronized
+    def pop_next_patient(self) -> Optional[PatientBase]:
+        """ Sıradaki hastayı triyaj kuyruğundan çıkarır.
+        Hasta, önceliği ya da durumu değişene kadar kuyruğa geri dönmez. """
+        return self._triage.pop()
+
+    # indeks yönetimi
+    @staticmethod
+    def _type_key(patient: PatientBase) -> str:
+        return patient.__class__.__name__.lower()
+
+    def _bucket(self, patient: PatientBase, status: str) -> Dict[int, PatientBase]:
+        by_status = self._buckets.setdefault(self._type_key(patient), {})
+        return by_status.setdefault(status, {})
+
+    def _attach(self, patient: PatientBase):
+        """ Hastayı indekslere ekler ve değişikliklerini dinlemeye başlar """
+        self._bucket(patient, patient.status)[patient.patient_id] = patient
+        self._seq[patient.patient_id] = self._next_seq
+        self._next_seq += 1
+        self._refresh_triage(patient)
+        self._index_appointment(patient)
+        patient.add_watcher(self._on_patient_changed)
+
+    def _detach(self, patient: PatientBase):
+        """ Hastayı indekslerden çıkarır ve dinlemeyi bırakır """
+        patient.remove_watcher(self._on_patient_changed)
+        self._bucket(patient, patient.status).pop(patient.patient_id, None)
+        self._triage.discard(patient.patient_id)
+        self._index_appointment(patient, None)
+        del self._seq[patient.patient_id]
+
+    def _swap(self, old_patient: PatientBase, new_patient: PatientBase):
+        """ Aynı ID'li kaydı yerinde değiştirir; sözlük konumu ve kayıt
+        sırası (seq) korunur, yalnızca tip/durum kovası taşınır """
+        pid = old_patient.patient_id
+        old_patient.remove_watcher(self._on_patient_changed)
+        self._bucket(old_patient, old_patient.status).pop(pid, None)
+        self._triage.discard(pid)
+        self._index_appointment(old_patient, None)
+
+        self._patients[pid] = new_patient
+        self._bucket(new_patient, new_patient.status)[pid] = new_patient
+        self._refresh_triage(new_patient)
+        self._index_appointment(new_patient)
+        new_patient.add_watcher(self._on_patient_changed)
+
+    _no_date = object()
+
+    def _index_appointment(self, patient: PatientBase, ordinal=_no_date):
+        """ Hastanın tarih indeksindeki yerini randevu tarihine (verilmezse
+        hastanın güncel randevusuna) göre günceller """
+        if ordinal is self._no_date:
+            ordinal = getattr(patient, "_appointment_date", None)
+        pid = patient.patient_id
+        old = self._date_of.get(pid)
+        if old == ordinal:
+            return
+
+        if old is not None:
+            bucket = self._by_date[old]
+            del bucket[pid]
+            if not bucket:
+                del self._by_date[old]
+            del self._date_of[pid]
+        if ordinal is not None:
+            self._by_date.setdefault(ordinal, {})[pid] = patient
+            self._date_of[pid] = ordinal
+
+    def _refresh_triage(self, patient: PatientBase):
+        """ Hastanın triyaj kuyruğundaki yerini günceller """
+        if patient.is_active():
+            self._triage.push(patient, self._seq[patient.patient_id])
+        else:
+            self._triage.discard(patient.patient_id)
 
-        return sorted(patients, key=lambda p: p.get_priority(), reverse=True)
+    @synchronized
+    def _on_patient_changed(self, patient: PatientBase, field: str, old, new):
+        """ Hasta nesnesinden gelen değişiklik bildirimlerini işler """
+        if field == "status":
+            self._bucket(patient, old).pop(patient.patient_id, None)
+            self._bucket(patient, new)[patient.patient_id] = patient
+            self._refresh_triage(patient)
+            # iptal / tamamlandı: randevu geçmişe taşınmış olabilir
+            self._index_appointment(patient)
+        elif field == "emergency_level":
+            self._refresh_triage(patient)
+        elif field == "appointment_date":
+            self._index_appointment(patient)
 
+        self._apply_change(patient, field, old, new)
 
-    def list_active_patients(self):
-        """ Taburcu edilmemiş (aktif) hastaları döndürür """
-        return [p for p in self._patients if p.is_active()]
\ No newline at end of file
+        for observer in self._observers:
+            observer.on_patient_changed(patient, field, old, new)
@@ -0,0 +1,178 @@
+# app/modules/patient/rooms.py
+
+import json
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set
+
+from .base import PatientBase
+
+
+# Varsayılan yerleşim: 4 kat, her katta tek yataklı 4 oda
+DEFAULT_WARDS = [
+    {"ward": "Genel", "floor": floor, "rooms": [floor * 100 + i for i in range(1, 5)]}
+    for floor in range(1, 5)
+]
+
+
+class Room:
+    """
+    Tek bir oda ve içindeki yatakların doluluk bilgisi
+    """
+
+    def __init__(self, number: int, ward: str, floor: int, beds: int = 1):
+        if number <= 0:
+            raise ValueError("Oda numarası pozitif bir sayı olmalıdır.")
+        if beds <= 0:
+            raise ValueError("Odada en az bir yatak olmalıdır.")
+
+        self.number = number
+        self.ward = ward
+        self.floor = floor
+        self.beds = beds
+        self.occupants: Dict[int, PatientBase] = {}
+
+    def free_beds(self) -> int:
+        return self.beds - len(self.occupants)
+
+    def is_full(self) -> bool:
+        return len(self.occupants) >= self.beds
+
+
+class RoomAllocator:
+    """
+    Oda/yatak atamalarını boş-liste (free list) yöntemiyle yöneten sınıf.
+
+    Boş yatağı olan odalar; genel, servis, kat ve servis+kat anahtarlı
+    kuyruklarda tutulur. Dolan odalar kuyruktan hemen silinmez, kuyruğun
+    başına geldiklerinde atılır. Böylece atama ve boşaltma O(1) (amortize)
+    çalışır, doluluk için hastaların taranması gerekmez.
+    """
+
+    def __init__(self, rooms: Iterable[Room]):
+        self._rooms: Dict[int, Room] = {}
+        self._free: Dict[tuple, Deque[int]] = {}
+        self._queued: Dict[tuple, Set[int]] = {}
+        self._occupied: Dict[int, Room] = {}
+        self._free_beds = 0
+        self._total_beds = 0
+
+        for room in rooms:
+            if room.number in self._rooms:
+                raise ValueError(f"Oda iki kez tanımlanmış: {room.number}")
+            self._rooms[room.number] = room
+            self._free_beds += room.beds
+            self._total_beds += room.beds
+            self._enqueue(room)
+
+    @classmethod
+    def from_description(cls, wards: List[dict]) -> "RoomAllocator":
+        """ Servis tanımından oda listesi oluşturur.
+
+        Örnek:
+            [{"ward": "Dahiliye", "floor": 1,
+              "rooms": [101, {"number": 102, "beds": 2}]}]
+        """
+        rooms = []
+        for ward in wards:
+            for entry in ward["rooms"]:
+                if isinstance(entry, dict):
+                    number, beds = entry["number"], entry.get("beds", 1)
+                else:
+                    number, beds = entry, 1
+                rooms.append(Room(number, ward["ward"], ward["floor"], beds))
+        return cls(rooms)
+
+    @classmethod
+    def from_file(cls, path: str) -> "RoomAllocator":
+        """ JSON dosyasındaki servis tanımını yükler """
+        with open(path, encoding="utf-8") as f:
+            return cls.from_description(json.load(f))
+
+    # sorgular
+    def get_room(self, room_number: int) -> Optional[Room]:
+        return self._rooms.get(room_number)
+
+    def free_bed_count(self) -> int:
+        return self._free_beds
+
+    def bed_count(self) -> int:
+        return self._total_beds
+
+    def find_free(self, floor: Optional[int] = None, ward: Optional[str] = None) -> int:
+        """ Tercihe uyan boş yataklı bir oda numarası döndürür.
+        Yatağı ayırmaz; ayırma occupy ile yapılır. """
+        key = self._key(floor, ward)
+        queue = self._free.get(key)
+
+        while queue:
+            room = self._rooms[queue[0]]
+            if not room.is_full():
+                return room.number
+            queue.popleft()
+            self._queued[key].discard(room.number)
+
+        raise ValueError("Boş oda bulunamadı")
+
+    def snapshot_free_beds(
+        self, limit: int, floor: Optional[int] = None, ward: Optional[str] = None
+    ) -> List[int]:
+        """ Tercihe uyan en fazla limit kadar boş yatağı (yatak başına bir oda
+        numarası) sırasıyla döndürür. Hiçbir yatağı ayırmaz. """
+        result: List[int] = []
+        for number in self._free.get(self._key(floor, ward), ()):
+            if len(result) >= limit:
+                break
+            free = self._rooms[number].free_beds()
+            result.extend([number] * min(free, limit - len(result)))
+        return result
+
+    def occupancy(self) -> Dict[int, List[PatientBase]]:
+        """ Dolu odalar ve içlerindeki hastalar """
+        return {
+            number: list(room.occupants.values())
+            for number, room in self._occupied.items()
+        }
+
+    # atama / boşaltma
+    def occupy(self, room_number: int, patient: PatientBase):
+        """ Hastayı belirtilen odadaki bir yatağa yerleştirir """
+        room = self._rooms.get(room_number)
+        if room is None:
+            raise ValueError(f"Tanımsız oda numarası: {room_number}")
+        if patient.patient_id in room.occupants:
+            return
+        if room.is_full():
+            raise ValueError(f"Odada boş yatak yok: {room_number}")
+
+        room.occupants[patient.patient_id] = patient
+        self._occupied[room_number] = room
+        self._free_beds -= 1
+
+    def release(self, room_number: int, patient_id: int):
+        """ Hastanın odadaki yatağını boşaltır """
+        room = self._rooms.get(room_number)
+        if room is None or room.occupants.pop(patient_id, None) is None:
+            return
+
+        self._free_beds += 1
+        if not room.occupants:
+            del self._occupied[room_number]
+        self._enqueue(room)
+
+    # yardımcı metotlar
+    @staticmethod
+    def _key(floor: Optional[int], ward: Optional[str]) -> tuple:
+        return (floor, ward)
+
+    def _enqueue(self, room: Room):
+        """ Odayı ait olduğu tüm boş-listelere (henüz yoksa) ekler """
+        for key in (
+            self._key(None, None),
+            self._key(room.floor, None),
+            self._key(None, room.ward),
+            self._key(room.floor, room.ward),
+        ):
+            queued = self._queued.setdefault(key, set())
+            if room.number not in queued:
+                queued.add(room.number)
+                self._free.setdefault(key, deque()).append(room.number)
@@ -1,45 +1,208 @@
-from .repository import PatientRepository
+import threading
+from collections import Counter
+from typing import Iterable, List, Optional, Tuple, Union
+from .storage import PatientStorage
+from .census import CensusSummary, PatientCensus
 from .base import PatientBase
 from .inpatient import Inpatient
 from .emergency_patient import EmergencyPatient
 
 
+class BulkRegistrationResult:
+    """
+    Toplu kayıt sonucu: eklenen hastalar ve satır bazlı hatalar
+    """
+
+    def __init__(self):
+        self.registered: List[PatientBase] = []
+        self.errors: List[Tuple[int, str]] = []
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def __repr__(self):
+        return (
+            f"BulkRegistrationResult(registered={len(self.registered)}, "
+            f"errors={len(self.errors)})"
+        )
+
+
 class PatientService:
     """
-    Hasta işlemlerine ait iş kurallarını yöneten servis katmanı
+    Hasta işlemlerine ait iş kurallarını yöneten servis katmanı.
+    Depolama olarak herhangi bir PatientStorage (ör. PatientRepository,
+    SQLitePatientRepository) kullanılabilir.
+
+    Servis birden fazla iş parçacığından kullanılabilir. Aynı hasta
+    üzerindeki işlemler (durum güncelleme, taburcu, yatış) hasta id'sine
+    göre seçilen kilitle sıralanır; farklı hastalar paralel işlenir.
+    Oda bulma + kayıt gibi birden fazla adımlı işlemler depolamanın kilidi
+    altında tek seferde yapılır, böylece aynı yatak iki hastaya verilemez.
     """
 
-    def __init__(self, repository: PatientRepository):
+    _lock_stripes = 64
+
+    def __init__(self, repository: PatientStorage):
         self._repository = repository
+        self._census: Optional[PatientCensus] = None
+        self._patient_locks = [threading.Lock() for _ in range(self._lock_stripes)]
+
+    def _patient_lock(self, patient_id: int) -> threading.Lock:
+        return self._patient_locks[hash(patient_id) % self._lock_stripes]
 
    
-    def register_patient(self, patient: PatientBase):
+    def register_patient(
+        self,
+        patient: PatientBase,
+        floor: Optional[int] = None,
+        ward: Optional[str] = None
+    ):
         """ Yeni hasta kaydı oluşturur
-        Inpatient ise oda otomatik atanır """
-        if isinstance(patient, Inpatient) and patient.room_number is None:
-            room = self._repository.get_available_room()
-            patient.room_number = room
+        Inpatient ise oda otomatik atanır (kat/servis tercihi opsiyonel) """
+        if not isinstance(patient, Inpatient) or patient.room_number is not None:
+            self._repository.add(patient)
+            return patient
 
-        self._repository.add(patient)
+        with self._repository.lock:
+            room = self._repository.get_available_room(floor=floor, ward=ward)
+            patient.room_number = room
+            try:
+                self._repository.add(patient)
+            except ValueError:
+                patient.room_number = None
+                raise
         return patient
 
 
+    def register_many(
+        self,
+        records: Iterable[Union[PatientBase, dict]],
+        atomic: bool = False,
+        floor: Optional[int] = None,
+        ward: Optional[str] = None
+    ) -> BulkRegistrationResult:
+        """ Birden fazla hastayı tek seferde kaydeder.
+
+        Kayıtlar hasta nesnesi ya da "type" alanlı dictionary olabilir
+        (PatientBase.from_dict). Önce tüm satırlar doğrulanır, odası olmayan
+        yatan hastalara tek bir boş-yatak anlık görüntüsünden oda atanır,
+        ardından geçerli hastalar tek seferde eklenir. Hatalı satırlar işlemi
+        durdurmaz, (satır no, mesaj) olarak döndürülür. atomic=True ise tek
+        bir hata bile varsa hiçbir hasta eklenmez. """
+        with self._repository.lock:
+            return self._register_many(records, atomic, floor, ward)
+
+    def _register_many(self, records, atomic, floor, ward) -> BulkRegistrationResult:
+        result = BulkRegistrationResult()
+        candidates: List[Tuple[int, PatientBase]] = []
+        seen_ids = set()
+
+        # 1) doğrulama
+        for index, record in enumerate(records):
+            try:
+                patient = (
+                    record if isinstance(record, PatientBase)
+                    else PatientBase.from_dict(record)
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                result.errors.append((index, f"Geçersiz kayıt: {e}"))
+                continue
+
+            pid = patient.patient_id
+            if pid is not None and (
+                pid in seen_ids or self._repository.get_by_id(pid) is not None
+            ):
+                result.errors.append(
+                    (index, f"Aynı ID'ye sahip hasta zaten mevcut: {pid}")
+                )
+                continue
+
+            seen_ids.add(pid)
+            candidates.append((index, patient))
+
+        # 2) oda planlama
+        candidates, assignments = self._plan_rooms(candidates, result, floor, ward)
+
+        if atomic and result.errors:
+            result.errors.sort()
+            return result
+
+        # 3) oda atama ve toplu ekleme
+        for patient, room in assignments:
+            patient.room_number = room
+        result.registered = self._repository.add_many(p for _, p in candidates)
+        result.errors.sort()
+        return result
+
+    def _plan_rooms(self, candidates, result, floor, ward):
+        """ Yatan hastalar için tek bir boş yatak listesinden oda planlar.
+        Yatan hasta kapasitesini aşan satırlar hata olarak raporlanır.
+        Kabul edilen satırları ve (hasta, oda) atamalarını döndürür. """
+        slots = self._repository.free_inpatient_slots()
+        planned = Counter()
+        needs_room = []
+        accepted = []
+        assignments = []
+
+        for index, patient in candidates:
+            if not isinstance(patient, Inpatient):
+                accepted.append((index, patient))
+            elif not patient.is_discharged and slots <= 0:
+                result.errors.append((index, "Yatan hasta kapasitesi dolu"))
+            elif patient.room_number is None:
+                slots -= 0 if patient.is_discharged else 1
+                needs_room.append((index, patient))
+            else:
+                room = patient.room_number
+                free = self._repository.room_free_beds(room)
+                if free is None:
+                    result.errors.append((index, f"Tanımsız oda numarası: {room}"))
+                elif free - planned[room] <= 0:
+                    result.errors.append((index, f"Odada boş yatak yok: {room}"))
+                else:
+                    slots -= 0 if patient.is_discharged else 1
+                    planned[room] += 1
+                    accepted.append((index, patient))
+
+        if needs_room:
+            snapshot = self._repository.snapshot_free_beds(
+                len(needs_room) + sum(planned.values()), floor=floor, ward=ward
+            )
+            beds = []
+            for room in snapshot:
+                if planned[room] > 0:
+                    planned[room] -= 1
+                else:
+                    beds.append(room)
+
+            for (index, patient), room in zip(needs_room, beds):
+                assignments.append((patient, room))
+                accepted.append((index, patient))
+            for index, _ in needs_room[len(beds):]:
+                result.errors.append((index, "Boş oda bulunamadı"))
+
+        accepted.sort(key=lambda item: item[0])
+        return accepted, assignments
+
     def discharge_patient(self, patient_id: int):
         """ Hastayı taburcu eder """
-        patient = self._repository.get_by_id(patient_id)
-        if not patient:
-            raise ValueError("Hasta bulunamadı")
+        with self._patient_lock(patient_id):
+            patient = self._repository.get_by_id(patient_id)
+            if not patient:
+                raise ValueError("Hasta bulunamadı")
 
-        patient.update_status("taburcu")
+            patient.update_status("taburcu")
 
    
     def update_patient_status(self, patient_id: int, new_status: str):
         """ Belirtilen ID’ye sahip hastanın durumunu günceller. """
-        patient = self._repository.get_by_id(patient_id)
-        if not patient:
-            raise ValueError("Hasta bulunamadı")
+        with self._patient_lock(patient_id):
+            patient = self._repository.get_by_id(patient_id)
+            if not patient:
+                raise ValueError("Hasta bulunamadı")
 
-        patient.update_status(new_status)
+            patient.update_status(new_status)
 
     
     def get_patient(self, patient_id: int) -> PatientBase:
@@ -59,6 +222,11 @@ class PatientService:
         (Inpatient, Outpatient, EmergencyPatient) """
         return self._repository.filter_by_type(patient_type)
 
+    def list_patients_by_appointment_date(self, day):
+        """ Randevu tarihi day ('YYYY-MM-DD' ya da date) olan ayaktan
+        hastaları listeler (günlük poliklinik listesi). """
+        return self._repository.filter_by_appointment_date(day)
+
     def total_patient_count(self) -> int:
         """ Sistemdeki toplam hasta sayısını döndürür. """
         return self._repository.count()
@@ -66,33 +234,55 @@ class PatientService:
     
     def list_active_patients(self):
         """ Taburcu edilmemiş hastaları listeler. """
-        return [
-            p for p in self._repository.list_all()
-            if p.status != "taburcu"
-        ]
+        return self._repository.filter_by(statuses=self._not_discharged())
 
 
     def list_emergency_patients(self):
         """ Taburcu edilmemiş acil hastaları listeler. """
-        return [
-            p for p in self._repository.list_all()
-            if isinstance(p, EmergencyPatient) and p.status != "taburcu"
-        ]
+        return self._repository.filter_by(
+            patient_types=("EmergencyPatient",),
+            statuses=self._not_discharged()
+        )
+
+    @staticmethod
+    def _not_discharged():
+        return [s for s in PatientBase._valid_statuses if s != "taburcu"]
 
 
     def admit_emergency_patient(self, patient_id: int):
-        """  Emergency hastayı yatışa alır (Inpatient'a dönüştürür)  """
-        patient = self._repository.get_by_id(patient_id)
+        """  Emergency hastayı yatışa alır (Inpatient'a dönüştürür).
+        ID, durum geçmişi ve acil kaydı korunur; kayıt depolamada yerinde
+        değişir. Kapasite doluysa ValueError yükselir, acil kayıt kalır.  """
+        with self._patient_lock(patient_id), self._repository.lock:
+            patient = self._repository.get_by_id(patient_id)
 
-        if not patient or not isinstance(patient, EmergencyPatient):
-            raise ValueError("Acil hasta bulunamadı")
+            if not patient or not isinstance(patient, EmergencyPatient):
+                raise ValueError("Acil hasta bulunamadı")
 
-        room = self._repository.get_available_room()
-        inpatient = Inpatient.from_emergency(patient, room)
+            room = self._repository.get_available_room()
+            inpatient = Inpatient.from_emergency(patient, room)
 
-        self._repository.replace_patient(patient, inpatient)
-        return inpatient
+            self._repository.replace_patient(patient, inpatient)
+            return inpatient
     
     def list_room_occupancy(self):
         """ Odalarda hangi hastalar var bilgisini döndürür """
-        return self._repository.list_rooms()
\ No newline at end of file
+        return self._repository.list_rooms()
+
+    def free_bed_count(self) -> int:
+        """ Boş yatak sayısını döndürür """
+        return self._repository.free_bed_count()
+
+    def census(self) -> CensusSummary:
+        """ Toplam, aktif, acil, yatan hasta ile durum ve triyaj alanı
+        sayımları. Sayaçlar ilk çağrıda oluşturulup sonra canlı tutulduğu
+        için sabit sürede döner. """
+        if self._census is None:
+            with self._repository.lock:
+                if self._census is None:
+                    self._census = PatientCensus(self._repository)
+        return self._census.summary()
+
+    def capacity_info(self) -> str:
+        """ Yatan hasta sayısı / kapasite bilgisini döndürür """
+        return self._repository.capacity_info()
\ No newline at end of file
@@ -0,0 +1,201 @@
+# app/modules/patient/sharding.py
+
+import heapq
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from .base import PatientBase
+from .repository import PatientRepository
+from .service import PatientService
+
+
+class ShardedPatientRepository:
+    """
+    Hastane grubundaki hastaları hastane başına bir PatientRepository
+    (shard) üzerinde tutan yönlendirici.
+
+    Hasta, hospital verilirse o hastanenin shard'ına eklenir. Verilmezse
+    ID'si varsa ID'ye göre (id % shard sayısı), yoksa sırayla (round-robin)
+    bir shard seçilir. Shard'ların otomatik ID'leri ortak adımla
+    (shard sayısı) ve farklı başlangıçla üretilir; böylece ID'ler çakışmaz
+    ve her ID'nin shard'ı id % shard sayısı ile doğrudan bulunur.
+
+    Tek hastaya ait işlemler (get_by_id, remove) yalnızca ilgili shard'a
+    gider. Tüm grubu kapsayan sorgular (filtreler, sayımlar, öncelik
+    sıralaması) thread havuzu üzerinden shard'lara paralel dağıtılıp
+    sonuçları birleştirilir. max_workers <= 1 ise shard'lar sırayla
+    sorgulanır.
+
+    Her shard'ın kendi kilidi, oda/yatak düzeni ve yatan hasta kapasitesi
+    vardır; oda atamalı kayıt gibi iş kuralları için service(hospital)
+    ile o hastanenin PatientService'i kullanılır.
+    """
+
+    def __init__(
+        self,
+        hospitals: Sequence[str],
+        wards: Optional[List[dict]] = None,
+        max_inpatients: Optional[int] = None,
+        max_workers: Optional[int] = None
+    ):
+        if not hospitals:
+            raise ValueError("En az bir hastane tanımlanmalıdır")
+        if len(set(hospitals)) != len(hospitals):
+            raise ValueError("Hastane isimleri benzersiz olmalıdır")
+
+        size = len(hospitals)
+        self._hospitals = list(hospitals)
+        self._index = {name: i for i, name in enumerate(self._hospitals)}
+        self._shards = [
+            PatientRepository(
+                wards, max_inpatients,
+                id_start=2501 + (i - 2501) % size, id_step=size
+            )
+            for i in range(size)
+        ]
+        self._services = [PatientService(shard) for shard in self._shards]
+        self._round_robin = itertools.count()
+
+        workers = size if max_workers is None else max_workers
+        self._executor = (
+            ThreadPoolExecutor(workers, thread_name_prefix="patient-shard")
+            if workers > 1 and size > 1 else None
+        )
+
+    def close(self):
+        """ Thread havuzunu kapatır """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # shard erişimi
+    @property
+    def hospitals(self) -> List[str]:
+        return list(self._hospitals)
+
+    def shard(self, hospital: str) -> PatientRepository:
+        """ Hastanenin repository'si """
+        return self._shards[self._hospital_index(hospital)]
+
+    def service(self, hospital: str) -> PatientService:
+        """ Hastanenin PatientService'i """
+        return self._services[self._hospital_index(hospital)]
+
+    def hospital_of(self, patient_id: int) -> str:
+        """ ID'nin ait olduğu hastane """
+        return self._hospitals[patient_id % len(self._shards)]
+
+    def _hospital_index(self, hospital: str) -> int:
+        index = self._index.get(hospital)
+        if index is None:
+            raise ValueError(f"Tanımsız hastane: {hospital}")
+        return index
+
+    def _shard_for_id(self, patient_id: int) -> PatientRepository:
+        return self._shards[patient_id % len(self._shards)]
+
+    # tek hastaya ait işlemler
+    def add(self, patient: PatientBase, hospital: Optional[str] = None):
+        """ Hastayı hastanesinin (ya da ID'sinin) shard'ına ekler """
+        size = len(self._shards)
+        if hospital is not None:
+            index = self._hospital_index(hospital)
+            if patient.patient_id is not None and patient.patient_id % size != index:
+                raise ValueError(
+                    f"ID {patient.patient_id} {hospital} hastanesine ait değil"
+                )
+        elif patient.patient_id is not None:
+            index = patient.patient_id % size
+        else:
+            index = next(self._round_robin) % size
+
+        self._shards[index].add(patient)
+        return patient
+
+    def remove(self, patient_id: int):
+        self._shard_for_id(patient_id).remove(patient_id)
+
+    def get_by_id(self, patient_id: int) -> Optional[PatientBase]:
+        return self._shard_for_id(patient_id).get_by_id(patient_id)
+
+    # grup sorguları
+    def _fan_out(self, query: Callable[[PatientRepository], object]) -> list:
+        """ Sorguyu tüm shard'larda çalıştırır, sonuçları shard sırasıyla döndürür """
+        if self._executor is None:
+            return [query(shard) for shard in self._shards]
+        return list(self._executor.map(query, self._shards))
+
+    def count(self) -> int:
+        return sum(self._fan_out(lambda shard: shard.count()))
+
+    def count_by_hospital(self) -> Dict[str, int]:
+        """ Hastane başına hasta sayısı """
+        return dict(zip(self._hospitals, self._fan_out(lambda shard: shard.count())))
+
+    def filter_by(
+        self,
+        patient_types: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None
+    ) -> List[PatientBase]:
+        """ Tüm hastanelerde tip ve/veya durum filtresi (shard sırasıyla) """
+        patient_types = None if patient_types is None else tuple(patient_types)
+        statuses = None if statuses is None else tuple(statuses)
+        result = []
+        for part in self._fan_out(lambda shard: shard.filter_by(patient_types, statuses)):
+            result.extend(part)
+        return result
+
+    def count_by(
+        self,
+        patient_types: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None
+    ) -> int:
+        patient_types = None if patient_types is None else tuple(patient_types)
+        statuses = None if statuses is None else tuple(statuses)
+        return sum(self._fan_out(lambda shard: shard.count_by(patient_types, statuses)))
+
+    def filter_by_appointment_date(self, day) -> List[PatientBase]:
+        """ Tüm hastanelerde randevu tarihi day olan ayaktan hastalar """
+        result = []
+        for part in self._fan_out(lambda shard: shard.filter_by_appointment_date(day)):
+            result.extend(part)
+        return result
+
+    def filter_by_status(self, status: str) -> List[PatientBase]:
+        return self.filter_by(statuses=(status,))
+
+    def filter_by_type(self, patient_type: str) -> List[PatientBase]:
+        return self.filter_by(patient_types=(patient_type,))
+
+    def list_active_patients(self) -> List[PatientBase]:
+        return self.filter_by(statuses=PatientBase._active_statuses)
+
+    def list_patients_by_priority(self, only_active: bool = False) -> List[PatientBase]:
+        """ Shard'ların kendi sıralı listeleri öncelik değerine göre
+        birleştirilir; eşit öncelikte shard sırası korunur. Sıralama
+        (Timsort) hazır sıralı parçaları birleştirdiği için bu, heapq.merge
+        ile yapılan k-yollu birleştirmeden hızlıdır. """
+        parts = self._fan_out(lambda shard: shard.list_patients_by_priority(only_active))
+        return sorted(
+            itertools.chain.from_iterable(parts),
+            key=lambda p: p.get_priority(), reverse=True
+        )
+
+    def peek_next_patients(self, k: int = 1) -> List[PatientBase]:
+        """ Tüm hastanelerdeki en öncelikli k aktif hasta """
+        parts = self._fan_out(lambda shard: shard.peek_next_patients(k))
+        merged = heapq.merge(*parts, key=lambda p: p.get_priority(), reverse=True)
+        return list(itertools.islice(merged, k))
+
+    def free_bed_count(self) -> int:
+        return sum(self._fan_out(lambda shard: shard.free_bed_count()))
+
+    def inpatient_count(self) -> int:
+        return sum(self._fan_out(lambda shard: shard.inpatient_count()))
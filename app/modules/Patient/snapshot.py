@@ -0,0 +1,224 @@
+# app/modules/patient/snapshot.py
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Optional
+
+from .base import PatientBase
+
+
+# Dosya düzeni (little-endian):
+#   başlık   : magic(4s) version(H) compat_version(H) count(Q) meta_length(Q)
+#   meta     : UTF-8 JSON (tip ve durum tabloları, kolon konumları, yatan hastalar)
+#   kolonlar : 8 byte hizalı, sabit genişlikli diziler (kayıt başına bir eleman)
+#   payload  : kayıt başına to_dict JSON'u ve ardından ham status_log byte'ları
+#
+# Okuyucu, compat_version kendi sürümünden büyük olmadıkça dosyayı açar ve
+# meta içinde tanımadığı kolonları yok sayar. Yeni alanlar kolon olarak
+# eklenip compat_version artırılmadan eski okuyucularla uyumlu kalınabilir.
+SNAPSHOT_MAGIC = b"PSNP"
+SNAPSHOT_VERSION = 1
+
+_header = struct.Struct("<4sHHQQ")
+
+# kolon adı -> array tip kodu
+_columns = {
+    "patient_id": "q",
+    "type": "B",
+    "status": "B",
+    "priority": "i",
+    "offset": "q",
+    "json_length": "I",
+    "log_length": "I",
+    "sorted_ids": "q",
+    "sorted_index": "q",
+}
+
+
+def write_snapshot(path: str, patients: Iterable[PatientBase], next_id: int = 0):
+    """ Hastaları eklenme sırasıyla ikili snapshot dosyasına yazar.
+    Yazma geçici dosyaya yapılır ve tamamlanınca yerine taşınır. """
+    types: Dict[str, int] = {}
+    columns = {name: array(code) for name, code in _columns.items()}
+    payloads = []
+    inpatients = []
+    offset = 0
+
+    for index, patient in enumerate(patients):
+        data = patient.to_dict()
+        log = patient._status_log.tobytes()
+        data.pop("status_log", None)
+        encoded = json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+        type_key = data["type"]
+        columns["patient_id"].append(patient.patient_id)
+        columns["type"].append(types.setdefault(type_key, len(types)))
+        columns["status"].append(PatientBase._status_codes[patient.status])
+        columns["priority"].append(patient.get_priority())
+        columns["offset"].append(offset)
+        columns["json_length"].append(len(encoded))
+        columns["log_length"].append(len(log))
+
+        # taburcu edilmemiş yatan hastalar açılışta yüklenir (oda ve kapasite)
+        if "is_discharged" in data and not data["is_discharged"]:
+            inpatients.append(index)
+
+        payloads.append(encoded)
+        payloads.append(log)
+        offset += len(encoded) + len(log)
+        next_id = max(next_id, patient.patient_id + 1)
+
+    count = len(columns["patient_id"])
+    order = sorted(range(count), key=columns["patient_id"].__getitem__)
+    columns["sorted_ids"].extend(columns["patient_id"][i] for i in order)
+    columns["sorted_index"].extend(order)
+
+    # kolon konumları meta uzunluğuna bağlı; önce göreli konumlar hesaplanır
+    layout = {}
+    position = 0
+    for name, column in columns.items():
+        layout[name] = [position, column.typecode]
+        position += _aligned(len(column) * column.itemsize)
+
+    meta = {
+        "types": sorted(types, key=types.get),
+        "statuses": list(PatientBase._valid_statuses),
+        "columns": layout,
+        "payload": position,
+        "inpatients": inpatients,
+        "next_id": next_id,
+    }
+    meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    base = _aligned(_header.size + len(meta_bytes))
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_header.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, SNAPSHOT_VERSION, count, len(meta_bytes)
+        ))
+        f.write(meta_bytes)
+        f.write(b"\0" * (base - _header.size - len(meta_bytes)))
+        for column in columns.values():
+            raw = column.tobytes()
+            f.write(raw)
+            f.write(b"\0" * (_aligned(len(raw)) - len(raw)))
+        for payload in payloads:
+            f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class PatientSnapshot:
+    """
+    write_snapshot ile yazılmış dosyayı mmap ile açan okuyucu.
+
+    Açılışta yalnızca başlık ve meta okunur; kolonlar mmap üzerinde
+    kopyalanmadan memoryview olarak kullanılır. Hasta nesneleri
+    materialize() çağrıldığında PatientBase.restore ile (setter
+    doğrulamaları çalışmadan) oluşturulur.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"Snapshot dosyası boş: {path}")
+
+        magic, version, compat, count, meta_length = _header.unpack_from(self._map)
+        if magic != SNAPSHOT_MAGIC:
+            self.close()
+            raise ValueError(f"Geçersiz snapshot dosyası: {path}")
+        if compat > SNAPSHOT_VERSION:
+            self.close()
+            raise ValueError(
+                f"Desteklenmeyen snapshot sürümü: {version} "
+                f"(okuyucu sürümü {SNAPSHOT_VERSION})"
+            )
+
+        self.version = version
+        self._count = count
+        meta = json.loads(self._map[_header.size:_header.size + meta_length])
+        self._types = meta["types"]
+        self._statuses = meta["statuses"]
+        self.inpatient_indexes = meta.get("inpatients", [])
+        self.next_id = meta.get("next_id", 0)
+
+        base = _aligned(_header.size + meta_length)
+        view = memoryview(self._map)
+        self._views = [view]
+        for name, (position, typecode) in meta["columns"].items():
+            if name in _columns:
+                size = count * array(typecode).itemsize
+                column = view[base + position:base + position + size].cast(typecode)
+                self._views.append(column)
+                setattr(self, "_" + name, column)
+        self._payload = base + meta["payload"]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self):
+        for column in reversed(getattr(self, "_views", ())):
+            column.release()
+        self._views = []
+        self._map.close()
+        self._file.close()
+
+    # kayıt sorguları (materialize etmeden)
+    def patient_id(self, index: int) -> int:
+        return self._patient_id[index]
+
+    def index_of(self, patient_id: int) -> Optional[int]:
+        """ ID'nin kayıt sırasını ikili arama ile bulur """
+        position = bisect_left(self._sorted_ids, patient_id)
+        if position < self._count and self._sorted_ids[position] == patient_id:
+            return self._sorted_index[position]
+        return None
+
+    def type_key(self, index: int) -> str:
+        return self._types[self._type[index]]
+
+    def status(self, index: int) -> str:
+        return self._statuses[self._status[index]]
+
+    def priority(self, index: int) -> int:
+        return self._priority[index]
+
+    def type_codes(self, patient_types: Optional[Iterable[str]]):
+        """ Tip adlarını dosyadaki kodlara çevirir (None: filtre yok) """
+        if patient_types is None:
+            return None
+        wanted = {t.lower() for t in patient_types}
+        return {code for code, key in enumerate(self._types) if key in wanted}
+
+    def status_codes(self, statuses: Optional[Iterable[str]]):
+        """ Durum adlarını dosyadaki kodlara çevirir (None: filtre yok) """
+        if statuses is None:
+            return None
+        wanted = set(statuses)
+        return {code for code, name in enumerate(self._statuses) if name in wanted}
+
+    def matches(self, index: int, type_codes, status_codes) -> bool:
+        return (
+            (type_codes is None or self._type[index] in type_codes)
+            and (status_codes is None or self._status[index] in status_codes)
+        )
+
+    # hasta nesnesi oluşturma
+    def materialize(self, index: int) -> PatientBase:
+        start = self._payload + self._offset[index]
+        middle = start + self._json_length[index]
+        data = json.loads(self._map[start:middle])
+        data["status_log"] = self._map[middle:middle + self._log_length[index]]
+        return PatientBase.restore(data)
+
+
+def _aligned(size: int) -> int:
+    return (size + 7) & ~7
@@ -0,0 +1,399 @@
+# app/modules/patient/sqlite_repository.py
+
+import json
+import sqlite3
+import weakref
+from datetime import date
+from typing import Iterable, List, Optional, Union
+
+from .base import PatientBase
+from .outpatient import parse_appointment_date
+from .storage import PatientStorage, synchronized
+
+
+class SQLitePatientRepository(PatientStorage):
+    """
+    Hastaları SQLite veritabanında saklayan depolama katmanı.
+
+    - Dosya veritabanlarında WAL modu ve synchronous=NORMAL kullanılır.
+    - SQL metinleri sabittir; sqlite3 modülü bunları hazır (prepared) ifade
+      olarak önbellekte tutar.
+    - Yazmalar açık bir transaction içinde biriktirilir ve commit_every
+      yazmada bir (ya da flush/close çağrısında) commit edilir.
+    - id, durum, tip ve oda kolonları üzerinde indeks bulunur.
+    - Satırlar yalnızca erişildiğinde hasta nesnesine dönüştürülür
+      (lazy hydration). Oluşturulan nesneler kimlik haritasında tutulur ve
+      üzerlerindeki değişiklikler (durum, oda, seviye...) satıra yazılır.
+      Harita zayıf referanslıdır; kullanılmayan nesneler bellekten atılır,
+      tekrar erişildiğinde satırdan yeniden oluşturulur.
+    """
+
+    _columns = (
+        "patient_id", "seq", "type", "name", "age", "gender", "status",
+        "priority", "room_number", "is_discharged", "appointment_date",
+        "appointment_history", "emergency_level", "arrival_time", "symptoms",
+        "triage_area", "status_log",
+    )
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS patients (
+            patient_id          INTEGER PRIMARY KEY,
+            seq                 INTEGER NOT NULL,
+            type                TEXT NOT NULL,
+            name                TEXT NOT NULL,
+            age                 INTEGER NOT NULL,
+            gender              TEXT NOT NULL,
+            status              TEXT NOT NULL,
+            priority            INTEGER NOT NULL,
+            room_number         INTEGER,
+            is_discharged       INTEGER,
+            appointment_date    TEXT,
+            appointment_history TEXT,
+            emergency_level     INTEGER,
+            arrival_time        TEXT,
+            symptoms            TEXT,
+            triage_area         TEXT,
+            status_log          BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_patients_seq ON patients(seq);
+        CREATE INDEX IF NOT EXISTS idx_patients_status ON patients(status, seq);
+        CREATE INDEX IF NOT EXISTS idx_patients_type ON patients(type, status, seq);
+        CREATE INDEX IF NOT EXISTS idx_patients_priority ON patients(priority, seq);
+        CREATE INDEX IF NOT EXISTS idx_patients_room ON patients(room_number)
+            WHERE room_number IS NOT NULL;
+        CREATE INDEX IF NOT EXISTS idx_patients_appointment
+            ON patients(appointment_date, seq) WHERE appointment_date IS NOT NULL;
+    """
+
+    _insert_sql = (
+        f"INSERT INTO patients ({', '.join(_columns)}) "
+        f"VALUES ({', '.join('?' for _ in _columns)})"
+    )
+    _update_sql = (
+        "UPDATE patients SET "
+        + ", ".join(f"{c} = ?" for c in _columns[2:])
+        + " WHERE patient_id = ?"
+    )
+    _select_sql = f"SELECT {', '.join(_columns)} FROM patients"
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        wards: Optional[List[dict]] = None,
+        commit_every: int = 1000,
+        max_inpatients: Optional[int] = None
+    ):
+        super().__init__(wards, max_inpatients)
+        self._conn = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._schema)
+
+        self._commit_every = commit_every
+        self._pending = 0
+        self._cache: "weakref.WeakValueDictionary[int, PatientBase]" = (
+            weakref.WeakValueDictionary()
+        )
+
+        max_id, max_seq = self._conn.execute(
+            "SELECT MAX(patient_id), MAX(seq) FROM patients"
+        ).fetchone()
+        self._next_id = max(2501, (max_id or 0) + 1)
+        self._next_seq = (max_seq or 0) + 1
+
+        # oda doluluğu ve kapasite veritabanından yüklenir
+        # (yalnızca taburcu edilmemiş yatan hastalar)
+        for patient in self._query(" WHERE type = 'inpatient' AND NOT is_discharged"):
+            self._reserve(patient, check_capacity=False)
+
+    # bağlantı yönetimi
+    @synchronized
+    def flush(self):
+        """ Bekleyen yazmaları commit eder """
+        if self._conn.in_transaction:
+            self._conn.execute("COMMIT")
+        self._pending = 0
+
+    @synchronized
+    def close(self):
+        self.flush()
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # hasta id oluşturma
+    @synchronized
+    def generate_id(self) -> int:
+        pid = self._next_id
+        self._next_id += 1
+        return pid
+
+    # temel işlemler
+    def add(self, patient: PatientBase):
+        """ Yeni hasta ekler. ID yoksa otomatik ID atar. """
+        self.add_many([patient])
+
+    @synchronized
+    def add_many(self, patients: Iterable[PatientBase]):
+        """ Hastaları tek bir savepoint içinde executemany ile ekler.
+        Herhangi biri eklenemezse hiçbiri eklenmez. """
+        patients = list(patients)
+        seen = set()
+        for patient in patients:
+            if patient.patient_id is None:
+                patient._assign_id(self.generate_id())
+            if patient.patient_id in seen or self._exists(patient.patient_id):
+                raise ValueError(
+                    f"Aynı ID'ye sahip hasta zaten mevcut: {patient.patient_id}"
+                )
+            seen.add(patient.patient_id)
+
+        occupied = []
+        try:
+            for patient in patients:
+                self._reserve(patient)
+                occupied.append(patient)
+
+            rows = []
+            for patient in patients:
+                rows.append(self._row_values(patient, self._next_seq))
+                self._next_seq += 1
+
+            self._begin()
+            self._conn.execute("SAVEPOINT add_many")
+            try:
+                self._conn.executemany(self._insert_sql, rows)
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK TO add_many")
+                raise
+            finally:
+                self._conn.execute("RELEASE add_many")
+        except Exception:
+            for patient in occupied:
+                self._unreserve(patient)
+            raise
+
+        for patient in patients:
+            self._track(patient)
+            for observer in self._observers:
+                observer.on_patient_added(patient)
+
+        self._written(len(patients))
+        return patients
+
+    @synchronized
+    def remove(self, patient_id: int):
+        """ ID'ye göre hasta siler. """
+        patient = self.get_by_id(patient_id)
+        if patient is None:
+            raise ValueError(f"Silinecek hasta bulunamadı: {patient_id}")
+
+        self._begin()
+        self._conn.execute("DELETE FROM patients WHERE patient_id = ?", (patient_id,))
+        self._untrack(patient)
+        self._unreserve(patient)
+
+        for observer in self._observers:
+            observer.on_patient_removed(patient)
+        self._written()
+
+    @synchronized
+    def get_by_id(self, patient_id: int) -> Optional[PatientBase]:
+        """ ID'ye göre hasta döndürür (gerekirse satırdan oluşturur) """
+        patient = self._cache.get(patient_id)
+        if patient is not None:
+            return patient
+
+        row = self._conn.execute(
+            self._select_sql + " WHERE patient_id = ?", (patient_id,)
+        ).fetchone()
+        return None if row is None else self._hydrate(row)
+
+    @synchronized
+    def replace_patient(self, old_patient, new_patient):
+        """ Bir hasta kaydını başka bir hasta nesnesiyle değiştirir.
+        ID aynıysa satır yerinde güncellenir, list_all sırası korunur. """
+        if self.get_by_id(old_patient.patient_id) is not old_patient:
+            raise ValueError("Değiştirilecek hasta bulunamadı")
+
+        if (
+            new_patient.patient_id != old_patient.patient_id
+            and self._exists(new_patient.patient_id)
+        ):
+            raise ValueError(
+                f"Aynı ID'ye sahip hasta zaten mevcut: {new_patient.patient_id}"
+            )
+
+        self._unreserve(old_patient)
+        try:
+            self._reserve(new_patient)
+        except ValueError:
+            self._reserve(old_patient, check_capacity=False)
+            raise
+
+        self._begin()
+        if new_patient.patient_id == old_patient.patient_id:
+            # aynı ID: satır yerinde güncellenir, kayıt sırası (seq) korunur
+            values = self._row_values(new_patient, 0)
+            self._conn.execute(self._update_sql, values[2:] + (new_patient.patient_id,))
+        else:
+            self._conn.execute(
+                "DELETE FROM patients WHERE patient_id = ?", (old_patient.patient_id,)
+            )
+            self._conn.execute(
+                self._insert_sql, self._row_values(new_patient, self._next_seq)
+            )
+            self._next_seq += 1
+        self._untrack(old_patient)
+        self._track(new_patient)
+
+        self._notify_replaced(old_patient, new_patient)
+        self._written(2)
+
+    @synchronized
+    def list_all(self) -> List[PatientBase]:
+        """ Tüm hastaları eklenme sırasıyla listeler """
+        return self._query(" ORDER BY seq")
+
+    @synchronized
+    def count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM patients").fetchone()[0]
+
+    # filtreler
+    @synchronized
+    def filter_by(
+        self,
+        patient_types: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None
+    ) -> List[PatientBase]:
+        where, params = self._where(patient_types, statuses)
+        return self._query(where + " ORDER BY seq", params)
+
+    @synchronized
+    def count_by(
+        self,
+        patient_types: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None
+    ) -> int:
+        where, params = self._where(patient_types, statuses)
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM patients" + where, params
+        ).fetchone()[0]
+
+    @synchronized
+    def filter_by_appointment_date(self, day: Union[str, date]) -> List[PatientBase]:
+        """ Randevu tarihi day olan ayaktan hastalar (randevu indeksinden) """
+        return self._query(
+            " WHERE appointment_date = ? ORDER BY seq",
+            (parse_appointment_date(day).isoformat(),)
+        )
+
+    @synchronized
+    def list_patients_by_priority(self, only_active: bool = False) -> List[PatientBase]:
+        """ Hastaları öncelik değerine göre (büyükten küçüğe) sıralar """
+        if only_active:
+            where, params = self._where(None, PatientBase._active_statuses)
+        else:
+            where, params = "", []
+        return self._query(where + " ORDER BY priority DESC, seq", params)
+
+    # yardımcı metotlar
+    @staticmethod
+    def _type_key(patient: PatientBase) -> str:
+        return patient.__class__.__name__.lower()
+
+    @staticmethod
+    def _where(patient_types, statuses):
+        clauses, params = [], []
+        if patient_types is not None:
+            types = [t.lower() for t in patient_types]
+            clauses.append(f"type IN ({', '.join('?' for _ in types)})")
+            params.extend(types)
+        if statuses is not None:
+            statuses = list(statuses)
+            clauses.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def _query(self, suffix: str, params=()) -> List[PatientBase]:
+        cursor = self._conn.execute(self._select_sql + suffix, params)
+        return [
+            self._cache.get(row[0]) or self._hydrate(row)
+            for row in cursor
+        ]
+
+    def _exists(self, patient_id: int) -> bool:
+        return self._conn.execute(
+            "SELECT 1 FROM patients WHERE patient_id = ?", (patient_id,)
+        ).fetchone() is not None
+
+    def _row_values(self, patient: PatientBase, seq: int) -> tuple:
+        data = patient.to_dict()
+        history = data.get("appointment_history")
+        symptoms = data.get("symptoms")
+        return (
+            patient.patient_id,
+            seq,
+            self._type_key(patient),
+            data["name"],
+            data["age"],
+            data["gender"],
+            data["status"],
+            patient.get_priority(),
+            data.get("room_number"),
+            data.get("is_discharged"),
+            data.get("appointment_date"),
+            json.dumps(history, ensure_ascii=False) if history else None,
+            data.get("emergency_level"),
+            data.get("arrival_time"),
+            json.dumps(symptoms, ensure_ascii=False) if symptoms else None,
+            data.get("triage_area"),
+            patient._status_log.tobytes(),
+        )
+
+    def _hydrate(self, row) -> PatientBase:
+        """ Veritabanı satırından hasta nesnesi oluşturur """
+        data = dict(zip(self._columns, row))
+        for key in ("appointment_history", "symptoms"):
+            if data[key]:
+                data[key] = json.loads(data[key])
+        patient = PatientBase.restore(data)
+        self._track(patient)
+        return patient
+
+    def _track(self, patient: PatientBase):
+        self._cache[patient.patient_id] = patient
+        patient.add_watcher(self._on_patient_changed)
+
+    def _untrack(self, patient: PatientBase):
+        patient.remove_watcher(self._on_patient_changed)
+        self._cache.pop(patient.patient_id, None)
+
+    def _begin(self):
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+
+    def _written(self, count: int = 1):
+        self._pending += count
+        if self._pending >= self._commit_every:
+            self.flush()
+
+    @synchronized
+    def _on_patient_changed(self, patient: PatientBase, field: str, old, new):
+        """ Oluşturulmuş nesnedeki değişikliği satıra yazar """
+        self._apply_change(patient, field, old, new)
+
+        values = self._row_values(patient, 0)
+        self._begin()
+        self._conn.execute(self._update_sql, values[2:] + (patient.patient_id,))
+
+        for observer in self._observers:
+            observer.on_patient_changed(patient, field, old, new)
+        self._written()
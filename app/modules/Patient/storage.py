@@ -0,0 +1,271 @@
+# app/modules/patient/storage.py
+
+import functools
+import threading
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Union
+from .base import PatientBase
+from .inpatient import Inpatient
+from .rooms import DEFAULT_WARDS, RoomAllocator
+
+
+def synchronized(method):
+    """ Metodu depolamanın kilidi (self._lock) altında çalıştırır """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class PatientStorage(ABC):
+    """
+    PatientService'in bağımlı olduğu depolama arayüzü.
+    In-memory PatientRepository ve SQLitePatientRepository bu arayüzü uygular.
+
+    Oda/yatak yönetimi (RoomAllocator), yatan hasta kapasitesi ve gözlemci
+    (observer) listesi tüm depolama türlerinde ortaktır ve burada tutulur.
+    Kapasite depolamaya özeldir; varsayılan değer toplam yatak sayısıdır.
+
+    Tüm okuma/yazma metotları depolamanın yeniden girilebilir kilidi
+    (lock) altında çalışır. Birden fazla çağrının tek bir işlem gibi
+    çalışması gerektiğinde (ör. boş oda bulup hasta eklemek) çağıran
+    taraf "with storage.lock:" kullanır.
+    """
+
+    def __init__(
+        self,
+        wards: Optional[List[dict]] = None,
+        max_inpatients: Optional[int] = None
+    ):
+        self._rooms = RoomAllocator.from_description(wards or DEFAULT_WARDS)
+        self._observers: list = []
+        self._lock = threading.RLock()
+        self._max_inpatients = (
+            self._rooms.bed_count() if max_inpatients is None else max_inpatients
+        )
+        self._admitted: Set[int] = set()
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
+
+    # temel işlemler
+    @abstractmethod
+    def add(self, patient: PatientBase):
+        """ Yeni hasta ekler, ID yoksa otomatik atar """
+        pass
+
+    @abstractmethod
+    def remove(self, patient_id: int):
+        """ ID'ye göre hasta siler """
+        pass
+
+    @abstractmethod
+    def get_by_id(self, patient_id: int) -> Optional[PatientBase]:
+        """ ID'ye göre hasta döndürür """
+        pass
+
+    @abstractmethod
+    def replace_patient(self, old_patient, new_patient):
+        """ Bir hasta kaydını başka bir hasta nesnesiyle değiştirir """
+        pass
+
+    @abstractmethod
+    def list_all(self) -> List[PatientBase]:
+        """ Tüm hastaları eklenme sırasıyla listeler """
+        pass
+
+    @abstractmethod
+    def count(self) -> int:
+        """ Toplam hasta sayısını döndürür """
+        pass
+
+    # filtreler
+    @abstractmethod
+    def filter_by(
+        self,
+        patient_types: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None
+    ) -> List[PatientBase]:
+        """ Tip ve/veya durum kümesine göre hasta filtreler """
+        pass
+
+    @abstractmethod
+    def count_by(
+        self,
+        patient_types: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None
+    ) -> int:
+        """ filter_by ile aynı seçimin sayısını döndürür """
+        pass
+
+    @abstractmethod
+    def filter_by_appointment_date(self, day: Union[str, date]) -> List[PatientBase]:
+        """ Randevu tarihi day olan ayaktan hastaları eklenme sırasıyla döndürür """
+        pass
+
+    @abstractmethod
+    def list_patients_by_priority(self, only_active: bool = False) -> List[PatientBase]:
+        """ Hastaları öncelik değerine göre sıralar """
+        pass
+
+    # gözlemciler
+    @synchronized
+    def attach_observer(self, observer):
+        """ Değişiklikleri dinleyecek nesne ekler. Nesne on_patient_added,
+        on_patient_removed ve on_patient_changed metotlarına sahip olmalıdır.
+        İsteğe bağlı on_patient_replaced(eski, yeni) metodu varsa
+        replace_patient silme + ekleme yerine bununla bildirilir. """
+        self._observers.append(observer)
+
+    @synchronized
+    def detach_observer(self, observer):
+        """ Dinleyici nesneyi kaldırır """
+        self._observers.remove(observer)
+
+    def _notify_replaced(self, old_patient: PatientBase, new_patient: PatientBase):
+        """ replace_patient bildirimi. on_patient_replaced metodu olan
+        gözlemciye tek çağrı, diğerlerine silme + ekleme olarak iletilir. """
+        for observer in self._observers:
+            replaced = getattr(observer, "on_patient_replaced", None)
+            if replaced is not None:
+                replaced(old_patient, new_patient)
+            else:
+                observer.on_patient_removed(old_patient)
+                observer.on_patient_added(new_patient)
+
+    # oda yönetimi
+    @synchronized
+    def get_available_room(
+        self, floor: Optional[int] = None, ward: Optional[str] = None
+    ) -> int:
+        """ Boş yatağı olan bir oda döndürür (kat/servis tercihi opsiyonel) """
+        return self._rooms.find_free(floor=floor, ward=ward)
+
+    @synchronized
+    def snapshot_free_beds(
+        self, limit: int, floor: Optional[int] = None, ward: Optional[str] = None
+    ) -> List[int]:
+        """ Toplu atama için boş yatakların anlık listesini döndürür """
+        return self._rooms.snapshot_free_beds(limit, floor=floor, ward=ward)
+
+    @synchronized
+    def room_free_beds(self, room_number: int) -> Optional[int]:
+        """ Odadaki boş yatak sayısı; oda tanımlı değilse None """
+        room = self._rooms.get_room(room_number)
+        return None if room is None else room.free_beds()
+
+    @synchronized
+    def list_room_occupants(self) -> Dict[int, List[PatientBase]]:
+        """ Oda numarasına göre odadaki tüm hastaları döndürür """
+        return self._rooms.occupancy()
+
+    @synchronized
+    def free_bed_count(self) -> int:
+        """ Boş yatak sayısını döndürür """
+        return self._rooms.free_bed_count()
+
+    # yatan hasta kapasitesi
+    @synchronized
+    def inpatient_count(self) -> int:
+        """ Taburcu edilmemiş yatan hasta sayısı """
+        return len(self._admitted)
+
+    @synchronized
+    def free_inpatient_slots(self) -> int:
+        """ Kapasite dolmadan kabul edilebilecek yatan hasta sayısı """
+        return max(self._max_inpatients - len(self._admitted), 0)
+
+    def capacity_info(self) -> str:
+        return f"Aktif yatan hasta sayısı: {self.inpatient_count()}/{self._max_inpatients}"
+
+    def _reserve(self, patient: PatientBase, check_capacity: bool = True):
+        """ Taburcu edilmemiş yatan hasta için kapasite ve yatak ayırır """
+        if not isinstance(patient, Inpatient) or patient.is_discharged:
+            return
+        if (
+            check_capacity
+            and patient.patient_id not in self._admitted
+            and len(self._admitted) >= self._max_inpatients
+        ):
+            raise ValueError("Yatan hasta kapasitesi dolu! Yeni hasta kabul edilemiyor.")
+
+        self._occupy_room(patient)
+        self._admitted.add(patient.patient_id)
+
+    def _unreserve(self, patient: PatientBase):
+        """ Hastanın yatağını ve kapasitedeki yerini boşaltır """
+        self._release_room(patient)
+        self._admitted.discard(patient.patient_id)
+
+    def _apply_change(self, patient: PatientBase, field: str, old, new):
+        """ Hasta değişikliğini oda doluluğuna ve kapasiteye yansıtır """
+        if field == "room_number":
+            self._move_room(patient, old, new)
+        elif field == "status" and new == "taburcu":
+            self._admitted.discard(patient.patient_id)
+
+    def _occupy_room(self, patient: PatientBase):
+        if isinstance(patient, Inpatient) and patient.room_number is not None:
+            self._rooms.occupy(patient.room_number, patient)
+
+    def _release_room(self, patient: PatientBase):
+        if isinstance(patient, Inpatient) and patient.room_number is not None:
+            self._rooms.release(patient.room_number, patient.patient_id)
+
+    def _move_room(self, patient: PatientBase, old: Optional[int], new: Optional[int]):
+        """ Hastanın oda değişikliğini yatak doluluğuna yansıtır.
+        Yeni oda reddedilirse eski yatak geri alınır. """
+        if old is not None:
+            self._rooms.release(old, patient.patient_id)
+        if new is not None:
+            try:
+                self._rooms.occupy(new, patient)
+            except ValueError:
+                if old is not None:
+                    self._rooms.occupy(old, patient)
+                raise
+
+    # ortak davranışlar
+    @synchronized
+    def add_many(self, patients: Iterable[PatientBase]):
+        """ Hastaları toplu ekler. Herhangi biri eklenemezse o ana kadar
+        eklenenler geri alınır ve hata yükseltilir (ya hep ya hiç). """
+        added = []
+        try:
+            for patient in patients:
+                self.add(patient)
+                added.append(patient)
+        except Exception:
+            for patient in reversed(added):
+                self.remove(patient.patient_id)
+            raise
+        return added
+
+    def filter_by_status(self, status: str) -> List[PatientBase]:
+        """ Duruma göre hasta filtreler. """
+        return self.filter_by(statuses=(status,))
+
+    def filter_by_type(self, patient_type: str) -> List[PatientBase]:
+        """ Hasta tipine göre filtreleme
+        (Inpatient, Outpatient, EmergencyPatient) """
+        return self.filter_by(patient_types=(patient_type,))
+
+    def list_active_patients(self) -> List[PatientBase]:
+        """ Taburcu edilmemiş (aktif) hastaları döndürür """
+        return self.filter_by(statuses=PatientBase._active_statuses)
+
+    def list_rooms(self) -> Dict[int, PatientBase]:
+        """ Oda numaralarına göre yatan hastaları döndürür
+        (çok yataklı odalarda son yerleşen hasta) """
+        return {
+            room: occupants[-1]
+            for room, occupants in self.list_room_occupants().items()
+        }
+
+    def release_room_if_inpatient(self, patient: PatientBase):
+        """ Taburcu olan hasta Inpatient ise odasını boşaltır """
+        if isinstance(patient, Inpatient):
+            patient.clear_room()
@@ -0,0 +1,51 @@
+# app/modules/patient/text.py
+
+from typing import List
+
+
+# str.lower()/upper() Türkçe noktalı/noktasız I harflerini yanlış çevirir:
+# "I".lower() -> "i" (doğrusu "ı"), "i".upper() -> "I" (doğrusu "İ"),
+# "İ".lower() -> "i̇" (birleşik nokta ile iki karakter)
+_lower_map = str.maketrans({"I": "ı", "İ": "i"})
+_upper_map = str.maketrans({"i": "İ", "ı": "I"})
+
+# Türkçe harflerin ASCII karşılıkları (klavyesinde Türkçe harf olmayan girişler)
+ASCII_FOLD = {"ç": "c", "ğ": "g", "ı": "i", "ö": "o", "ş": "s", "ü": "u"}
+_ascii_map = str.maketrans(ASCII_FOLD)
+
+
+def turkish_lower(text: str) -> str:
+    return text.translate(_lower_map).lower()
+
+
+def turkish_upper(text: str) -> str:
+    return text.translate(_upper_map).upper()
+
+
+def turkish_capitalize(word: str) -> str:
+    """ İlk harfi büyük, diğerlerini küçük yapar (Türkçe kurallarıyla) """
+    return turkish_upper(word[:1]) + turkish_lower(word[1:])
+
+
+def turkish_title(text: str) -> str:
+    """ Her kelimenin ilk harfini büyütür, fazla boşlukları tekilleştirir.
+    Tire ile ayrılan isimlerin her parçası ayrıca büyütülür. """
+    return " ".join(
+        "-".join(turkish_capitalize(part) for part in word.split("-"))
+        for word in text.split()
+    )
+
+
+def fold(text: str) -> str:
+    """ Arama için karşılaştırma anahtarı: Türkçe küçük harf, tek boşluk """
+    return " ".join(turkish_lower(text).split())
+
+
+def ascii_fold(text: str) -> str:
+    """ fold() gibi çalışır, ayrıca Türkçe harfleri ASCII karşılıklarına çevirir """
+    return fold(text).translate(_ascii_map)
+
+
+def tokenize(text: str) -> List[str]:
+    """ İsmi aranabilir parçalara (kelimelere) ayırır """
+    return fold(text).replace("-", " ").split()
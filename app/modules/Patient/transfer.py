@@ -0,0 +1,229 @@
+# app/modules/patient/transfer.py
+
+import csv
+import json
+import time
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .base import PatientBase
+from .service import PatientService
+
+
+# CSV kolonları; liste alanları tek hücrede ayraçla tutulur
+CSV_FIELDS = (
+    "type", "patient_id", "name", "age", "gender", "status", "room_number",
+    "is_discharged", "appointment_date", "appointment_history",
+    "emergency_level", "arrival_time", "symptoms", "triage_area", "status_log",
+)
+_int_fields = ("patient_id", "age", "room_number", "emergency_level")
+_list_separator = "|"
+
+# dışa aktarılan ve içe aktarmada korunan (from_dict'in kurmadığı) alanlar
+_preserved_fields = ("status_log", "appointment_history", "is_discharged", "triage_area")
+
+
+class TransferStats:
+    """
+    İçe/dışa aktarma ilerlemesi: işlenen satır, başarılı kayıt ve hata
+    sayıları, geçen süre ve saniyedeki satır sayısı.
+    Hatalar (satır no, mesaj) olarak en fazla max_errors adet saklanır.
+    """
+
+    def __init__(self, max_errors: int = 1000):
+        self.rows = 0
+        self.written = 0
+        self.error_count = 0
+        self.errors: List[Tuple[int, str]] = []
+        self.max_errors = max_errors
+        self._start = time.perf_counter()
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def add_error(self, row: int, message: str):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((row, message))
+
+    def _tick(self):
+        self.seconds = time.perf_counter() - self._start
+
+    def __repr__(self):
+        return (
+            f"TransferStats(rows={self.rows}, written={self.written}, "
+            f"errors={self.error_count}, rows_per_second={self.rows_per_second:.0f})"
+        )
+
+
+# okuma
+def read_records(path: str) -> Iterator[dict]:
+    """ Dosya uzantısına göre (.csv / .jsonl) kayıtları satır satır okur """
+    if path.endswith(".csv"):
+        return read_csv(path)
+    if path.endswith(".jsonl"):
+        return read_jsonl(path)
+    raise ValueError(f"Desteklenmeyen dosya biçimi: {path}")
+
+
+def read_jsonl(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_csv(path: str) -> Iterator[dict]:
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            yield _from_csv_row(row)
+
+
+def _from_csv_row(row: dict) -> dict:
+    """ CSV hücrelerini from_dict'in beklediği tiplere çevirir.
+    Boş hücreler alanın verilmediği anlamına gelir. """
+    record = {key: value for key, value in row.items() if value not in ("", None)}
+    for key in _int_fields:
+        if key in record:
+            try:
+                record[key] = int(record[key])
+            except ValueError:
+                # geçersiz değer doğrulamada satır hatası olarak raporlanır
+                pass
+    if "is_discharged" in record:
+        record["is_discharged"] = record["is_discharged"] == "1"
+    for key in ("symptoms", "appointment_history"):
+        if key in record:
+            record[key] = record[key].split(_list_separator)
+    if "status_log" in record:
+        try:
+            record["status_log"] = [int(v) for v in record["status_log"].split()]
+        except ValueError:
+            pass
+    return record
+
+
+# yazma
+def write_records(path: str, records: Iterable[dict]) -> Iterator[dict]:
+    """ Kayıtları dosya uzantısına göre (.csv / .jsonl) yazar.
+    Yazılan her kaydı geri verir, böylece çağıran ilerlemeyi izleyebilir. """
+    if path.endswith(".csv"):
+        return _write_csv(path, records)
+    if path.endswith(".jsonl"):
+        return _write_jsonl(path, records)
+    raise ValueError(f"Desteklenmeyen dosya biçimi: {path}")
+
+
+def _write_jsonl(path: str, records: Iterable[dict]) -> Iterator[dict]:
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            yield record
+
+
+def _write_csv(path: str, records: Iterable[dict]) -> Iterator[dict]:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        for record in records:
+            writer.writerow(_to_csv_row(record))
+            yield record
+
+
+def _to_csv_row(record: dict) -> dict:
+    row = dict(record)
+    for key in ("symptoms", "appointment_history"):
+        if key in row:
+            row[key] = _list_separator.join(row[key] or ())
+    if "is_discharged" in row:
+        row["is_discharged"] = "1" if row["is_discharged"] else "0"
+    if "status_log" in row:
+        row["status_log"] = " ".join(str(v) for v in row["status_log"])
+    return row
+
+
+# içe / dışa aktarma
+def build_patient(record: dict) -> PatientBase:
+    """ Kayıttan doğrulanmış hasta oluşturur.
+    Alanlar from_dict (setter doğrulamaları) ile kontrol edilir; dışa
+    aktarımda bulunan durum/randevu geçmişi gibi alanlar korunur. """
+    patient = PatientBase.from_dict(record)
+    if not any(key in record for key in _preserved_fields):
+        return patient
+
+    data = patient.to_dict()
+    for key in _preserved_fields:
+        if key in record and key in data:
+            data[key] = record[key]
+    return PatientBase.restore(data)
+
+
+def import_patients(
+    service: PatientService,
+    records: Iterable[dict],
+    chunk_size: int = 1000,
+    atomic_chunks: bool = False,
+    progress: Optional[Callable[[TransferStats], None]] = None
+) -> TransferStats:
+    """ Kayıtları parça parça doğrulayıp register_many ile ekler.
+    Bellekte aynı anda yalnızca bir parça tutulur. Satır numaraları
+    0'dan başlar; hatalı satırlar işlemi durdurmaz. progress her parçadan
+    sonra güncel istatistikle çağrılır. """
+    stats = TransferStats()
+    records = iter(records)
+
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+
+        first_row = stats.rows
+        patients, rows = [], []
+        for offset, record in enumerate(chunk):
+            try:
+                patients.append(build_patient(record))
+                rows.append(first_row + offset)
+            except (ValueError, KeyError, TypeError) as e:
+                stats.add_error(first_row + offset, f"Geçersiz kayıt: {e}")
+
+        result = service.register_many(patients, atomic=atomic_chunks)
+        stats.written += len(result.registered)
+        for index, message in result.errors:
+            stats.add_error(rows[index], message)
+
+        stats.rows += len(chunk)
+        stats._tick()
+        if progress is not None:
+            progress(stats)
+
+    stats._tick()
+    return stats
+
+
+def import_file(service: PatientService, path: str, **options) -> TransferStats:
+    """ CSV/JSONL dosyasını akış halinde içe aktarır """
+    return import_patients(service, read_records(path), **options)
+
+
+def export_patients(
+    patients: Iterable[PatientBase],
+    path: str,
+    progress: Optional[Callable[[TransferStats], None]] = None,
+    progress_every: int = 10000
+) -> TransferStats:
+    """ Hastaları (durum geçmişi, semptomlar ve randevu geçmişi dahil)
+    CSV/JSONL dosyasına akış halinde yazar """
+    stats = TransferStats()
+    for _ in write_records(path, (p.to_dict() for p in patients)):
+        stats.rows += 1
+        stats.written += 1
+        if progress is not None and stats.rows % progress_every == 0:
+            stats._tick()
+            progress(stats)
+
+    stats._tick()
+    if progress is not None:
+        progress(stats)
+    return stats
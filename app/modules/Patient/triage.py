@@ -0,0 +1,172 @@
+# app/modules/patient/triage.py
+
+import json
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .text import ascii_fold
+
+
+# Varsayılan kurallar: ilk eşleşen (en ağır) kural geçerlidir
+DEFAULT_TRIAGE_RULES = [
+    {
+        "area": "Kırmızı",
+        "level": 3,
+        "keywords": ["göğüs ağrısı", "nefes darlığı", "bilinç kaybı", "şiddetli kanama"],
+    },
+    {
+        "area": "Sarı",
+        "level": 2,
+        "keywords": ["yüksek ateş", "şiddetli ağrı", "kusma", "baş dönmesi"],
+    },
+]
+
+
+class TriageRule:
+    """
+    Anahtar kelimelerden biri semptomlarda geçtiğinde uygulanacak
+    triyaj alanı ve acil seviye
+    """
+
+    def __init__(self, area: str, level: int, keywords: Iterable[str]):
+        if level not in (1, 2, 3):
+            raise ValueError("Acil seviye 1, 2 veya 3 olmalıdır")
+        self.area = area
+        self.level = level
+        self.keywords = [k for k in keywords if k.strip()]
+        if not self.keywords:
+            raise ValueError(f"Triyaj kuralında anahtar kelime yok: {area}")
+
+
+class TriageRulebook:
+    """
+    Triyaj kurallarını tek bir Aho–Corasick otomatına derleyen sınıf.
+
+    Tüm kuralların anahtar kelimeleri tek otomatta birleştirilir; semptom
+    metni kelime sayısından bağımsız olarak tek geçişte taranır. Geçişler
+    derleme sırasında tamamlandığı için (DFA) her karakter tek bir sözlük
+    araması demektir. Kurallar öncelik sırasıyla verilir; birden fazla kural
+    eşleşirse listede önce gelen geçerlidir, hiçbiri eşleşmezse varsayılan
+    alan döner. Metin ve anahtar kelimeler Türkçe kurallarıyla küçük harfe
+    ve ASCII karşılıklarına indirgenir ("GÖĞÜS AĞRISI" = "gogus agrisi").
+
+    Bu yüzden varsayılan kurallar eski str.lower() ile alt metin aramasından
+    daha geniş eşleşir: büyük harfli girişler (I/İ), ı/i, ş/s, ğ/g gibi
+    ASCII yazımlar ve fazla boşluklu metinler de kurala uyar.
+    """
+
+    def __init__(
+        self,
+        rules: Sequence[TriageRule],
+        default_area: str = "Yeşil",
+        default_level: int = 1
+    ):
+        self.rules = list(rules)
+        self.default_area = default_area
+        self.default_level = default_level
+
+        # durum -> {karakter: sonraki durum}, durum -> eşleşen en öncelikli kural
+        self._delta: List[Dict[str, int]] = [{}]
+        self._match: List[Optional[int]] = [None]
+        self._compile()
+
+    @classmethod
+    def from_description(cls, rules: List[dict], **options) -> "TriageRulebook":
+        """ Kural tanımından (DEFAULT_TRIAGE_RULES biçiminde) rulebook oluşturur """
+        return cls(
+            [TriageRule(r["area"], r["level"], r["keywords"]) for r in rules],
+            **options
+        )
+
+    @classmethod
+    def from_file(cls, path: str, **options) -> "TriageRulebook":
+        """ JSON dosyasındaki kural tanımını yükler """
+        with open(path, encoding="utf-8") as f:
+            return cls.from_description(json.load(f), **options)
+
+    # derleme
+    def _compile(self):
+        delta, match = self._delta, self._match
+
+        # 1) anahtar kelime ağacı
+        for rank, rule in enumerate(self.rules):
+            for keyword in rule.keywords:
+                state = 0
+                for char in ascii_fold(keyword):
+                    nxt = delta[state].get(char)
+                    if nxt is None:
+                        nxt = len(delta)
+                        delta[state][char] = nxt
+                        delta.append({})
+                        match.append(None)
+                    state = nxt
+                match[state] = rank if match[state] is None else min(match[state], rank)
+
+        # 2) BFS ile hata bağlantıları; geçişler ve eşleşmeler tamamlanır
+        alphabet = {char for edges in delta for char in edges}
+        fail = [0] * len(delta)
+        queue = deque(delta[0].values())
+        while queue:
+            state = queue.popleft()
+            parent_fail = fail[state]
+            inherited = match[parent_fail]
+            if inherited is not None and (match[state] is None or inherited < match[state]):
+                match[state] = inherited
+
+            for char in alphabet:
+                nxt = delta[state].get(char)
+                if nxt is not None:
+                    fail[nxt] = delta[parent_fail].get(char, 0)
+                    queue.append(nxt)
+                else:
+                    target = delta[parent_fail].get(char, 0)
+                    if target:
+                        delta[state][char] = target
+
+    # sınıflandırma
+    def classify(self, symptoms: Iterable[str]) -> Tuple[str, int]:
+        """ Semptomlar için (triyaj alanı, acil seviye) döndürür """
+        rank = self._best_rank(ascii_fold(" ".join(symptoms)))
+        if rank is None:
+            return self.default_area, self.default_level
+        rule = self.rules[rank]
+        return rule.area, rule.level
+
+    def classify_many(self, symptom_lists: Iterable[Sequence[str]]) -> List[Tuple[str, int]]:
+        """ Toplu sınıflandırma. Aynı semptom listeleri yalnızca bir kez taranır. """
+        cache: Dict[tuple, Tuple[str, int]] = {}
+        result = []
+        for symptoms in symptom_lists:
+            key = tuple(symptoms)
+            value = cache.get(key)
+            if value is None:
+                value = cache[key] = self.classify(key)
+            result.append(value)
+        return result
+
+    def _best_rank(self, text: str) -> Optional[int]:
+        delta, match = self._delta, self._match
+        best = None
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            rank = match[state]
+            if rank is not None and (best is None or rank < best):
+                if rank == 0:
+                    return 0
+                best = rank
+        return best
+
+
+# eski anahtar kelime listeleri; eşleşme ASCII katlama ile daha geniştir
+DEFAULT_RULEBOOK = TriageRulebook.from_description(DEFAULT_TRIAGE_RULES)
+
+
+def triage_patients(patients: Iterable, rulebook: Optional[TriageRulebook] = None) -> List[str]:
+    """ Acil hastaların triyaj alanlarını toplu belirler ve döndürür """
+    patients = list(patients)
+    rulebook = rulebook or DEFAULT_RULEBOOK
+    results = rulebook.classify_many(p._symptoms for p in patients)
+    for patient, (area, level) in zip(patients, results):
+        patient._apply_triage(area, level)
+    return [area for area, _ in results]
@@ -0,0 +1,127 @@
+# app/modules/patient/triage_queue.py
+
+import heapq
+from typing import Dict, List, Optional, Set, Tuple
+from .base import PatientBase
+
+
+class TriageQueue:
+    """
+    Aktif hastaları öncelik sırasıyla tutan canlı kuyruk.
+    İkili yığın (heap) üzerinde tembel silme kullanılır: öncelik değiştiğinde
+    yeni kayıt eklenir, eski kayıt geçersiz sayılıp yığının tepesine
+    geldiğinde atılır. Ekleme, güncelleme ve çıkarma O(log n)'dir.
+
+    pop ile çağrılan hasta yığından çıkar ama aktif kaldığı sürece ordered()
+    listesinde yerini korur; önceliği ya da durumu değişince (push) yeniden
+    çağrılabilir hale gelir.
+
+    ordered() sonucu önbelleğe alınır. Değişiklikten sonraki ilk çağrıda
+    önceki sıralı liste geçersiz kayıtlardan süzülüp yeni kayıtların
+    sıralanmış haliyle birleştirilir: n aktif, k değişen hasta için
+    O(n + k log k); değişiklik yoksa liste kopyası döner.
+    """
+
+    def __init__(self):
+        # (-öncelik, sıra no, hasta id) kayıtları
+        self._heap: List[Tuple[int, int, int]] = []
+        self._entries: Dict[int, Tuple[int, int, int]] = {}
+        self._patients: Dict[int, PatientBase] = {}
+        self._dispatched: Set[int] = set()
+
+        # ordered() için son sıralı kayıtlar ve sonrasında eklenenler
+        self._sorted: List[Tuple[int, int, int]] = []
+        self._added: List[Tuple[int, int, int]] = []
+        self._ordered: Optional[List[PatientBase]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, patient_id: int) -> bool:
+        return patient_id in self._entries
+
+    def push(self, patient: PatientBase, seq: int):
+        """ Hastayı kuyruğa ekler ya da önceliği değiştiyse yeniden konumlar.
+        seq eşit öncelikli hastalar arasındaki sırayı belirler. Çağrılmış
+        (pop) hasta yeniden kuyruğa girer. """
+        pid = patient.patient_id
+        entry = (-patient.get_priority(), seq, pid)
+        current = self._entries.get(pid)
+        if current == entry and pid not in self._dispatched:
+            return
+
+        self._dispatched.discard(pid)
+        self._patients[pid] = patient
+        if current != entry:
+            self._entries[pid] = entry
+            self._added.append(entry)
+            self._ordered = None
+        else:
+            entry = current
+        heapq.heappush(self._heap, entry)
+        self._compact_if_needed()
+
+    def discard(self, patient_id: int):
+        """ Hastayı kuyruktan çıkarır (yoksa bir şey yapmaz) """
+        if self._entries.pop(patient_id, None) is not None:
+            del self._patients[patient_id]
+            self._dispatched.discard(patient_id)
+            self._ordered = None
+            self._compact_if_needed()
+
+    def peek(self, k: int = 1) -> List[PatientBase]:
+        """ Çağrılmamış en öncelikli k hastayı kuyruktan çıkarmadan döndürür """
+        taken = []
+        while self._heap and len(taken) < k:
+            entry = heapq.heappop(self._heap)
+            if self._is_waiting(entry):
+                taken.append(entry)
+
+        for entry in taken:
+            heapq.heappush(self._heap, entry)
+
+        return [self._patients[entry[2]] for entry in taken]
+
+    def pop(self) -> Optional[PatientBase]:
+        """ Çağrılmamış en öncelikli hastayı çağrılmış olarak işaretleyip
+        döndürür; hasta ordered() listesinde kalır """
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if self._is_waiting(entry):
+                self._dispatched.add(entry[2])
+                return self._patients[entry[2]]
+        return None
+
+    def ordered(self) -> List[PatientBase]:
+        """ Kuyruktaki tüm aktif hastaları (çağrılmış olanlar dahil) öncelik
+        sırasıyla döndürür """
+        if self._ordered is None:
+            entries = self._entries
+            self._added.sort()
+            merged = [e for e in self._sorted if entries.get(e[2]) is e]
+            merged += [e for e in self._added if entries.get(e[2]) is e]
+            # iki sıralı parça: timsort bunları doğrusal zamanda birleştirir
+            merged.sort()
+            self._sorted = merged
+            self._added = []
+            patients = self._patients
+            self._ordered = [patients[entry[2]] for entry in merged]
+        return list(self._ordered)
+
+    def _is_live(self, entry) -> bool:
+        return self._entries.get(entry[2]) is entry
+
+    def _is_waiting(self, entry) -> bool:
+        return self._is_live(entry) and entry[2] not in self._dispatched
+
+    def _compact_if_needed(self):
+        """ Geçersiz kayıtlar çoğaldığında yığını ve sıralı listeyi yeniden kurar """
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [
+                entry for pid, entry in self._entries.items()
+                if pid not in self._dispatched
+            ]
+            heapq.heapify(self._heap)
+        if len(self._added) > len(self._entries) + 64:
+            self._sorted = []
+            self._added = list(self._entries.values())
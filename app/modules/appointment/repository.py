@@ -5,6 +5,12 @@ from .base import AppointmentBase
 
 class AppointmentRepository:
 
+    # tüm randevuları tarayan metotlar (ölçümde taranan kayıt sayısı tutulur)
+    _metric_scans = (
+        "save", "find_by_id", "filter_by_date", "filter_by_doctor",
+        "has_time_conflict", "delete", "update",
+    )
+
     def __init__(self):
         self._appointments: List[AppointmentBase] = []
 
@@ -0,0 +1,76 @@
+# benchmarks/bench_admission_surge.py
+"""
+Acil yoğunluğunda toplu yatış: mevcut hasta sayısı büyürken binlerce acil
+hastanın admit_emergency_patient ile yatışa alınma süresi. Yatış kaydı
+yerinde değiştirdiği için yatış başına süre toplam hasta sayısından
+bağımsız kalmalıdır. --observers ile census, durum zaman çizelgesi ve
+olay yayını da bağlı ölçülür.
+
+Kullanım:
+    python -m benchmarks.bench_admission_surge --sizes 10000 100000 1000000 --surge 5000
+"""
+
+import argparse
+import time
+
+from app.modules.Patient.census import StatusTimeline
+from app.modules.Patient.emergency_patient import EmergencyPatient
+from app.modules.Patient.events import ChangeCapture, EventBus
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.repository import PatientRepository
+from app.modules.Patient.service import PatientService
+
+
+def build(size: int, surge: int):
+    wards = [{
+        "ward": "Dahiliye", "floor": 1,
+        "rooms": [{"number": 100 + i, "beds": 4} for i in range(surge // 4 + 1)],
+    }]
+    repo = PatientRepository(wards=wards, max_inpatients=surge)
+    service = PatientService(repo)
+    repo.add_many(
+        Outpatient(None, f"Hasta {i}", i % 100, "erkek") for i in range(size)
+    )
+
+    emergencies = []
+    for i in range(surge):
+        patient = EmergencyPatient(None, f"Acil {i}", i % 100, "kadın", 1 + i % 3)
+        patient.add_symptoms(["göğüs ağrısı"] if i % 2 else ["ateş"])
+        patient.determine_triage_area()
+        emergencies.append(patient)
+    repo.add_many(emergencies)
+    return service, [p.patient_id for p in emergencies]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--surge", type=int, default=5_000)
+    parser.add_argument("--observers", action="store_true")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        service, ids = build(size, args.surge)
+        repo = service._repository
+        if args.observers:
+            service.census()
+            StatusTimeline(repo)
+            bus = EventBus()
+            bus.subscribe(buffer_size=args.surge * 4)
+            ChangeCapture(repo, bus)
+
+        start = time.perf_counter()
+        for pid in ids:
+            service.admit_emergency_patient(pid)
+        elapsed = time.perf_counter() - start
+
+        assert repo.count_by(["inpatient"]) == len(ids)
+        assert repo.free_bed_count() == (args.surge // 4 + 1) * 4 - len(ids)
+        print(
+            f"{size:>9} hasta | {len(ids)} yatış {elapsed * 1000:>8.1f} ms | "
+            f"yatış başına {elapsed / len(ids) * 1e6:>6.1f} µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
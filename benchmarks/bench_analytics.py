@@ -0,0 +1,87 @@
+# benchmarks/bench_analytics.py
+"""
+PatientAnalytics'in büyük geçiş tablolarındaki hızı. Tablo doğrudan
+NumPy ile üretilir (on milyonlarca geçiş); ayrıca hasta nesnelerinden
+tablo oluşturma (from_patients) süresi ölçülür.
+
+Kullanım:
+    python -m benchmarks.bench_analytics --records 4000000 --objects 200000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.modules.Patient.analytics import PatientAnalytics
+from app.modules.Patient.base import PatientBase
+from app.modules.Patient.emergency_patient import EmergencyPatient
+from app.modules.Patient.repository import PatientRepository
+
+CODES = PatientBase._status_codes
+KINDS = ["Outpatient", "EmergencyPatient", "Inpatient"]
+AREAS = ["Kırmızı", "Sarı", "Yeşil"]
+
+
+def synthetic(records: int, seed: int = 1) -> PatientAnalytics:
+    """ Kayıt başına 1-6 geçiş; acil kayıtların %10'u aynı id ile yatışa alınır """
+    rng = np.random.default_rng(seed)
+    lengths = rng.integers(1, 7, records)
+    starts = np.zeros(records + 1, dtype=np.int64)
+    np.cumsum(lengths, out=starts[1:])
+    total = int(starts[-1])
+
+    kinds = rng.integers(0, 2, records).astype(np.int8)
+    ids = np.arange(records, dtype=np.int64)
+    admitted = np.flatnonzero(kinds == 1)[::10]
+    # yatışa alınan acil hastalar için aynı id'li Inpatient kaydı sona eklenir
+    ids = np.concatenate([ids, ids[admitted]])
+    kinds = np.concatenate([kinds, np.full(len(admitted), 2, dtype=np.int8)])
+    areas = np.where(kinds == 1, rng.integers(0, 3, len(kinds)), -1).astype(np.int8)
+    extra = rng.integers(1, 4, len(admitted))
+    starts = np.concatenate([starts, total + np.cumsum(extra)])
+
+    size = int(starts[-1])
+    codes = rng.choice(
+        [CODES["aktif"], CODES["acil"], CODES["stabil"], CODES["taburcu"], CODES["tamamlandı"]],
+        size
+    ).astype(np.int8)
+    # kayıt başına 30 günlük aralık; sıralama kayıt içinde zaman sırası verir
+    span = 30 * 24 * 3600 * 10**6
+    rows = np.repeat(np.arange(len(ids), dtype=np.int64), np.diff(starts))
+    times = np.sort(rows * span + rng.integers(0, span, size))
+    return PatientAnalytics(ids, kinds, areas, starts, codes, times, KINDS, AREAS)
+
+
+def timed(label: str, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:<28}: {time.perf_counter() - start:>7.2f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=4_000_000)
+    parser.add_argument("--objects", type=int, default=200_000)
+    args = parser.parse_args()
+
+    analytics = timed("tablo üretimi", lambda: synthetic(args.records))
+    print(f"geçiş sayısı                : {len(analytics)}")
+    timed("length_of_stay (tip)", lambda: analytics.length_of_stay("type"))
+    timed("time_to_stabilize (alan)", lambda: analytics.time_to_stabilize("triage_area"))
+    timed("time_to_admission", lambda: analytics.time_to_admission())
+    timed("readmission_rate (tip)", lambda: analytics.readmission_rate(30, "type"))
+
+    repo = PatientRepository()
+    repo.add_many(
+        EmergencyPatient(None, f"Hasta {i}", 40, "kadın", 1 + i % 3)
+        for i in range(args.objects)
+    )
+    for patient in repo.list_all()[::2]:
+        patient.stabilize()
+    timed(f"from_storage ({args.objects} hasta)", lambda: PatientAnalytics.from_storage(repo))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_appointment_dates.py
+"""
+Randevu tarihi okuma (strptime / fromisoformat) ve günlük poliklinik
+listesi: tüm hastaları tarayıp metin karşılaştırma ile tarih indeksinden
+okuma (filter_by_appointment_date) karşılaştırması.
+
+Kullanım:
+    python -m benchmarks.bench_appointment_dates --sizes 10000 100000 1000000
+"""
+
+import argparse
+import time
+from datetime import date, datetime, timedelta
+
+from app.modules.Patient.outpatient import Outpatient, parse_appointment_date
+from app.modules.Patient.repository import PatientRepository
+
+
+def build(size: int, days: int = 365) -> PatientRepository:
+    start = date(2025, 1, 1)
+    repo = PatientRepository()
+    repo.add_many(
+        Outpatient(None, f"Hasta {i}", i % 100, "erkek",
+                   (start + timedelta(days=i % days)).isoformat())
+        for i in range(size)
+    )
+    return repo
+
+
+def scan(repo: PatientRepository, day: str):
+    return [
+        p for p in repo.filter_by_type("outpatient")
+        if p.appointment_date == day
+    ]
+
+
+def timed(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    values = [f"2025-{m:02d}-{d:02d}" for m in range(1, 13) for d in range(1, 29)] * 300
+    strptime = timed(lambda: [datetime.strptime(v, "%Y-%m-%d") for v in values], 3)
+    iso = timed(lambda: [parse_appointment_date(v) for v in values], 3)
+    print(
+        f"tarih okuma ({len(values)}) | strptime {strptime * 1000:>7.1f} ms | "
+        f"fromisoformat {iso * 1000:>7.1f} ms"
+    )
+
+    for size in args.sizes:
+        repo = build(size)
+        assert scan(repo, "2025-03-10") == repo.filter_by_appointment_date("2025-03-10")
+        scanned = timed(lambda: scan(repo, "2025-03-10"))
+        indexed = timed(lambda: repo.filter_by_appointment_date("2025-03-10"))
+        print(
+            f"{size:>9} hasta | tarama {scanned * 1000:>8.2f} ms | "
+            f"indeks {indexed * 1000:>8.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_census.py
+"""
+Özet başlığı için eski yöntem (listeleri oluşturup len() almak) ile canlı
+sayaçların (PatientService.census) karşılaştırması.
+
+Kullanım:
+    python -m benchmarks.bench_census --sizes 10000 100000 1000000
+"""
+
+import argparse
+import time
+
+from app.modules.Patient.emergency_patient import EmergencyPatient
+from app.modules.Patient.inpatient import Inpatient
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.repository import PatientRepository
+from app.modules.Patient.service import PatientService
+
+
+def build(size: int) -> PatientService:
+    service = PatientService(PatientRepository(max_inpatients=size))
+    patients = []
+    for i in range(size):
+        if i % 10 == 0:
+            patients.append(EmergencyPatient(None, f"Hasta {i}", i % 100, "kadın", 1 + i % 3))
+        elif i % 10 == 1:
+            patients.append(Inpatient(None, f"Hasta {i}", i % 100, "erkek", status="taburcu"))
+        else:
+            patients.append(Outpatient(None, f"Hasta {i}", i % 100, "erkek"))
+    service._repository.add_many(patients)
+    return service
+
+
+def scan_header(service: PatientService):
+    return (
+        service.total_patient_count(),
+        len(service.list_active_patients()),
+        len(service.list_emergency_patients()),
+        len(service.list_patients_by_type("Inpatient")),
+    )
+
+
+def timed(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        service = build(size)
+        service.census()
+        scan = timed(lambda: scan_header(service))
+        live = timed(service.census)
+        print(
+            f"{size:>9} hasta | listeler {scan * 1000:>8.2f} ms | "
+            f"census {live * 1e6:>6.1f} µs"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_census_timeline.py
+"""
+Geçmiş bir an için durum sayımı: her hastanın durum geçmişini tekrar
+oynatmak ile StatusTimeline (sıralı geçiş kaydı + bisect) karşılaştırması.
+
+Kullanım:
+    python -m benchmarks.bench_census_timeline --size 100000 --queries 5000
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from app.modules.Patient.base import PatientBase
+from app.modules.Patient.census import StatusTimeline
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.repository import PatientRepository
+
+STATUSES = PatientBase._valid_statuses
+START = datetime(2026, 1, 1)
+SPAN = 30 * 24 * 3600
+
+
+def make_patient(pid: int, rng: random.Random) -> PatientBase:
+    """ 30 güne yayılmış 1-6 durum geçişi olan hasta """
+    data = Outpatient(pid, f"Hasta {pid}", 30, "kadın").to_dict()
+    base = START.timestamp()
+    times = sorted(rng.sample(range(SPAN), rng.randint(1, 6)))
+    codes = [rng.randrange(len(STATUSES)) for _ in times]
+    data["status"] = STATUSES[codes[-1]]
+    data["status_log"] = [
+        round((base + t) * 1e6) << 3 | code for t, code in zip(times, codes)
+    ]
+    return PatientBase.restore(data)
+
+
+def replay_census(patients, when: datetime):
+    micros = round(when.timestamp() * 1e6)
+    counts = dict.fromkeys(STATUSES, 0)
+    for patient in patients:
+        current = None
+        for code, at in patient.iter_status_log():
+            if at > micros:
+                break
+            current = code
+        if current is not None:
+            counts[STATUSES[current]] += 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=5_000)
+    parser.add_argument("--replay-queries", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    repo = PatientRepository()
+    repo.add_many(make_patient(2501 + i, rng) for i in range(args.size))
+
+    start = time.perf_counter()
+    timeline = StatusTimeline(repo)
+    timeline.census_at(START)
+    build = time.perf_counter() - start
+
+    moments = [START + timedelta(seconds=rng.randrange(SPAN)) for _ in range(args.queries)]
+
+    patients = repo.list_all()
+    start = time.perf_counter()
+    for when in moments[:args.replay_queries]:
+        assert replay_census(patients, when) == timeline.census_at(when)
+    replay = (time.perf_counter() - start) / args.replay_queries
+
+    start = time.perf_counter()
+    for when in moments:
+        timeline.census_at(when)
+    point = (time.perf_counter() - start) / args.queries
+
+    start = time.perf_counter()
+    for when in moments:
+        timeline.census_between(when, when + timedelta(hours=8))
+    interval = (time.perf_counter() - start) / args.queries
+
+    print(f"geçiş sayısı        : {len(timeline)}")
+    print(f"kayıt oluşturma     : {build * 1000:.0f} ms")
+    print(f"tekrar oynatma      : {replay * 1000:.1f} ms/sorgu")
+    print(f"census_at           : {point * 1e6:.1f} µs/sorgu")
+    print(f"census_between (8 sa): {interval * 1e6:.1f} µs/sorgu")
+
+
+if __name__ == "__main__":
+    main()
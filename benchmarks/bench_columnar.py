@@ -0,0 +1,57 @@
+# benchmarks/bench_columnar.py
+"""
+ColumnarPatientStore toplu sorgu süreleri (numpy gerektirir).
+
+Kullanım:
+    python -m benchmarks.bench_columnar --size 1000000
+"""
+
+import argparse
+import time
+
+from app.modules.Patient.columnar import ColumnarPatientStore
+from app.modules.Patient.emergency_patient import EmergencyPatient
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.repository import PatientRepository
+
+
+def timed_ms(func, repeat: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    repo = PatientRepository()
+    for i in range(args.size):
+        if i % 10 == 0:
+            patient = EmergencyPatient(None, f"Hasta {i}", i % 100, "kadın", 1 + i % 3)
+        else:
+            patient = Outpatient(None, f"Hasta {i}", i % 100, "erkek")
+        repo.add(patient)
+
+    start = time.perf_counter()
+    store = ColumnarPatientStore(repo)
+    print(f"store kurulumu ({args.size} hasta): {time.perf_counter() - start:.2f} s")
+
+    queries = {
+        "mask(acil, 65+)": lambda: store.mask(status="acil", min_age=65),
+        "count_by_status": store.count_by_status,
+        "count_by_type": store.count_by_type,
+        "age_histogram": store.age_histogram,
+        "python döngüsü (durum sayımı)": lambda: sum(
+            1 for p in repo.list_all() if p.status == "acil"
+        ),
+    }
+    for name, query in queries.items():
+        repeat = 1 if name.startswith("python") else 20
+        print(f"{name:<32}: {timed_ms(query, repeat):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
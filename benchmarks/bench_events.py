@@ -0,0 +1,72 @@
+# benchmarks/bench_events.py
+"""
+ChangeCapture + EventBus'ın kayıt ve durum güncellemelerine eklediği yük
+ile abonelere teslim hızı.
+
+Kullanım:
+    python -m benchmarks.bench_events --size 100000 --subscribers 2
+"""
+
+import argparse
+import time
+
+from app.modules.Patient.events import ChangeCapture, EventBus
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.repository import PatientRepository
+
+
+def workload(repo: PatientRepository, size: int) -> float:
+    patients = [Outpatient(None, f"Hasta {i}", i % 100, "kadın") for i in range(size)]
+    start = time.perf_counter()
+    for patient in patients:
+        repo.add(patient)
+    for patient in patients:
+        patient.update_status("tamamlandı")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--subscribers", type=int, default=2)
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    base = workload(PatientRepository(), args.size)
+
+    repo = PatientRepository()
+    bus = EventBus()
+    ChangeCapture(repo, bus)
+    received = [0] * args.subscribers
+
+    def counter(index):
+        def handler(batch):
+            received[index] += len(batch)
+        return handler
+
+    subscriptions = [
+        bus.subscribe(counter(i), buffer_size=4 * args.size, batch_size=args.batch_size)
+        for i in range(args.subscribers)
+    ]
+    captured = workload(repo, args.size)
+    start = time.perf_counter()
+    for subscription in subscriptions:
+        subscription.flush()
+    drain = time.perf_counter() - start
+    bus.close()
+
+    events = 2 * args.size
+    print(f"olaysız         : {events / base:>10.0f} işlem/s")
+    print(
+        f"olaylı          : {events / captured:>10.0f} işlem/s "
+        f"(işlem başına +{(captured - base) / events * 1e6:.2f} µs)"
+    )
+    print(
+        f"teslim          : {sum(received)} olay, son teslim için "
+        f"{drain * 1000:.1f} ms beklendi, atılan "
+        f"{sum(s.dropped for s in subscriptions)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
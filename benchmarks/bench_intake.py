@@ -0,0 +1,58 @@
+# benchmarks/bench_intake.py
+"""
+Toplu acil başvuru (ani yoğunluk) senaryosunda IntakePipeline hızı ile
+aşama bazlı gecikme ve kuyruk derinlikleri.
+
+Kullanım:
+    python -m benchmarks.bench_intake --size 100000 --batch-size 256
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from app.modules.Patient.intake import IntakePipeline
+from app.modules.Patient.repository import PatientRepository
+from app.modules.Patient.service import PatientService
+
+SYMPTOMS = ["ateş", "öksürük", "kusma", "göğüs ağrısı", "baş dönmesi", "halsizlik"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=50_000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--queue-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    arrivals = [
+        json.dumps({
+            "name": f"Hasta {i}",
+            "age": rng.randrange(1, 100),
+            "gender": rng.choice(("erkek", "kadın")),
+            "emergency_level": rng.randint(1, 3),
+            "symptoms": rng.sample(SYMPTOMS, 2),
+        }, ensure_ascii=False)
+        for i in range(args.size)
+    ]
+
+    pipeline = IntakePipeline(
+        PatientService(PatientRepository()),
+        queue_size=args.queue_size,
+        batch_size=args.batch_size,
+    )
+    start = time.perf_counter()
+    asyncio.run(pipeline.run(arrivals))
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.size} başvuru: {elapsed:.2f} s ({args.size / elapsed:.0f} başvuru/s), "
+          f"yatış: {len(pipeline.admitted)}, hata: {len(pipeline.errors)}")
+    for stats in pipeline.stats.values():
+        print(f"  {stats}")
+
+
+if __name__ == "__main__":
+    main()
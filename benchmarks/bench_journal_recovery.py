@@ -0,0 +1,58 @@
+# benchmarks/bench_journal_recovery.py
+"""
+PatientJournal kurtarma süresi ölçümü.
+
+Önce --patients kadar hasta eklenip snapshot alınır, ardından --events kadar
+durum değişikliği journal'a yazılır. Son olarak snapshot + journal kuyruğundan
+yeni bir repository kurulur ve süre raporlanır.
+
+Kullanım:
+    python -m benchmarks.bench_journal_recovery --patients 1000000 --events 10000000
+"""
+
+import argparse
+import random
+import tempfile
+import time
+
+from app.modules.Patient.journal import PatientJournal
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.repository import PatientRepository
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--patients", type=int, default=100_000)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        journal = PatientJournal(directory)
+        repo = PatientRepository()
+        journal.recover(repo)
+
+        start = time.perf_counter()
+        repo.add_many(
+            Outpatient(None, f"Hasta {i}", i % 100, "erkek")
+            for i in range(args.patients)
+        )
+        journal.checkpoint()
+        print(f"hasta ekleme + snapshot: {time.perf_counter() - start:.1f} s")
+
+        patients = repo.list_all()
+        statuses = ("aktif", "stabil", "acil")
+        start = time.perf_counter()
+        for i in range(args.events):
+            random.choice(patients).update_status(statuses[i % 3])
+        journal.close()
+        elapsed = time.perf_counter() - start
+        print(f"{args.events} olay yazma: {elapsed:.1f} s ({args.events / elapsed:.0f} olay/s)")
+
+        recovered = PatientRepository()
+        stats = PatientJournal(directory).recover(recovered)
+        print(f"kurtarma: {stats}")
+        print(f"kurtarılan hasta sayısı: {recovered.count()}")
+
+
+if __name__ == "__main__":
+    main()
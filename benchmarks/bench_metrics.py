@@ -0,0 +1,81 @@
+# benchmarks/bench_metrics.py
+"""
+Ölçüm (app.metrics) maliyeti: aynı iş yükü ölçümsüz, ölçümlü ve
+uninstrument sonrası çalıştırılır. Ölçümsüz ve uninstrument sonrası
+süreler aynı olmalıdır.
+
+Kullanım:
+    python -m benchmarks.bench_metrics --count 100000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from app.metrics import MetricsRegistry
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.repository import PatientRepository
+from app.modules.Patient.service import PatientService
+from app.modules.appointment.emergencyappointment import EmergencyAppointment
+from app.modules.appointment.implementations import AppointmentService
+from app.modules.appointment.repository import AppointmentRepository
+
+
+def patient_workload(service: PatientService, count: int):
+    for i in range(count):
+        patient = service.register_patient(Outpatient(None, f"Hasta {i}", i % 100, "erkek"))
+        service.get_patient(patient.patient_id)
+
+
+def appointment_workload(service: AppointmentService, count: int):
+    start = datetime(2030, 1, 1)
+    for i in range(count):
+        service.create_appointment(
+            EmergencyAppointment(i + 1, i + 1, f"Dr. {i % 50}", start + timedelta(minutes=i))
+        )
+
+
+def run(label: str, registry, workload, build, count: int):
+    service, repository = build()
+    if registry is not None:
+        registry.instrument(service)
+        registry.instrument(repository)
+    start = time.perf_counter()
+    workload(service, count)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed * 1000:>9.1f} ms | çağrı başına {elapsed / count * 1e6:>6.2f} µs")
+    return service, repository
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--appointments", type=int, default=2_000)
+    args = parser.parse_args()
+
+    def patients():
+        repository = PatientRepository()
+        return PatientService(repository), repository
+
+    def appointments():
+        repository = AppointmentRepository()
+        return AppointmentService(repository), repository
+
+    for name, build, workload, count in (
+        ("hasta", patients, patient_workload, args.count),
+        ("randevu", appointments, appointment_workload, args.appointments),
+    ):
+        run(f"{name}: ölçümsüz", None, workload, build, count)
+        registry = MetricsRegistry()
+        run(f"{name}: ölçümlü", registry, workload, build, count)
+        service, repository = build()
+        registry.instrument(service)
+        registry.uninstrument(service)
+        start = time.perf_counter()
+        workload(service, count)
+        elapsed = time.perf_counter() - start
+        print(f"{name + ': uninstrument sonrası':<28} {elapsed * 1000:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
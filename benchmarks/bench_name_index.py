@@ -0,0 +1,77 @@
+# benchmarks/bench_name_index.py
+"""
+NameIndex önek ve hataya toleranslı arama süreleri.
+
+Kullanım:
+    python -m benchmarks.bench_name_index --size 1000000
+"""
+
+import argparse
+import random
+import time
+
+from app.modules.Patient.name_index import NameIndex
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.repository import PatientRepository
+
+FIRST_NAMES = [
+    "Ali", "Ayşe", "Mehmet", "Fatma", "Mustafa", "Emine", "Ahmet", "Hatice",
+    "İbrahim", "Zeynep", "Hüseyin", "Elif", "Işıl", "İsmail", "Ömer", "Şule",
+    "Çağrı", "Gökhan", "Yıldız", "Ilgaz", "Büşra", "Oğuz", "Ümit", "Derya",
+]
+# soyadları hecelerden üretilir (~20 bin farklı soyadı)
+SYLLABLES = [
+    "yıl", "kay", "dem", "şa", "çe", "öz", "ay", "ar", "do", "kı", "as",
+    "ka", "ko", "ku", "ke", "iş", "in", "gü", "er", "tan", "türk", "lı",
+    "can", "oğ", "bay", "ak", "sü", "me", "ğan", "dır",
+]
+LAST_NAMES = [
+    (a + b + c).capitalize()
+    for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES
+][::2]
+
+
+def timed_queries(search, queries) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    repo = PatientRepository()
+    repo.add_many(
+        Outpatient(
+            None,
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            rng.randrange(100),
+            "erkek",
+        )
+        for _ in range(args.size)
+    )
+
+    start = time.perf_counter()
+    index = NameIndex(repo)
+    print(f"indeks oluşturma ({args.size} hasta): {time.perf_counter() - start:.2f} s")
+
+    prefixes = [
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)[:3]}"
+        for _ in range(args.queries)
+    ]
+    typos = [
+        f"{rng.choice(FIRST_NAMES).replace('a', 'e', 1)} "
+        f"{rng.choice(LAST_NAMES)[1:]}".upper()
+        for _ in range(args.queries)
+    ]
+    print(f"prefix_search: {timed_queries(index.prefix_search, prefixes):.3f} ms/sorgu")
+    print(f"fuzzy_search : {timed_queries(index.fuzzy_search, typos):.3f} ms/sorgu")
+
+
+if __name__ == "__main__":
+    main()
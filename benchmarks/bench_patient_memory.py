@@ -0,0 +1,124 @@
+# benchmarks/bench_patient_memory.py
+"""
+Hasta nesnesi başına bellek kullanımı (tracemalloc ile).
+
+Güncel düzen (__slots__ + paketlenmiş durum geçmişi) eski düzenle
+karşılaştırılır: eski düzen __dict__ taşıyan nesneler, (durum, datetime)
+demetlerinden oluşan durum geçmişi listesi ve liste halinde dinleyici,
+semptom ve randevu geçmişi alanlarıdır; aşağıdaki Legacy* sınıfları bu
+düzeni aynı işlemlerle yeniden üretir.
+
+Kullanım:
+    python -m benchmarks.bench_patient_memory --count 100000
+"""
+
+import argparse
+import tracemalloc
+from datetime import datetime
+
+from app.modules.Patient.emergency_patient import EmergencyPatient
+from app.modules.Patient.outpatient import Outpatient
+
+
+class LegacyPatient:
+    """ Eski düzen: __dict__ ve (durum, datetime) listesi """
+
+    def __init__(self, patient_id, name, age, gender, status):
+        self._patient_id = patient_id
+        self._watchers = []
+        self._name = name.strip().title()
+        self._age = age
+        self._gender = gender.capitalize()
+        self._status = None
+        self._status_history = []
+        self.update_status(status)
+
+    def update_status(self, new_status):
+        self._status = new_status
+        self._status_history.append((new_status, datetime.now()))
+
+
+class LegacyOutpatient(LegacyPatient):
+    def __init__(self, patient_id, name, age, gender, appointment_date=None, status="aktif"):
+        super().__init__(patient_id, name, age, gender, status)
+        self._appointment_history = []
+        self._appointment_date = appointment_date
+
+    def update_status(self, new_status):
+        if new_status in ("iptal", "tamamlandı") and getattr(self, "_appointment_date", None):
+            self._appointment_history.append(self._appointment_date)
+            self._appointment_date = None
+        super().update_status(new_status)
+
+
+class LegacyEmergencyPatient(LegacyPatient):
+    def __init__(self, patient_id, name, age, gender, emergency_level, status="acil"):
+        super().__init__(patient_id, name, age, gender, status)
+        self._emergency_level = emergency_level
+        self._arrival_time = datetime.now()
+        self._symptoms = []
+        self._triage_area = None
+
+
+def make_legacy_outpatient(i: int) -> LegacyOutpatient:
+    patient = LegacyOutpatient(None, f"Hasta {i}", i % 100, "erkek", "2025-01-01")
+    patient.update_status("tamamlandı")
+    patient._appointment_date = "2025-02-01"
+    patient.update_status("iptal")
+    return patient
+
+
+def make_legacy_emergency(i: int) -> LegacyEmergencyPatient:
+    patient = LegacyEmergencyPatient(None, f"Hasta {i}", i % 100, "kadın", 2)
+    patient._symptoms.extend(["yüksek ateş", "kusma", "baş dönmesi"])
+    patient._triage_area = "Sarı"
+    patient.update_status("stabil")
+    patient.update_status("taburcu")
+    return patient
+
+
+def make_outpatient(i: int) -> Outpatient:
+    patient = Outpatient(None, f"Hasta {i}", i % 100, "erkek", "2025-01-01")
+    patient.update_status("tamamlandı")
+    patient.appointment_date = "2025-02-01"
+    patient.update_status("iptal")
+    return patient
+
+
+def make_emergency(i: int) -> EmergencyPatient:
+    patient = EmergencyPatient(None, f"Hasta {i}", i % 100, "kadın", 2)
+    patient.add_symptoms(["yüksek ateş", "kusma", "baş dönmesi"])
+    patient.stabilize()
+    patient.update_status("taburcu")
+    return patient
+
+
+def bytes_per_patient(factory, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    patients = [factory(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del patients
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for name, legacy_factory, factory in (
+        ("Outpatient", make_legacy_outpatient, make_outpatient),
+        ("EmergencyPatient", make_legacy_emergency, make_emergency),
+    ):
+        before = bytes_per_patient(legacy_factory, args.count)
+        after = bytes_per_patient(factory, args.count)
+        print(
+            f"{name:<18}: eski {before:8.1f} | yeni {after:8.1f} bayt/hasta | "
+            f"fark {after - before:+8.1f} ({(after - before) / before:+.0%})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_patient_repository.py
+"""
+PatientRepository için çağrı başına gecikme ölçümü.
+
+Kullanım:
+    python -m benchmarks.bench_patient_repository
+    python -m benchmarks.bench_patient_repository --sizes 1000 10000
+"""
+
+import argparse
+import random
+import time
+
+from app.modules.Patient.repository import PatientRepository
+from app.modules.Patient.outpatient import Outpatient
+
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+
+
+def build_repository(size: int) -> PatientRepository:
+    repo = PatientRepository()
+    for i in range(size):
+        repo.add(Outpatient(None, f"Hasta {i}", i % 100, "erkek"))
+    return repo
+
+
+def per_call_ns(func, args_list) -> float:
+    """ Verilen argümanlarla fonksiyonu çağırır, çağrı başına ns döndürür """
+    start = time.perf_counter_ns()
+    for args in args_list:
+        func(*args)
+    return (time.perf_counter_ns() - start) / len(args_list)
+
+
+def run(size: int, calls: int):
+    repo = build_repository(size)
+    ids = [p.patient_id for p in repo.list_all()]
+    sample = [(random.choice(ids),) for _ in range(calls)]
+
+    lookup = per_call_ns(repo.get_by_id, sample)
+
+    new_patients = [
+        (Outpatient(None, f"Yeni {i}", 30, "kadın"),) for i in range(calls)
+    ]
+    insert = per_call_ns(repo.add, new_patients)
+
+    removal_ids = [(p.patient_id,) for (p,) in new_patients]
+    removal = per_call_ns(repo.remove, removal_ids)
+
+    return lookup, insert, removal
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--calls", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print(f"{'hasta':>10} | {'get_by_id':>12} | {'add':>12} | {'remove':>12}")
+    print("-" * 56)
+    for size in args.sizes:
+        lookup, insert, removal = run(size, args.calls)
+        print(
+            f"{size:>10} | {lookup:>9.0f} ns | {insert:>9.0f} ns | "
+            f"{removal:>9.0f} ns"
+        )
+
+
+if __name__ == "__main__":
+    main()
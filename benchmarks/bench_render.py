@@ -0,0 +1,64 @@
+# benchmarks/bench_render.py
+"""
+detailed_info / summary_line önbelleği ve akış halinde liste yazımı.
+
+İlk geçiş metinleri oluşturur, ikinci geçiş önbellekten okur; liste
+/dev/null'a (ya da --output dosyasına) parça parça yazılır.
+
+Kullanım:
+    python -m benchmarks.bench_render --size 200000
+"""
+
+import argparse
+import os
+import time
+
+from app.modules.Patient.emergency_patient import EmergencyPatient
+from app.modules.Patient.inpatient import Inpatient
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.render import write_patient_list
+
+
+def make_patients(size: int):
+    patients = []
+    for i in range(size):
+        if i % 3 == 0:
+            patients.append(EmergencyPatient(i, f"Hasta {i}", i % 100, "kadın", 1 + i % 3))
+        elif i % 3 == 1:
+            patients.append(Inpatient(i, f"Hasta {i}", i % 100, "erkek", room_number=1 + i % 50))
+        else:
+            patients.append(Outpatient(i, f"Hasta {i}", i % 100, "erkek", "2026-05-01"))
+    return patients
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--output", default=os.devnull)
+    args = parser.parse_args()
+
+    patients = make_patients(args.size)
+    cold = timed(lambda: [p.detailed_info() for p in patients])
+    warm = timed(lambda: [p.detailed_info() for p in patients])
+    for patient in patients[::10]:
+        patient.update_status("stabil")
+    partial = timed(lambda: [p.detailed_info() for p in patients])
+
+    with open(args.output, "w", encoding="utf-8") as out:
+        listing = timed(lambda: write_patient_list(iter(patients), out))
+        listing_warm = timed(lambda: write_patient_list(iter(patients), out))
+
+    print(f"detailed_info ilk geçiş     : {cold * 1000:>7.1f} ms")
+    print(f"detailed_info önbellekten   : {warm * 1000:>7.1f} ms")
+    print(f"%10 hasta değiştikten sonra : {partial * 1000:>7.1f} ms")
+    print(f"liste yazımı (ilk / tekrar) : {listing * 1000:>7.1f} / {listing_warm * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_sharding.py
+"""
+ShardedPatientRepository'de shard sayısına göre toplam kayıt hızı ve
+shard'lara dağıtılan sorguların (filtre, sayım, öncelik sıralaması)
+süresi. Her shard'a kendi iş parçacığından kayıt yapılır; sorgular
+thread havuzuyla ve sırayla (--workers 1) ölçülebilir.
+
+Kullanım:
+    python -m benchmarks.bench_sharding --size 200000 --shards 1 2 4 8
+"""
+
+import argparse
+import threading
+import time
+
+from app.modules.Patient.emergency_patient import EmergencyPatient
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.sharding import ShardedPatientRepository
+
+
+def make_patients(count: int, offset: int):
+    patients = []
+    for i in range(offset, offset + count):
+        if i % 10 == 0:
+            patients.append(EmergencyPatient(None, f"Hasta {i}", i % 100, "kadın", 1 + i % 3))
+        else:
+            patients.append(Outpatient(None, f"Hasta {i}", i % 100, "erkek"))
+    return patients
+
+
+def timed(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(shards: int, size: int, workers):
+    hospitals = [f"Hastane {i + 1}" for i in range(shards)]
+    group = ShardedPatientRepository(hospitals, max_workers=workers)
+    per_shard = size // shards
+    batches = [make_patients(per_shard, i * per_shard) for i in range(shards)]
+
+    def register(hospital, patients):
+        service = group.service(hospital)
+        for patient in patients:
+            service.register_patient(patient)
+
+    threads = [
+        threading.Thread(target=register, args=(hospital, batch))
+        for hospital, batch in zip(hospitals, batches)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    insert = time.perf_counter() - start
+
+    by_status = timed(lambda: group.filter_by_status("acil"))
+    count = timed(lambda: group.count_by(statuses=("acil",)))
+    ordered = timed(lambda: group.list_patients_by_priority(), repeat=2)
+    peek = timed(lambda: group.peek_next_patients(10))
+    group.close()
+
+    print(
+        f"{shards:>2} shard | kayıt {per_shard * shards / insert:>9.0f} hasta/s | "
+        f"durum filtresi {by_status * 1000:>7.2f} ms | "
+        f"sayım {count * 1000:>6.3f} ms | "
+        f"öncelik sırası {ordered * 1000:>7.1f} ms | "
+        f"ilk 10 {peek * 1000:>6.3f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--workers", type=int, default=None,
+                        help="thread havuzu boyutu (varsayılan: shard sayısı)")
+    args = parser.parse_args()
+
+    for shards in args.shards:
+        run(shards, args.size, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_snapshot_startup.py
+"""
+Büyük bir hasta kümesinin yeniden yüklenme süresi:
+setter'lar üzerinden nesne oluşturma ile mmap'li ikili snapshot açılışı.
+
+Kullanım:
+    python -m benchmarks.bench_snapshot_startup --size 5000000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.modules.Patient.mapped_repository import MappedPatientRepository
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.snapshot import write_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=500_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    patients = [
+        Outpatient(2501 + i, f"Hasta {i}", i % 100, "erkek", "2025-01-01")
+        for i in range(args.size)
+    ]
+    build = time.perf_counter() - start
+    print(f"setter'larla oluşturma: {build:.2f} s")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "patients.snap")
+        start = time.perf_counter()
+        write_snapshot(path, patients)
+        print(f"snapshot yazma: {time.perf_counter() - start:.2f} s "
+              f"({os.path.getsize(path) / 1e6:.0f} MB)")
+        del patients
+
+        start = time.perf_counter()
+        repo = MappedPatientRepository(path)
+        print(f"snapshot açılışı: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        ids = [2501 + random.randrange(args.size) for _ in range(args.lookups)]
+        start = time.perf_counter()
+        for pid in ids:
+            repo.get_by_id(pid)
+        elapsed = time.perf_counter() - start
+        print(f"{args.lookups} tembel get_by_id: {elapsed * 1e6 / args.lookups:.1f} µs/işlem")
+
+        start = time.perf_counter()
+        active = repo.count_by(statuses=("aktif",))
+        print(f"count_by(aktif) = {active}: {time.perf_counter() - start:.2f} s")
+        repo.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_storage_backends.py
+"""
+In-memory ve SQLite depolama katmanlarının karşılaştırması:
+toplu ekleme, tekil arama ve filtre metotları.
+
+Kullanım:
+    python -m benchmarks.bench_storage_backends --size 100000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from app.modules.Patient.emergency_patient import EmergencyPatient
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.repository import PatientRepository
+from app.modules.Patient.sqlite_repository import SQLitePatientRepository
+
+
+def make_patients(size: int):
+    patients = []
+    for i in range(size):
+        if i % 10 == 0:
+            patients.append(EmergencyPatient(None, f"Hasta {i}", i % 100, "kadın", 1 + i % 3))
+        else:
+            patients.append(Outpatient(None, f"Hasta {i}", i % 100, "erkek"))
+    return patients
+
+
+def timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def run(name: str, make_repo, size: int, lookups: int):
+    repo = make_repo()
+    insert = timed(lambda: repo.add_many(make_patients(size)))
+    if isinstance(repo, SQLitePatientRepository):
+        repo.flush()
+        path = repo._conn.execute("PRAGMA database_list").fetchone()[2]
+        repo.close()
+        # arama ölçümü için önbelleği boş, yeniden açılmış veritabanı
+        repo = SQLitePatientRepository(path)
+
+    ids = [random.randint(2501, 2500 + size) for _ in range(lookups)]
+    lookup = timed(lambda: [repo.get_by_id(pid) for pid in ids])
+    by_status = timed(lambda: repo.filter_by_status("acil"))
+    by_type = timed(lambda: repo.filter_by_type("EmergencyPatient"))
+    count = timed(lambda: repo.count_by(statuses=("acil",)))
+
+    print(
+        f"{name:<8} | ekleme {size / insert:>9.0f} satır/s | "
+        f"arama {lookup / lookups * 1e6:>6.1f} µs | "
+        f"durum filtresi {by_status * 1000:>7.1f} ms | "
+        f"tip filtresi {by_type * 1000:>7.1f} ms | "
+        f"sayım {count * 1000:>6.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run("memory", PatientRepository, args.size, args.lookups)
+        run(
+            "sqlite",
+            lambda: SQLitePatientRepository(os.path.join(tmp, "patients.db")),
+            args.size, args.lookups
+        )
+
+
+if __name__ == "__main__":
+    main()
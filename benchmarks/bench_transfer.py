@@ -0,0 +1,51 @@
+# benchmarks/bench_transfer.py
+"""
+Akış halinde CSV/JSONL dışa ve içe aktarma hızı (satır/s).
+
+Kullanım:
+    python -m benchmarks.bench_transfer --size 1000000 --format csv
+"""
+
+import argparse
+import os
+import tempfile
+
+from app.modules.Patient.emergency_patient import EmergencyPatient
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.repository import PatientRepository
+from app.modules.Patient.service import PatientService
+from app.modules.Patient.transfer import export_patients, import_file
+
+
+def make_patients(size: int):
+    for i in range(size):
+        if i % 10 == 0:
+            patient = EmergencyPatient(None, f"Hasta {i}", i % 100, "kadın", 1 + i % 3)
+            patient.add_symptoms(["ateş", "öksürük"])
+        else:
+            patient = Outpatient(None, f"Hasta {i}", i % 100, "erkek", "2025-01-01")
+        yield patient
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--format", choices=("csv", "jsonl"), default="jsonl")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    source = PatientRepository()
+    source.add_many(make_patients(args.size))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, f"patients.{args.format}")
+        stats = export_patients(source.list_all(), path)
+        print(f"dışa aktarma: {stats} ({os.path.getsize(path) / 1e6:.0f} MB)")
+
+        service = PatientService(PatientRepository())
+        stats = import_file(service, path, chunk_size=args.chunk_size)
+        print(f"içe aktarma : {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# benchmarks/bench_triage.py
+"""
+TriageRulebook ile toplu triyaj hızı (hasta/s), anahtar kelime sayısı
+arttıkça sabit kalan tarama maliyeti.
+
+Kullanım:
+    python -m benchmarks.bench_triage --size 100000 --extra-keywords 1000
+"""
+
+import argparse
+import random
+import time
+
+from app.modules.Patient.emergency_patient import EmergencyPatient
+from app.modules.Patient.triage import DEFAULT_TRIAGE_RULES, TriageRulebook, triage_patients
+
+SYMPTOMS = [
+    "ateş", "öksürük", "baş ağrısı", "kusma", "göğüs ağrısı", "halsizlik",
+    "nefes darlığı", "karın ağrısı", "baş dönmesi", "ishal", "bulantı",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--extra-keywords", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    patients = []
+    for i in range(args.size):
+        patient = EmergencyPatient(None, f"Hasta {i}", 40, "erkek", 1)
+        patient.add_symptoms(rng.sample(SYMPTOMS, rng.randint(1, 4)))
+        patients.append(patient)
+
+    rules = DEFAULT_TRIAGE_RULES + [{
+        "area": "Sarı",
+        "level": 2,
+        "keywords": [f"belirti {i}" for i in range(args.extra_keywords)],
+    }]
+
+    for name, rulebook in (
+        ("varsayılan kurallar", TriageRulebook.from_description(DEFAULT_TRIAGE_RULES)),
+        (f"+{args.extra_keywords} anahtar kelime", TriageRulebook.from_description(rules)),
+    ):
+        start = time.perf_counter()
+        for patient in patients:
+            patient.determine_triage_area(rulebook)
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        triage_patients(patients, rulebook)
+        batch = time.perf_counter() - start
+        print(f"{name}: tekil {args.size / single:.0f} hasta/s, "
+              f"toplu {args.size / batch:.0f} hasta/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,479 @@
+# benchmarks/suite.py
+"""
+Hasta (PatientRepository / PatientService) ve randevu (AppointmentRepository /
+AppointmentService) modülleri için ölçeklenebilir benchmark paketi.
+
+Her boyut için hazır bir veri seti (fixture) kurulur ve her senaryo bu
+veri üzerinde ops adet işlem yapar. Kayıt, arama, filtreleme, öncelik
+listesi, oda atama, çakışma kontrolü, erteleme ve iptal ölçülür. Tüm
+kayıtları tarayan (O(n)) senaryolarda işlem sayısı scan_budget / n ile
+sınırlanır, böylece 10^6 boyutta da makul sürede biter. Her senaryo
+repeat kez (her seferinde yeni argümanlarla) çalıştırılır, en iyi süre
+alınır.
+
+Sonuçlar JSON olarak yazılır. --baseline ile önceki bir sonuç dosyasıyla
+karşılaştırılır; işlem başına süresi threshold oranından fazla artan
+senaryolar gerileme (regression) olarak işaretlenir ve çıkış kodu 1 olur.
+
+Kullanım:
+    python -m benchmarks.suite --sizes 1000 10000 100000 --output sonuc.json
+    python -m benchmarks.suite --sizes 1000000 --cases patient.
+    python -m benchmarks.suite --baseline baz.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import Callable, List, Optional, Sequence
+
+from app.modules.Patient.emergency_patient import EmergencyPatient
+from app.modules.Patient.inpatient import Inpatient
+from app.modules.Patient.outpatient import Outpatient
+from app.modules.Patient.repository import PatientRepository
+from app.modules.Patient.service import PatientService
+from app.modules.appointment.emergencyappointment import EmergencyAppointment
+from app.modules.appointment.implementations import AppointmentService
+from app.modules.appointment.repository import AppointmentRepository
+from app.modules.appointment.routineappointment import RoutineAppointment
+
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+FIRST_DAY = date(2030, 1, 1)
+CLINIC_DAYS = 30
+DOCTORS = 50
+
+
+class Case:
+    """ Bir benchmark senaryosu. prepare(fixture, ops) zamanlanmayan
+    hazırlığı yapıp işlem listesini, run(fixture, items) ölçülen işi yapar.
+    scan=True senaryolarda işlem sayısı tarama bütçesiyle sınırlanır. """
+
+    def __init__(self, name: str, prepare: Callable, run: Callable, scan: bool = False):
+        self.name = name
+        self.prepare = prepare
+        self.run = run
+        self.scan = scan
+
+
+# hasta senaryoları
+class PatientFixture:
+    """ Hasta verisi: %70 ayaktan, %20 acil, %10 yatan hasta.
+    Servislerde ops kadar fazladan boş yatak bırakılır. """
+
+    def __init__(self, size: int, ops: int, rng: random.Random):
+        inpatients = size // 10
+        beds = inpatients + 2 * ops + 4
+        wards = [{
+            "ward": "Dahiliye", "floor": 1,
+            "rooms": [{"number": 1 + i, "beds": 4} for i in range(beds // 4 + 1)],
+        }]
+        self.repository = PatientRepository(wards=wards)
+        self.service = PatientService(self.repository)
+        self.rng = rng
+        self.serial = 0
+
+        records = []
+        for i in range(size):
+            kind = i % 10
+            if kind == 0:
+                records.append(Inpatient(None, f"Yatan {i}", i % 100, "kadın"))
+            elif kind < 3:
+                patient = EmergencyPatient(None, f"Acil {i}", i % 100, "erkek", 1 + i % 3)
+                patient.add_symptoms(["göğüs ağrısı"] if i % 2 else ["ateş"])
+                patient.determine_triage_area()
+                records.append(patient)
+            else:
+                day = FIRST_DAY + timedelta(days=i % CLINIC_DAYS)
+                records.append(Outpatient(None, f"Ayaktan {i}", i % 100, "erkek", day))
+        result = self.service.register_many(records)
+        if not result.ok:
+            raise RuntimeError(f"Veri seti kurulamadı: {result.errors[:3]}")
+
+        self.ids = [p.patient_id for p in records]
+        self.emergency_ids = [p.patient_id for p in records if isinstance(p, EmergencyPatient)]
+
+    def sample_ids(self, ops: int) -> List[int]:
+        return [self.rng.choice(self.ids) for _ in range(ops)]
+
+    def new_name(self) -> str:
+        self.serial += 1
+        return f"Yeni Hasta {self.serial}"
+
+
+def _prepare_register(fx: PatientFixture, ops: int):
+    return [Outpatient(None, fx.new_name(), 30, "kadın", FIRST_DAY) for _ in range(ops)]
+
+
+def _run_register(fx: PatientFixture, patients):
+    for patient in patients:
+        fx.service.register_patient(patient)
+
+
+def _run_lookup(fx: PatientFixture, ids):
+    for pid in ids:
+        fx.service.get_patient(pid)
+
+
+def _prepare_days(fx: PatientFixture, ops: int):
+    return [FIRST_DAY + timedelta(days=fx.rng.randrange(CLINIC_DAYS)) for _ in range(ops)]
+
+
+def _run_filter_date(fx: PatientFixture, days):
+    for day in days:
+        fx.service.list_patients_by_appointment_date(day)
+
+
+def _run_filter_emergency(fx: PatientFixture, items):
+    for _ in items:
+        fx.service.list_emergency_patients()
+
+
+def _run_filter_status(fx: PatientFixture, items):
+    for _ in items:
+        fx.repository.filter_by_status("stabil")
+
+
+def _run_priority_peek(fx: PatientFixture, items):
+    for _ in items:
+        fx.repository.peek_next_patients(10)
+
+
+def _run_priority_list(fx: PatientFixture, items):
+    for _ in items:
+        fx.repository.list_patients_by_priority(only_active=True)
+
+
+def _prepare_inpatients(fx: PatientFixture, ops: int):
+    return [Inpatient(None, fx.new_name(), 60, "erkek") for _ in range(ops)]
+
+
+def _run_room_allocation(fx: PatientFixture, patients):
+    # oda atama + taburcu: yatak sayısı sabit kalır
+    for patient in patients:
+        fx.service.register_patient(patient)
+        fx.service.discharge_patient(patient.patient_id)
+
+
+def _prepare_admissions(fx: PatientFixture, ops: int):
+    ids = []
+    for _ in range(ops):
+        patient = EmergencyPatient(None, fx.new_name(), 40, "kadın", 2)
+        fx.service.register_patient(patient)
+        ids.append(patient.patient_id)
+    return ids
+
+
+def _run_admission(fx: PatientFixture, ids):
+    for pid in ids:
+        fx.service.admit_emergency_patient(pid)
+        fx.service.discharge_patient(pid)
+
+
+def _prepare_status_ids(fx: PatientFixture, ops: int):
+    return [fx.rng.choice(fx.emergency_ids) for _ in range(ops)]
+
+
+def _run_status_update(fx: PatientFixture, ids):
+    for pid in ids:
+        patient = fx.service.get_patient(pid)
+        if patient.status == "acil":
+            fx.service.update_patient_status(pid, "stabil")
+        elif patient.status == "stabil":
+            fx.service.update_patient_status(pid, "acil")
+
+
+def _prepare_nothing(fx, ops: int):
+    return range(ops)
+
+
+def _run_census(fx: PatientFixture, items):
+    for _ in items:
+        fx.service.census()
+
+
+PATIENT_CASES = [
+    Case("patient.register", _prepare_register, _run_register),
+    Case("patient.lookup", lambda fx, ops: fx.sample_ids(ops), _run_lookup),
+    Case("patient.status_update", _prepare_status_ids, _run_status_update),
+    Case("patient.filter_appointment_date", _prepare_days, _run_filter_date, scan=True),
+    Case("patient.filter_status", _prepare_nothing, _run_filter_status, scan=True),
+    Case("patient.list_emergency", _prepare_nothing, _run_filter_emergency, scan=True),
+    Case("patient.priority_peek", _prepare_nothing, _run_priority_peek),
+    Case("patient.priority_list", _prepare_nothing, _run_priority_list, scan=True),
+    Case("patient.room_allocation", _prepare_inpatients, _run_room_allocation),
+    Case("patient.admit_emergency", _prepare_admissions, _run_admission),
+    Case("patient.census", _prepare_nothing, _run_census),
+]
+
+
+# randevu senaryoları
+class AppointmentFixture:
+    """ Randevu verisi: DOCTORS doktor, 15 dakikalık slotlar, yarısı rutin. """
+
+    def __init__(self, size: int, ops: int, rng: random.Random):
+        self.repository = AppointmentRepository()
+        self.service = AppointmentService(self.repository)
+        self.rng = rng
+        self.size = size
+        self.next_id = size + 1
+
+        # save() her kayıtta tüm listeyi taradığı (find_by_id) için kurulum
+        # O(n^2) olurdu; veri seti doğrudan listeye yazılır
+        self.repository._appointments.extend(
+            self._make(i + 1, self.slot(i)) for i in range(size)
+        )
+
+    @staticmethod
+    def slot(index: int) -> datetime:
+        minutes = (index // DOCTORS) * 15
+        return datetime.combine(FIRST_DAY, datetime.min.time()) + timedelta(minutes=minutes)
+
+    @staticmethod
+    def doctor(index: int) -> str:
+        return f"Dr. {index % DOCTORS}"
+
+    def _make(self, appointment_id: int, when: datetime):
+        index = appointment_id - 1
+        if index % 2:
+            return EmergencyAppointment(appointment_id, index + 1, self.doctor(index), when)
+        return RoutineAppointment(appointment_id, index + 1, self.doctor(index), when, 1 + index % 300)
+
+    def sample_ids(self, ops: int) -> List[int]:
+        return [self.rng.randrange(1, self.size + 1) for _ in range(ops)]
+
+    def free_slot(self) -> datetime:
+        # veri setinin bitişinden sonraki boş slotlar
+        return self.slot(self.size + DOCTORS) + timedelta(minutes=15 * self.rng.randrange(1_000_000))
+
+
+def _prepare_appointments(fx: AppointmentFixture, ops: int):
+    items = []
+    for _ in range(ops):
+        items.append(fx._make(fx.next_id, fx.free_slot()))
+        fx.next_id += 1
+    return items
+
+
+def _run_create(fx: AppointmentFixture, appointments):
+    for appointment in appointments:
+        try:
+            fx.service.create_appointment(appointment)
+        except ValueError:
+            pass  # nadir rastgele slot çakışması
+
+
+def _prepare_conflicts(fx: AppointmentFixture, ops: int):
+    # var olan slotlarla çakışan adaylar (en kötü durum: listenin sonuna yakın)
+    items = []
+    for appointment_id in fx.sample_ids(ops):
+        index = appointment_id - 1
+        items.append(EmergencyAppointment(fx.next_id, 1, fx.doctor(index), fx.slot(index)))
+        fx.next_id += 1
+    return items
+
+
+def _run_conflict(fx: AppointmentFixture, candidates):
+    for candidate in candidates:
+        fx.repository.has_time_conflict(candidate)
+
+
+def _run_find(fx: AppointmentFixture, ids):
+    for appointment_id in ids:
+        fx.service.get_by_id(appointment_id)
+
+
+def _prepare_dates(fx: AppointmentFixture, ops: int):
+    last = fx.slot(fx.size).date()
+    span = (last - FIRST_DAY).days + 1
+    return [FIRST_DAY + timedelta(days=fx.rng.randrange(span)) for _ in range(ops)]
+
+
+def _run_filter_by_date(fx: AppointmentFixture, days):
+    for day in days:
+        fx.service.list_by_date(day)
+
+
+def _prepare_doctors(fx: AppointmentFixture, ops: int):
+    return [fx.doctor(fx.rng.randrange(DOCTORS)) for _ in range(ops)]
+
+
+def _run_filter_by_doctor(fx: AppointmentFixture, doctors):
+    for doctor in doctors:
+        fx.service.list_by_doctor(doctor)
+
+
+def _prepare_reschedules(fx: AppointmentFixture, ops: int):
+    return [(appointment_id, fx.free_slot()) for appointment_id in fx.sample_ids(ops)]
+
+
+def _run_reschedule(fx: AppointmentFixture, items):
+    for appointment_id, when in items:
+        fx.service.reschedule_appointment(appointment_id, when)
+
+
+def _run_cancel(fx: AppointmentFixture, ids):
+    for appointment_id in ids:
+        fx.service.cancel_appointment(appointment_id)
+
+
+APPOINTMENT_CASES = [
+    Case("appointment.create", _prepare_appointments, _run_create, scan=True),
+    Case("appointment.conflict_check", _prepare_conflicts, _run_conflict, scan=True),
+    Case("appointment.find_by_id", lambda fx, ops: fx.sample_ids(ops), _run_find, scan=True),
+    Case("appointment.filter_by_date", _prepare_dates, _run_filter_by_date, scan=True),
+    Case("appointment.filter_by_doctor", _prepare_doctors, _run_filter_by_doctor, scan=True),
+    Case("appointment.reschedule", _prepare_reschedules, _run_reschedule, scan=True),
+    Case("appointment.cancel", lambda fx, ops: fx.sample_ids(ops), _run_cancel, scan=True),
+]
+
+SUITES = (
+    ("patient", PatientFixture, PATIENT_CASES),
+    ("appointment", AppointmentFixture, APPOINTMENT_CASES),
+)
+
+
+# çalıştırma
+def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    ops: int = 1_000,
+    scan_budget: int = 20_000_000,
+    repeat: int = 3,
+    cases: Optional[Sequence[str]] = None,
+    seed: int = 2501,
+    log: Optional[Callable[[str], None]] = None
+) -> dict:
+    """ Seçilen senaryoları (ad önekine göre) her boyutta çalıştırır ve
+    JSON'a yazılabilir sonuç sözlüğünü döndürür """
+    results = []
+    for size in sizes:
+        for suite, fixture_cls, suite_cases in SUITES:
+            selected = [c for c in suite_cases if _selected(c.name, cases)]
+            if not selected:
+                continue
+
+            rng = random.Random(seed)
+            start = time.perf_counter()
+            fixture = fixture_cls(size, ops * repeat, rng)
+            setup = time.perf_counter() - start
+            results.append(_result(f"{suite}.setup", size, size, setup))
+            if log:
+                log(_format(results[-1]))
+
+            for case in selected:
+                count = ops
+                if case.scan:
+                    count = max(3, min(ops, scan_budget // max(size, 1)))
+                best = float("inf")
+                for _ in range(repeat):
+                    items = case.prepare(fixture, count)
+                    start = time.perf_counter()
+                    case.run(fixture, items)
+                    best = min(best, time.perf_counter() - start)
+                results.append(_result(case.name, size, count, best))
+                if log:
+                    log(_format(results[-1]))
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "sizes": list(sizes), "ops": ops, "scan_budget": scan_budget,
+            "repeat": repeat, "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.25) -> List[dict]:
+    """ Aynı (senaryo, boyut) sonuçlarını karşılaştırır. İşlem başına süre
+    oranı 1 + threshold'u aşarsa "regression", 1 / (1 + threshold)'un
+    altındaysa "improved", diğer durumlarda "ok" döner. """
+    previous = {(r["case"], r["size"]): r for r in baseline.get("results", ())}
+    rows = []
+    for result in current["results"]:
+        old = previous.get((result["case"], result["size"]))
+        if old is None or not old["us_per_op"]:
+            continue
+        ratio = result["us_per_op"] / old["us_per_op"]
+        if ratio > 1 + threshold:
+            verdict = "regression"
+        elif ratio < 1 / (1 + threshold):
+            verdict = "improved"
+        else:
+            verdict = "ok"
+        rows.append({
+            "case": result["case"], "size": result["size"],
+            "baseline_us": old["us_per_op"], "current_us": result["us_per_op"],
+            "ratio": round(ratio, 3), "verdict": verdict,
+        })
+    return rows
+
+
+def _selected(name: str, cases: Optional[Sequence[str]]) -> bool:
+    return not cases or any(name.startswith(prefix) for prefix in cases)
+
+
+def _result(case: str, size: int, ops: int, seconds: float) -> dict:
+    return {
+        "case": case, "size": size, "ops": ops, "seconds": seconds,
+        "us_per_op": seconds / ops * 1e6 if ops else 0.0,
+        "ops_per_sec": ops / seconds if seconds else 0.0,
+    }
+
+
+def _format(result: dict) -> str:
+    return (
+        f"{result['case']:<34} n={result['size']:>9} ops={result['ops']:>7} "
+        f"{result['us_per_op']:>12.2f} µs/işlem"
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--ops", type=int, default=1_000)
+    parser.add_argument("--scan-budget", type=int, default=20_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", nargs="+", help="senaryo adı önekleri (ör. patient. appointment.cancel)")
+    parser.add_argument("--seed", type=int, default=2501)
+    parser.add_argument("--output", help="sonuç JSON dosyası")
+    parser.add_argument("--baseline", help="karşılaştırılacak önceki sonuç JSON dosyası")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    report = run_suite(
+        args.sizes, args.ops, args.scan_budget, args.repeat, args.cases, args.seed, log=print
+    )
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            rows = compare(report, json.load(f), args.threshold)
+        report["comparison"] = {"baseline": args.baseline, "threshold": args.threshold, "rows": rows}
+
+        print(f"\nKarşılaştırma ({args.baseline}, eşik %{args.threshold * 100:.0f})")
+        for row in rows:
+            marker = {"regression": "GERİLEME", "improved": "iyileşme"}.get(row["verdict"], "")
+            print(
+                f"{row['case']:<34} n={row['size']:>9} {row['baseline_us']:>10.2f} -> "
+                f"{row['current_us']:>10.2f} µs  x{row['ratio']:<6} {marker}"
+            )
+        if any(row["verdict"] == "regression" for row in rows):
+            status = 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
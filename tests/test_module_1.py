@@ -1,3 +1,5 @@
+import pytest
+
 from app.modules.Patient.repository import PatientRepository
 from app.modules.Patient.service import PatientService
 from app.modules.Patient.outpatient import Outpatient
@@ -86,4 +88,1010 @@ def test_emergency_patient_triage():
     triage_area = patient.determine_triage_area()
 
     assert triage_area in ["Kırmızı", "Sarı", "Yeşil"]
-    assert patient.emergency_level in (1, 2, 3)
\ No newline at end of file
+    assert patient.emergency_level in (1, 2, 3)
+
+def test_repository_keeps_order_and_rejects_duplicates():
+    repo = PatientRepository()
+    patients = [
+        Outpatient(patient_id=None, name=f"Hasta {i}", age=20 + i, gender="kadın")
+        for i in range(3)
+    ]
+    for p in patients:
+        repo.add(p)
+
+    assert repo.list_all() == patients
+
+    duplicate = Outpatient(
+        patient_id=patients[0].patient_id, name="Veli", age=40, gender="erkek"
+    )
+    with pytest.raises(ValueError):
+        repo.add(duplicate)
+
+    repo.remove(patients[1].patient_id)
+    assert repo.get_by_id(patients[1].patient_id) is None
+    assert repo.list_all() == [patients[0], patients[2]]
+
+    with pytest.raises(ValueError):
+        repo.remove(patients[1].patient_id)
+
+
+def test_status_and_type_filters_follow_status_changes():
+    repo = PatientRepository()
+    service = PatientService(repo)
+
+    outpatient = Outpatient(
+        patient_id=None, name="Ali", age=28, gender="erkek",
+        appointment_date="2025-01-01"
+    )
+    emergency = EmergencyPatient(
+        patient_id=None, name="Can", age=40, gender="erkek", emergency_level=2
+    )
+    service.register_patient(outpatient)
+    service.register_patient(emergency)
+
+    assert repo.filter_by_status("acil") == [emergency]
+    assert service.list_emergency_patients() == [emergency]
+
+    outpatient.update_status("iptal")
+    assert repo.filter_by_status("aktif") == []
+    assert repo.filter_by_status("iptal") == [outpatient]
+    assert outpatient in service.list_active_patients()
+    assert outpatient not in repo.list_active_patients()
+
+    inpatient = service.admit_emergency_patient(emergency.patient_id)
+    assert service.list_emergency_patients() == []
+    assert repo.filter_by_type("inpatient") == [inpatient]
+
+    service.discharge_patient(inpatient.patient_id)
+    assert repo.filter_by_status("taburcu") == [inpatient]
+    assert inpatient not in service.list_active_patients()
+
+
+def test_filters_return_patients_in_registration_order():
+    repo = PatientRepository()
+    first = Outpatient(patient_id=None, name="Ali", age=28, gender="erkek")
+    emergency = EmergencyPatient(
+        patient_id=None, name="Can", age=40, gender="erkek", emergency_level=2
+    )
+    last = Outpatient(patient_id=None, name="Veli", age=35, gender="erkek")
+    for p in (first, emergency, last):
+        repo.add(p)
+
+    assert repo.list_active_patients() == [first, emergency, last]
+
+    first.update_status("iptal")
+    assert repo.filter_by_type("outpatient") == [first, last]
+
+
+def test_triage_queue_follows_priority_changes():
+    repo = PatientRepository()
+    service = PatientService(repo)
+
+    low = EmergencyPatient(
+        patient_id=None, name="Zeynep", age=30, gender="kadın", emergency_level=3
+    )
+    mid = EmergencyPatient(
+        patient_id=None, name="Emre", age=50, gender="erkek", emergency_level=2
+    )
+    outpatient = Outpatient(patient_id=None, name="Ali", age=28, gender="erkek")
+    for p in (outpatient, low, mid):
+        service.register_patient(p)
+
+    assert repo.peek_next_patients(2) == [mid, low]
+
+    low.escalate()
+    low.escalate()
+    assert repo.peek_next_patients(1) == [low]
+    assert repo.list_patients_by_priority(only_active=True) == [low, mid, outpatient]
+
+    service.discharge_patient(low.patient_id)
+    assert repo.pop_next_patient() is mid
+    assert repo.peek_next_patients(5) == [outpatient]
+    # kuyruktan çağrılan hasta aktif listede kalır
+    assert repo.list_patients_by_priority(only_active=True) == [mid, outpatient]
+    # durum değişikliği hastayı yeniden çağrılabilir yapar
+    mid.stabilize()
+    assert repo.peek_next_patients(5) == [mid, outpatient]
+
+
+def test_room_allocator_with_wards_and_multi_bed_rooms():
+    wards = [
+        {"ward": "Dahiliye", "floor": 1, "rooms": [{"number": 101, "beds": 2}]},
+        {"ward": "Cerrahi", "floor": 2, "rooms": [201]},
+    ]
+    repo = PatientRepository(wards=wards)
+    service = PatientService(repo)
+
+    first = service.register_patient(
+        Inpatient(patient_id=None, name="Ayşe", age=45, gender="kadın"), ward="Cerrahi"
+    )
+    second = service.register_patient(
+        Inpatient(patient_id=None, name="Fatma", age=60, gender="kadın")
+    )
+    third = service.register_patient(
+        Inpatient(patient_id=None, name="Hasan", age=70, gender="erkek")
+    )
+
+    assert first.room_number == 201
+    assert second.room_number == third.room_number == 101
+    assert repo.free_bed_count() == 0
+
+    with pytest.raises(ValueError):
+        repo.get_available_room()
+
+    service.discharge_patient(first.patient_id)
+    assert first.room_number is None
+    assert repo.get_available_room(floor=2) == 201
+    assert set(repo.list_rooms()) == {101}
+
+    with pytest.raises(ValueError):
+        third.room_number = 999
+    assert third.room_number == 101
+
+
+def test_columnar_store_stays_in_sync():
+    pytest.importorskip("numpy")
+    from app.modules.Patient.columnar import ColumnarPatientStore
+
+    repo = PatientRepository()
+    service = PatientService(repo)
+    young = Outpatient(patient_id=None, name="Ali", age=20, gender="erkek")
+    old = EmergencyPatient(
+        patient_id=None, name="Ayşe", age=80, gender="kadın", emergency_level=2
+    )
+    service.register_patient(young)
+
+    store = ColumnarPatientStore(repo)
+    service.register_patient(old)
+
+    assert store.count_by_status()["acil"] == 1
+    assert list(store.select_ids(min_age=65)) == [old.patient_id]
+
+    old.stabilize()
+    young.age = 70
+    assert store.count_by_status()["stabil"] == 1
+    assert sorted(store.select_ids(min_age=65)) == sorted([young.patient_id, old.patient_id])
+
+    repo.remove(young.patient_id)
+    assert len(store) == 1
+    assert store.count_by_type() == {"Outpatient": 0, "EmergencyPatient": 1}
+
+
+def test_compact_patients_keep_public_history_api():
+    from datetime import datetime
+
+    patient = Outpatient(
+        patient_id=None, name="Elif", age=33, gender="kadın",
+        appointment_date="2025-03-10"
+    )
+    patient.update_status("tamamlandı")
+
+    assert not hasattr(patient, "__dict__")
+    history = patient.get_status_history()
+    assert [status for status, _ in history] == ["aktif", "tamamlandı"]
+    assert all(isinstance(ts, datetime) for _, ts in history)
+    assert history[0][1] <= history[1][1]
+    assert patient.get_appointment_history() == ["2025-03-10"]
+
+
+def test_register_many_reports_row_errors_and_assigns_rooms():
+    wards = [{"ward": "Genel", "floor": 1, "rooms": [{"number": 101, "beds": 2}]}]
+    repo = PatientRepository(wards=wards)
+    service = PatientService(repo)
+
+    records = [
+        {"type": "Inpatient", "name": "Ayşe", "age": 45, "gender": "kadın"},
+        {"type": "Outpatient", "name": "Ali", "age": 130, "gender": "erkek"},
+        {"type": "EmergencyPatient", "name": "Can", "age": 30, "gender": "erkek",
+         "emergency_level": 2, "symptoms": ["kusma"]},
+        {"type": "Robot", "name": "R2", "age": 5, "gender": "erkek"},
+        {"type": "Inpatient", "name": "Fatma", "age": 60, "gender": "kadın"},
+        {"type": "Inpatient", "name": "Hasan", "age": 70, "gender": "erkek"},
+    ]
+
+    atomic = service.register_many(records, atomic=True)
+    assert atomic.registered == [] and repo.count() == 0
+
+    result = service.register_many(records)
+    assert [index for index, _ in result.errors] == [1, 3, 5]
+    assert [p.name for p in result.registered] == ["Ayşe", "Can", "Fatma"]
+    assert repo.free_bed_count() == 0
+    assert repo.list_room_occupants()[101] == [result.registered[0], result.registered[2]]
+    assert result.registered[1].symptoms == ["kusma"]
+
+
+def test_register_many_respects_inpatient_capacity():
+    wards = [{"ward": "Genel", "floor": 1, "rooms": [{"number": 101, "beds": 4}]}]
+    repo = PatientRepository(wards=wards, max_inpatients=2)
+    service = PatientService(repo)
+
+    records = [
+        {"type": "Inpatient", "name": f"Hasta {i}", "age": 40, "gender": "kadın"}
+        for i in range(4)
+    ]
+    records.append({"type": "Outpatient", "name": "Ali", "age": 30, "gender": "erkek"})
+
+    result = service.register_many(records)
+    assert [p.name for p in result.registered] == ["Hasta 0", "Hasta 1", "Ali"]
+    assert result.errors == [(2, "Yatan hasta kapasitesi dolu"), (3, "Yatan hasta kapasitesi dolu")]
+    assert repo.inpatient_count() == 2
+
+
+def test_sqlite_backend_persists_and_hydrates(tmp_path):
+    from app.modules.Patient.sqlite_repository import SQLitePatientRepository
+
+    path = str(tmp_path / "patients.db")
+    repo = SQLitePatientRepository(path)
+    service = PatientService(repo)
+
+    outpatient = service.register_patient(
+        Outpatient(patient_id=None, name="Ali", age=28, gender="erkek",
+                   appointment_date="2025-01-01")
+    )
+    emergency = EmergencyPatient(
+        patient_id=None, name="Can", age=40, gender="erkek", emergency_level=2
+    )
+    emergency.add_symptoms(["kusma"])
+    service.register_patient(emergency)
+    outpatient.update_status("tamamlandı")
+    repo.close()
+
+    reopened = SQLitePatientRepository(path)
+    service = PatientService(reopened)
+    assert reopened.count() == 2
+    assert [p.name for p in service.list_emergency_patients()] == ["Can"]
+
+    loaded = reopened.get_by_id(outpatient.patient_id)
+    assert loaded is reopened.get_by_id(outpatient.patient_id)
+    assert loaded.status == "tamamlandı"
+    assert loaded.get_appointment_history() == ["2025-01-01"]
+    assert [s for s, _ in loaded.get_status_history()] == ["aktif", "tamamlandı"]
+    assert reopened.get_by_id(emergency.patient_id).symptoms == ["kusma"]
+
+    # kimlik haritası kullanılmayan nesneleri tutmaz
+    reopened.list_all()
+    assert set(reopened._cache) == {outpatient.patient_id}
+    reopened.close()
+
+
+def test_journal_recovers_snapshot_and_tail(tmp_path):
+    from app.modules.Patient.journal import PatientJournal
+
+    directory = str(tmp_path / "journal")
+    journal = PatientJournal(directory)
+    with pytest.raises(ValueError):
+        journal.checkpoint()
+    with pytest.raises(ValueError):
+        journal.start_compaction()
+    repo = PatientRepository()
+    journal.recover(repo)
+
+    kept = Outpatient(patient_id=None, name="Ali", age=28, gender="erkek",
+                      appointment_date="2025-01-01")
+    removed = Outpatient(patient_id=None, name="Veli", age=35, gender="erkek")
+    repo.add(kept)
+    repo.add(removed)
+    journal.checkpoint()
+
+    kept.update_status("iptal")
+    repo.remove(removed.patient_id)
+    journal.close()
+
+    recovered = PatientRepository()
+    stats = PatientJournal(directory).recover(recovered)
+
+    assert stats.snapshot_patients == 2
+    assert stats.replayed_events == 2
+    restored = recovered.get_by_id(kept.patient_id)
+    assert [p.patient_id for p in recovered.list_all()] == [kept.patient_id]
+    assert restored.status == "iptal"
+    assert restored.get_status_history() == kept.get_status_history()
+    assert restored.get_appointment_history() == ["2025-01-01"]
+
+
+def test_journal_truncates_torn_record_before_appending(tmp_path):
+    import os
+    from app.modules.Patient.journal import PatientJournal
+
+    directory = str(tmp_path / "journal")
+    journal = PatientJournal(directory)
+    repo = PatientRepository()
+    journal.recover(repo)
+    repo.add(Outpatient(patient_id=None, name="Ali", age=28, gender="erkek"))
+    journal.close()
+
+    # yeniden başlatmadan sonra açılan segmentin ilk kaydı yarım kalmış
+    with open(os.path.join(directory, "journal-2.jsonl"), "w", encoding="utf-8") as f:
+        f.write('{"op": "add", "patient": {"name": "Ya')
+
+    repo = PatientRepository()
+    journal = PatientJournal(directory)
+    assert journal.recover(repo).replayed_events == 1
+    repo.add(Outpatient(patient_id=None, name="Veli", age=35, gender="erkek"))
+    repo.add(Outpatient(patient_id=None, name="Can", age=40, gender="erkek"))
+    journal.close()
+
+    recovered = PatientRepository()
+    stats = PatientJournal(directory).recover(recovered)
+    assert stats.replayed_events == 3
+    assert [p.name for p in recovered.list_all()] == ["Ali", "Veli", "Can"]
+
+
+def test_journal_checkpoint_runs_alongside_writers(tmp_path):
+    import threading
+    from app.modules.Patient.journal import PatientJournal
+
+    directory = str(tmp_path / "journal")
+    journal = PatientJournal(directory, group_size=1)
+    repo = PatientRepository()
+    journal.recover(repo)
+
+    def writer():
+        for i in range(200):
+            repo.add(Outpatient(patient_id=None, name=f"Hasta {i}", age=30, gender="erkek"))
+
+    threads = [threading.Thread(target=writer) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for _ in range(20):
+        journal.checkpoint()
+    for thread in threads:
+        thread.join(timeout=10)
+        assert not thread.is_alive()
+    journal.close()
+
+    recovered = PatientRepository()
+    PatientJournal(directory).recover(recovered)
+    assert recovered.count() == 400
+
+
+def test_journal_wait_durable_blocks_until_fsync(tmp_path):
+    import glob
+    import json
+    from app.modules.Patient.journal import PatientJournal
+
+    directory = str(tmp_path / "journal")
+    journal = PatientJournal(directory, commit_interval=60.0)
+    repo = PatientRepository()
+    journal.recover(repo)
+
+    patient = Outpatient(patient_id=None, name="Ali", age=28, gender="erkek")
+    repo.add(patient)
+    assert journal.wait_durable(timeout=5)
+
+    [segment] = glob.glob(str(tmp_path / "journal" / "journal-*.jsonl"))
+    with open(segment, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [r["patient"]["patient_id"] for r in records] == [patient.patient_id]
+    journal.close()
+
+
+def test_mapped_snapshot_materializes_lazily(tmp_path):
+    from app.modules.Patient.mapped_repository import MappedPatientRepository
+    from app.modules.Patient.snapshot import write_snapshot
+
+    source = PatientRepository()
+    first = Outpatient(patient_id=None, name="Ali", age=28, gender="erkek",
+                       appointment_date="2025-01-01")
+    second = EmergencyPatient(patient_id=None, name="Ayşe", age=40,
+                              gender="kadın", emergency_level=1)
+    source.add(first)
+    source.add(second)
+    first.update_status("iptal")
+
+    path = str(tmp_path / "patients.snap")
+    write_snapshot(path, source.list_all())
+
+    with MappedPatientRepository(path) as repo:
+        assert repo.count() == 2
+        assert repo.count_by(statuses=("iptal",)) == 1
+        assert repo._cache == {}
+
+        restored = repo.get_by_id(first.patient_id)
+        assert restored.get_status_history() == first.get_status_history()
+        assert repo.get_by_id(first.patient_id) is restored
+
+        restored.update_status("aktif")
+        assert repo.count_by(statuses=("iptal",)) == 0
+
+        repo.remove(second.patient_id)
+        added = Outpatient(patient_id=None, name="Veli", age=35, gender="erkek")
+        repo.add(added)
+        assert added.patient_id == second.patient_id + 1
+        assert [p.name for p in repo.list_all()] == ["Ali", "Veli"]
+
+
+@pytest.mark.parametrize("extension", ["csv", "jsonl"])
+def test_streaming_export_import_roundtrip(tmp_path, extension):
+    from app.modules.Patient.transfer import export_patients, import_file
+
+    source = PatientRepository()
+    outpatient = Outpatient(patient_id=None, name="Ali", age=28, gender="erkek",
+                            appointment_date="2025-01-01")
+    emergency = EmergencyPatient(patient_id=None, name="Ayşe", age=40,
+                                 gender="kadın", emergency_level=2)
+    emergency.add_symptoms(["ateş", "baş ağrısı"])
+    source.add(outpatient)
+    source.add(emergency)
+    outpatient.update_status("iptal")
+
+    path = str(tmp_path / f"patients.{extension}")
+    exported = export_patients(source.list_all(), path)
+    assert exported.rows == 2
+
+    # hatalı satır (geçersiz yaş) içe aktarmayı durdurmamalı
+    with open(path, "a", encoding="utf-8") as f:
+        if extension == "csv":
+            f.write("Outpatient,,Veli,200,erkek" + "," * 10 + "\n")
+        else:
+            f.write('{"type": "Outpatient", "name": "Veli", "age": 200, "gender": "erkek"}\n')
+
+    target = PatientRepository()
+    progress = []
+    stats = import_file(PatientService(target), path, chunk_size=2,
+                        progress=progress.append)
+
+    assert (stats.rows, stats.written, stats.error_count) == (3, 2, 1)
+    assert stats.errors[0][0] == 2
+    assert len(progress) == 2
+    for original in source.list_all():
+        assert target.get_by_id(original.patient_id).to_dict() == original.to_dict()
+
+
+def test_name_index_turkish_prefix_and_fuzzy_search():
+    from app.modules.Patient.name_index import NameIndex
+
+    repo = PatientRepository()
+    index = NameIndex(repo)
+    isil = Outpatient(patient_id=None, name="ışıl yılmaz", age=30, gender="KADIN")
+    ismail = Outpatient(patient_id=None, name="İSMAİL kaya", age=45, gender="erkek")
+    ilgaz = Outpatient(patient_id=None, name="ilgaz yıldız", age=20, gender="erkek")
+    for patient in (isil, ismail, ilgaz):
+        repo.add(patient)
+
+    assert isil.name == "Işıl Yılmaz"
+    assert ismail.name == "İsmail Kaya"
+    assert isil.gender == "Kadın"
+
+    assert index.prefix_search("IŞ") == [isil]
+    assert index.prefix_search("is") == [ismail]
+    assert index.prefix_search("yıl") == [ilgaz, isil]
+    assert index.prefix_search("ışıl yıl") == [isil]
+
+    assert index.fuzzy_search("smail kya") == [ismail]
+    assert index.fuzzy_search("yildiz")[0] is ilgaz
+
+    ilgaz.name = "ilgaz demir"
+    assert index.prefix_search("yıl") == [isil]
+    repo.remove(isil.patient_id)
+    assert index.prefix_search("ış") == []
+
+
+def test_triage_rulebook_default_and_batch():
+    from app.modules.Patient.triage import TriageRulebook, triage_patients
+
+    red = EmergencyPatient(patient_id=None, name="Ali", age=50, gender="erkek",
+                           emergency_level=1)
+    red.add_symptoms(["ateş", "GÖĞÜS AĞRISI"])
+    yellow = EmergencyPatient(patient_id=None, name="Ayşe", age=30,
+                              gender="kadın", emergency_level=1)
+    yellow.add_symptoms(["kusma"])
+    green = EmergencyPatient(patient_id=None, name="Can", age=20, gender="erkek",
+                             emergency_level=3)
+    green.add_symptoms(["öksürük"])
+
+    assert red.determine_triage_area() == "Kırmızı"
+    assert red.emergency_level == 3
+
+    assert triage_patients([red, yellow, green]) == ["Kırmızı", "Sarı", "Yeşil"]
+    assert (yellow.emergency_level, green.emergency_level) == (2, 1)
+
+    rulebook = TriageRulebook.from_description(
+        [{"area": "Sarı", "level": 2, "keywords": ["öksürük"]}]
+    )
+    assert green.determine_triage_area(rulebook) == "Sarı"
+    assert rulebook.classify(["gogus agrisi"]) == ("Yeşil", 1)
+
+
+def test_default_rulebook_matches_folded_spellings():
+    from app.modules.Patient.triage import DEFAULT_RULEBOOK
+
+    # eski str.lower() taramasının kaçırdığı yazımlar da eşleşir
+    assert DEFAULT_RULEBOOK.classify(["BILINÇ KAYBI"]) == ("Kırmızı", 3)
+    assert DEFAULT_RULEBOOK.classify(["nefes  darligi"]) == ("Kırmızı", 3)
+    assert DEFAULT_RULEBOOK.classify(["bas donmesi"]) == ("Sarı", 2)
+    assert DEFAULT_RULEBOOK.classify(["Siddetli Agri"]) == ("Sarı", 2)
+    assert DEFAULT_RULEBOOK.classify(["baş ağrısı"]) == ("Yeşil", 1)
+
+
+def test_intake_pipeline_triages_registers_and_admits():
+    import asyncio
+    from app.modules.Patient.intake import IntakePipeline
+
+    repo = PatientRepository()
+    service = PatientService(repo)
+    arrivals = [
+        '{"name": "Ali", "age": 50, "gender": "erkek", "emergency_level": 1,'
+        ' "symptoms": ["göğüs ağrısı"]}',
+        {"name": "Ayşe", "age": 30, "gender": "kadın", "emergency_level": 1,
+         "symptoms": ["kusma"]},
+        {"name": "", "age": 30, "gender": "kadın", "emergency_level": 1},
+        "{bozuk json",
+    ]
+
+    pipeline = IntakePipeline(service, queue_size=2, batch_size=2)
+    asyncio.run(pipeline.run(arrivals))
+
+    assert [p.name for p in pipeline.registered] == ["Ali", "Ayşe"]
+    assert [e[0] for e in pipeline.errors] == ["{bozuk json", arrivals[2]]
+    assert len(pipeline.admitted) == 1
+    assert isinstance(repo.get_by_id(pipeline.admitted[0].patient_id), Inpatient)
+    assert repo.get_by_id(pipeline.registered[1].patient_id).triage_area == "Sarı"
+
+    stats = pipeline.stats
+    assert stats["parse"].processed == 4
+    assert stats["register"].processed == 2
+    assert stats["parse"].max_queue_depth <= 2
+
+
+def test_intake_pipeline_survives_stage_errors():
+    import asyncio
+    from app.modules.Patient.intake import IntakePipeline
+
+    service = PatientService(PatientRepository())
+    register_many = service.register_many
+    calls = []
+
+    def flaky_register_many(records):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("veritabanı meşgul")
+        return register_many(records)
+
+    service.register_many = flaky_register_many
+    arrivals = [
+        {"name": f"Hasta {i}", "age": 30, "gender": "erkek", "emergency_level": 1}
+        for i in range(4)
+    ]
+
+    pipeline = IntakePipeline(service, queue_size=1, batch_size=2)
+    asyncio.run(asyncio.wait_for(pipeline.run(arrivals), timeout=10))
+
+    failed = [raw for raw, message in pipeline.errors if "veritabanı meşgul" in message]
+    assert failed and len(failed) + len(pipeline.registered) == 4
+
+
+def test_service_is_thread_safe_and_capacity_is_per_repository():
+    import sys
+    import threading
+    import time
+
+    wards = [{"ward": "Dahiliye", "floor": 1,
+              "rooms": [{"number": 100 + i, "beds": 2} for i in range(5)]}]
+    repo = PatientRepository(wards=wards)
+    service = PatientService(repo)
+    other = PatientRepository(wards=wards, max_inpatients=1)
+
+    outpatients = [Outpatient(patient_id=None, name=f"Hasta {i}", age=30,
+                              gender="erkek") for i in range(8)]
+    # repository'den önce çalışan yavaş bir dinleyici, alan değişikliği ile
+    # indeks güncellemesi arasındaki yarış aralığını genişletir
+    def slow_watcher(patient, field, old, new):
+        time.sleep(0)
+
+    for patient in outpatients:
+        patient.add_watcher(slow_watcher)
+    repo.add_many(outpatients)
+
+    admitted, rejected = [], []
+    barrier = threading.Barrier(16)
+
+    def admit(i):
+        barrier.wait()
+        patient = Inpatient(patient_id=None, name=f"Yatan {i}", age=40, gender="kadın")
+        patient.add_watcher(slow_watcher)
+        try:
+            service.register_patient(patient)
+            admitted.append(patient)
+        except ValueError:
+            rejected.append(patient)
+
+    def update(i):
+        barrier.wait()
+        for n in range(200):
+            target = outpatients[(i + n) % len(outpatients)]
+            service.update_patient_status(target.patient_id, ("stabil", "aktif")[n % 2])
+
+    old_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=admit, args=(i,)) for i in range(12)]
+        threads += [threading.Thread(target=update, args=(i,)) for i in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(old_interval)
+
+    # 10 yatak: fazla kabul yok, yatak ve kapasite sayaçları tutarlı
+    assert len(admitted) == 10 and len(rejected) == 2
+    assert repo.free_bed_count() == 0
+    assert repo.inpatient_count() == 10
+    assert sum(len(v) for v in repo.list_room_occupants().values()) == 10
+
+    # kayıp güncelleme yok: her güncelleme geçmişe ve kovalara yansımış
+    updates = sum(len(p.get_status_history()) - 1 for p in outpatients)
+    assert updates == 4 * 200
+    assert repo.count_by(patient_types=("Outpatient",)) == len(outpatients)
+    for patient in outpatients:
+        assert patient in repo.filter_by_status(patient.status)
+
+    # taburcu kapasiteyi boşaltır; diğer repository etkilenmez
+    threads = [threading.Thread(target=service.discharge_patient, args=(p.patient_id,))
+               for p in admitted]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert repo.inpatient_count() == 0 and repo.free_bed_count() == 10
+    assert other.inpatient_count() == 0
+    other.add(Inpatient(patient_id=None, name="Veli", age=50, gender="erkek", room_number=100))
+    with pytest.raises(ValueError):
+        other.add(Inpatient(patient_id=None, name="Can", age=50, gender="erkek",
+                            room_number=101))
+
+
+def test_sharded_repository_routes_ids_and_merges_queries():
+    from app.modules.Patient.sharding import ShardedPatientRepository
+
+    with ShardedPatientRepository(["Ada", "Bahar", "Deniz"]) as group:
+        ada = group.service("Ada").register_patient(
+            EmergencyPatient(None, "Ali", 40, "erkek", 2)
+        )
+        bahar = group.add(Outpatient(None, "Ayşe", 30, "kadın"), hospital="Bahar")
+        deniz = group.service("Deniz").register_patient(Inpatient(None, "Can", 60, "erkek"))
+        auto = [group.add(Outpatient(None, f"Hasta {i}", 20, "kadın")) for i in range(6)]
+
+        ids = [p.patient_id for p in [ada, bahar, deniz] + auto]
+        assert len(set(ids)) == len(ids)
+        assert [group.hospital_of(pid) for pid in ids[:3]] == ["Ada", "Bahar", "Deniz"]
+        assert group.count_by_hospital() == {"Ada": 3, "Bahar": 3, "Deniz": 3}
+        assert group.get_by_id(deniz.patient_id) is deniz
+        assert deniz.room_number is not None
+
+        with pytest.raises(ValueError):
+            group.add(Outpatient(ada.patient_id + 1, "Veli", 30, "erkek"), hospital="Ada")
+
+        assert group.count() == 9
+        assert group.count_by(statuses=("acil",)) == 1
+        assert group.filter_by_type("Inpatient") == [deniz]
+        priorities = [p.get_priority() for p in group.list_patients_by_priority()]
+        assert priorities == sorted(priorities, reverse=True)
+        assert group.peek_next_patients(1) == [group.list_patients_by_priority(True)[0]]
+
+        group.remove(bahar.patient_id)
+        assert group.get_by_id(bahar.patient_id) is None
+        assert group.count() == 8
+
+
+def test_change_capture_publishes_typed_events_in_batches():
+    from app.modules.Patient.events import (
+        ChangeCapture, EmergencyAdmitted, EventBus, PatientRegistered,
+        RoomAssigned, RoomReleased, StatusChanged,
+    )
+
+    repo = PatientRepository()
+    service = PatientService(repo)
+    bus = EventBus()
+    ChangeCapture(repo, bus)
+
+    batches = []
+    pushed = bus.subscribe(batches.append, batch_size=4)
+    pulled = bus.subscribe(event_types=(RoomAssigned, RoomReleased))
+    tiny = bus.subscribe(buffer_size=2)
+
+    emergency = service.register_patient(EmergencyPatient(None, "Ali", 50, "erkek", 2))
+    service.update_patient_status(emergency.patient_id, "stabil")
+    inpatient = service.admit_emergency_patient(emergency.patient_id)
+    room = inpatient.room_number
+    service.discharge_patient(inpatient.patient_id)
+
+    assert pushed.flush(timeout=5)
+    events = [e for batch in batches for e in batch]
+    assert [type(e) for e in events] == [
+        PatientRegistered, StatusChanged, EmergencyAdmitted, RoomAssigned,
+        RoomReleased, StatusChanged,
+    ]
+    assert [e.seq for e in events] == list(range(1, 7))
+    assert all(len(batch) <= 4 for batch in batches)
+    assert events[2].emergency_patient is emergency and events[2].patient is inpatient
+    assert (events[-1].old, events[-1].new) == ("aktif", "taburcu")
+
+    assert [(type(e), e.room_number) for e in pulled.poll()] == [
+        (RoomAssigned, room), (RoomReleased, room),
+    ]
+    assert pulled.poll() == []
+
+    assert [e.seq for e in tiny.poll()] == [5, 6]
+    assert tiny.dropped == 4
+
+    bus.close()
+    assert pushed.delivered == 6
+
+
+def test_census_counters_follow_registrations_and_transitions():
+    repo = PatientRepository()
+    service = PatientService(repo)
+    service.register_patient(Outpatient(None, "Ali", 30, "erkek"))
+    assert service.census().total == 1
+
+    red = service.register_patient(EmergencyPatient(None, "Ayşe", 40, "kadın", 1))
+    red.add_symptoms(["göğüs ağrısı"])
+    red.determine_triage_area()
+    yellow = service.register_patient(EmergencyPatient(None, "Can", 20, "erkek", 2))
+    yellow.add_symptoms(["kusma"])
+    yellow.determine_triage_area()
+    inpatient = service.register_patient(Inpatient(None, "Deniz", 70, "kadın"))
+    service.admit_emergency_patient(red.patient_id)
+    service.discharge_patient(inpatient.patient_id)
+    yellow.escalate()
+
+    census = service.census()
+    emergency = service.list_emergency_patients()
+    assert census.total == service.total_patient_count() == 4
+    assert census.active == len(service.list_active_patients()) == 3
+    assert census.emergency == len(emergency) == 1
+    assert census.inpatients == len(service.list_patients_by_type("Inpatient")) == 2
+    assert census.by_status == {"aktif": 2, "acil": 1, "taburcu": 1}
+    assert census.by_triage_area == {"Sarı": 1}
+    assert vars(PatientService(repo).census()) == vars(census)
+
+    service.discharge_patient(yellow.patient_id)
+    repo.remove(inpatient.patient_id)
+    census = service.census()
+    assert (census.total, census.active, census.emergency) == (3, 2, 0)
+    assert census.by_triage_area == {}
+
+
+def test_status_timeline_answers_point_in_time_census():
+    from datetime import datetime, timedelta
+    from app.modules.Patient.base import PatientBase
+    from app.modules.Patient.census import StatusTimeline
+
+    night = datetime(2026, 3, 10)
+
+    def at(hours):
+        return night + timedelta(hours=hours)
+
+    def with_history(patient, *history):
+        data = patient.to_dict()
+        data["status"] = history[-1][1]
+        data["status_log"] = [
+            round(at(h).timestamp() * 1e6) << 3 | PatientBase._status_codes[s]
+            for h, s in history
+        ]
+        return PatientBase.restore(data)
+
+    repo = PatientRepository()
+    a = with_history(Outpatient(1, "Ali", 30, "erkek"), (1, "aktif"), (3, "acil"), (6, "taburcu"))
+    repo.add(a)
+    timeline = StatusTimeline(repo, block_size=2)
+    b = with_history(Outpatient(2, "Ayşe", 40, "kadın"), (2, "acil"), (4, "stabil"))
+    c = with_history(Outpatient(3, "Can", 50, "erkek"), (5, "aktif"))
+    repo.add(c)
+    repo.add(b)
+
+    assert sum(timeline.census_at(at(0)).values()) == 0
+    assert timeline.census_at(at(3.5))["acil"] == 2
+    census = timeline.census_at(at(5.5))
+    assert (census["acil"], census["stabil"], census["aktif"]) == (1, 1, 1)
+
+    between = timeline.census_between(at(2.5), at(4.5))
+    assert (between["aktif"], between["acil"], between["stabil"]) == (1, 2, 1)
+    assert timeline.transitions_between(at(2.5), at(4.5)) == [
+        (at(3), 1, "aktif", "acil"), (at(4), 2, "acil", "stabil"),
+    ]
+
+    PatientService(repo).update_patient_status(3, "stabil")
+    repo.remove(2)
+    now = datetime.now() + timedelta(seconds=1)
+    census = timeline.census_at(now)
+    assert (census["stabil"], census["taburcu"], census["aktif"]) == (1, 1, 0)
+    assert timeline.census_at(at(5.5))["stabil"] == 1
+
+
+def test_analytics_length_of_stay_and_transition_times():
+    pytest.importorskip("numpy")
+    from datetime import datetime, timedelta
+    from app.modules.Patient.analytics import PatientAnalytics
+    from app.modules.Patient.base import PatientBase
+
+    start = datetime(2026, 3, 1)
+
+    def with_history(patient, *history):
+        data = patient.to_dict()
+        data["status"] = history[-1][1]
+        data["status_log"] = [
+            round((start + timedelta(hours=h)).timestamp() * 1e6) << 3
+            | PatientBase._status_codes[s]
+            for h, s in history
+        ]
+        return PatientBase.restore(data)
+
+    repo = PatientRepository()
+    service = PatientService(repo)
+
+    red = with_history(
+        EmergencyPatient(1, "Ali", 50, "erkek", 1), (0, "acil"), (2, "stabil")
+    )
+    red.add_symptoms(["göğüs ağrısı"])
+    red.determine_triage_area()
+    repo.add(red)
+    inpatient = service.admit_emergency_patient(1)
+    inpatient._status_log[-1] = (
+        round((start + timedelta(hours=3)).timestamp() * 1e6) << 3
+        | PatientBase._status_codes["aktif"]
+    )
+
+    repo.add(with_history(
+        Outpatient(2, "Ayşe", 30, "kadın"),
+        (0, "aktif"), (1, "tamamlandı"), (5, "aktif"), (6, "tamamlandı"),
+    ))
+    repo.add(with_history(Inpatient(3, "Can", 70, "erkek"), (0, "aktif"), (48, "taburcu")))
+
+    analytics = PatientAnalytics.from_storage(repo)
+    assert len(analytics) == 9
+
+    los = analytics.length_of_stay(group_by="type")
+    assert list(los["Outpatient"]) == [1.0]
+    assert list(los["Inpatient"]) == [48.0]
+
+    assert list(analytics.time_to_stabilize()["tümü"]) == [2.0]
+    assert {k: list(v) for k, v in analytics.time_to_admission("triage_area").items()} == {
+        "Kırmızı": [3.0], "-": [],
+    }
+
+    rates = analytics.readmission_rate(window_days=1, group_by="type")
+    assert rates == {"Inpatient": 0.0, "Outpatient": 0.0}
+    analytics.codes[analytics.codes == PatientBase._status_codes["tamamlandı"]] = (
+        PatientBase._status_codes["taburcu"]
+    )
+    assert analytics.readmission_rate(window_days=1) == {"tümü": 0.5}
+
+    summary = PatientAnalytics.summarize(los)
+    assert summary["Outpatient"]["median"] == 1.0
+
+
+def test_rendered_views_are_cached_until_patient_changes():
+    import io
+    from app.modules.Patient.render import write_patient_list
+
+    repo = PatientRepository()
+    service = PatientService(repo)
+    emergency = EmergencyPatient(None, "Ali", 50, "erkek", 2)
+    first = emergency.detailed_info()
+    assert "Triyaj Alanı  : -" in first and emergency.triage_area is None
+    assert emergency.detailed_info() is first
+
+    service.register_patient(emergency)
+    assert f"Hasta ID      : {emergency.patient_id}" in emergency.detailed_info()
+    line = emergency.summary_line()
+    assert emergency.summary_line() is line
+
+    emergency.escalate()
+    assert "Acil Seviye   : 1" in emergency.detailed_info()
+    assert "Seviye=1" in emergency.summary_line()
+
+    inpatient = service.register_patient(Inpatient(None, "Ayşe", 70, "kadın"))
+    outpatient = Outpatient(None, "Can", 30, "erkek")
+    outpatient.detailed_info()
+    outpatient.appointment_date = "2026-05-01"
+    assert outpatient.detailed_info().endswith("Randevu Tarihi: 2026-05-01")
+
+    out = io.StringIO()
+    written = write_patient_list(
+        (p for p in [emergency, inpatient]), out, title="Liste", chunk_size=1
+    )
+    assert written == 2
+    assert out.getvalue() == (
+        f"\nListe\n1. {emergency.summary_line()}\n2. {inpatient.summary_line()}\n"
+    )
+    assert f"Oda={inpatient.room_number}" in inpatient.summary_line()
+
+    empty = io.StringIO()
+    assert write_patient_list([], empty) == 0
+    assert empty.getvalue() == "Kayıt bulunamadı.\n"
+
+
+def test_emergency_admission_keeps_history_position_and_capacity(tmp_path):
+    from app.modules.Patient.census import StatusTimeline
+    from app.modules.Patient.sqlite_repository import SQLitePatientRepository
+
+    wards = [{"ward": "Dahiliye", "floor": 1, "rooms": [{"number": 101, "beds": 1}]}]
+    repo = PatientRepository(wards=wards, max_inpatients=1)
+    service = PatientService(repo)
+    timeline = StatusTimeline(repo)
+
+    first = service.register_patient(Outpatient(None, "Can", 30, "erkek"))
+    emergency = EmergencyPatient(None, "Ali", 50, "erkek", 2)
+    emergency.add_symptoms(["göğüs ağrısı"])
+    emergency.determine_triage_area()
+    service.register_patient(emergency)
+    last = service.register_patient(Outpatient(None, "Ayşe", 40, "kadın"))
+    emergency.stabilize()
+    service.census()
+
+    inpatient = service.admit_emergency_patient(emergency.patient_id)
+    assert inpatient.patient_id == emergency.patient_id
+    assert [s for s, _ in inpatient.get_status_history()] == ["acil", "stabil", "aktif"]
+    assert inpatient.emergency_record.triage_area == "Kırmızı"
+    assert inpatient.emergency_record.symptoms == ("göğüs ağrısı",)
+    assert inpatient.admitted_at == inpatient.get_status_history()[-1][1]
+    assert "Triyaj Alanı  : Kırmızı" in inpatient.detailed_info()
+
+    assert repo.list_all() == [first, inpatient, last]
+    assert repo.filter_by_type("emergencypatient") == []
+    assert repo.filter_by_type("inpatient") == [inpatient]
+    assert inpatient.room_number == 101 and repo.free_bed_count() == 0
+    census = service.census()
+    assert (census.emergency, census.inpatients) == (0, 1)
+    assert timeline.census_at(inpatient.admitted_at)["aktif"] == 3
+    assert len(timeline) == 5
+
+    # kapasite dolu: ikinci yatış reddedilir, acil kayıt yerinde kalır
+    other = service.register_patient(EmergencyPatient(None, "Ece", 20, "kadın", 1))
+    with pytest.raises(ValueError):
+        service.admit_emergency_patient(other.patient_id)
+    assert repo.get_by_id(other.patient_id) is other
+
+    service.discharge_patient(inpatient.patient_id)
+    assert repo.free_bed_count() == 1
+
+    # SQLite: satır yerinde güncellenir, acil kaydı saklanır
+    path = str(tmp_path / "hastalar.db")
+    with SQLitePatientRepository(path, wards=wards) as db:
+        db_service = PatientService(db)
+        db_service.register_patient(Outpatient(None, "Can", 30, "erkek"))
+        red = db_service.register_patient(EmergencyPatient(None, "Ali", 50, "erkek", 1))
+        db_service.register_patient(Outpatient(None, "Ayşe", 40, "kadın"))
+        db_service.admit_emergency_patient(red.patient_id)
+    with SQLitePatientRepository(path, wards=wards) as db:
+        restored = db.list_all()[1]
+        assert restored.patient_id == red.patient_id
+        assert isinstance(restored, Inpatient) and restored.room_number == 101
+        assert restored.emergency_record.emergency_level == 1
+        assert [s for s, _ in restored.get_status_history()] == ["acil", "aktif"]
+
+
+def test_appointment_date_index_follows_changes_and_history(tmp_path):
+    from datetime import date
+    from app.modules.Patient.sqlite_repository import SQLitePatientRepository
+
+    with pytest.raises(ValueError):
+        Outpatient(None, "Ali", 30, "erkek", "20250101")
+    with pytest.raises(ValueError):
+        Outpatient(None, "Ali", 30, "erkek", "2025-02-30")
+
+    for repo in (PatientRepository(), SQLitePatientRepository(str(tmp_path / "h.db"))):
+        service = PatientService(repo)
+        first = service.register_patient(Outpatient(None, "Ali", 30, "erkek", "2025-03-10"))
+        second = service.register_patient(
+            Outpatient(None, "Ayşe", 40, "kadın", date(2025, 3, 10))
+        )
+        later = service.register_patient(Outpatient(None, "Can", 50, "erkek", "2025-03-11"))
+
+        assert second.appointment_date == "2025-03-10"
+        assert second.appointment_day == date(2025, 3, 10)
+        assert service.list_patients_by_appointment_date("2025-03-10") == [first, second]
+
+        later.appointment_date = date(2025, 3, 10)
+        assert repo.filter_by_appointment_date(date(2025, 3, 11)) == []
+
+        first.update_status("tamamlandı")
+        assert first.appointment_date is None
+        assert first.get_appointment_history() == ["2025-03-10"]
+        assert repo.filter_by_appointment_date("2025-03-10") == [second, later]
+
+        repo.remove(second.patient_id)
+        assert repo.filter_by_appointment_date("2025-03-10") == [later]
@@ -0,0 +1,113 @@
+import pytest
+from datetime import datetime
+
+from app.modules.appointment.repository import AppointmentRepository
+from app.modules.appointment.implementations import AppointmentService
+from app.modules.appointment.routineappointment import RoutineAppointment
+from app.modules.appointment.emergencyappointment import EmergencyAppointment
+
+
+def test_metrics_record_calls_errors_and_scan_sizes(tmp_path):
+    from app.metrics import MetricsDumper, MetricsRegistry
+
+    repo = AppointmentRepository()
+    service = AppointmentService(repo)
+    registry = MetricsRegistry()
+    registry.instrument(service)
+    registry.instrument(repo)
+
+    when = datetime(2030, 1, 1, 10, 0)
+    service.create_appointment(RoutineAppointment(1, 10, "Dr. Ayşe", when, 101))
+    service.create_appointment(EmergencyAppointment(2, 11, "Dr. Can", when))
+    with pytest.raises(ValueError):
+        service.create_appointment(EmergencyAppointment(3, 12, "Dr. Ayşe", when))
+    service.cancel_appointment(1)
+
+    create = registry.stats("appointment_service", "create_appointment")
+    assert (create.calls, create.errors, create.latency.count) == (3, 1, 3)
+    conflict = registry.stats("appointment_repository", "has_time_conflict")
+    assert conflict.calls == 3
+    assert conflict.scanned.total == 0 + 1 + 2
+
+    text = registry.render()
+    assert (
+        'hospital_calls_total{component="appointment_service",method="create_appointment"} 3'
+        in text
+    )
+    assert (
+        'hospital_errors_total{component="appointment_service",method="create_appointment"} 1'
+        in text
+    )
+    assert (
+        'hospital_call_duration_seconds_bucket{component="appointment_service",'
+        'method="create_appointment",le="+Inf"} 3' in text
+    )
+    assert "# TYPE hospital_scanned_records histogram" in text
+
+    path = str(tmp_path / "metrics.prom")
+    with MetricsDumper(registry, path, interval=60):
+        service.list_all()
+    with open(path, encoding="utf-8") as f:
+        assert 'method="list_all"} 1' in f.read()
+
+    registry.uninstrument(service)
+    assert "create_appointment" not in vars(service)
+    service.list_all()
+    assert registry.stats("appointment_service", "list_all").calls == 1
+
+
+def test_metrics_scan_size_follows_buckets_actually_visited():
+    from app.metrics import MetricsRegistry
+    from app.modules.Patient.outpatient import Outpatient
+    from app.modules.Patient.repository import PatientRepository
+
+    repo = PatientRepository()
+    patients = [Outpatient(None, f"Hasta {i}", 30, "erkek") for i in range(5)]
+    repo.add_many(patients)
+    for patient in patients[:3]:
+        patient.update_status("tamamlandı")
+
+    registry = MetricsRegistry()
+    registry.instrument(repo)
+    repo.list_patients_by_priority(only_active=True)
+    repo.list_patients_by_priority()
+    repo.filter_by(statuses=["aktif"])
+
+    by_priority = registry.stats("patient_repository", "list_patients_by_priority")
+    assert by_priority.scanned.total == 2 + 5
+    assert registry.stats("patient_repository", "filter_by").scanned is None
+    assert registry.stats("patient_repository", "count_by").calls == 0
+
+
+def test_benchmark_suite_writes_json_and_flags_regressions(tmp_path):
+    import copy
+    import json
+    from benchmarks.suite import APPOINTMENT_CASES, PATIENT_CASES, compare, main, run_suite
+
+    report = run_suite(sizes=[60], ops=4, repeat=1)
+    cases = [r["case"] for r in report["results"]]
+    assert cases == (
+        ["patient.setup"] + [c.name for c in PATIENT_CASES]
+        + ["appointment.setup"] + [c.name for c in APPOINTMENT_CASES]
+    )
+    assert all(r["size"] == 60 and r["us_per_op"] >= 0 for r in report["results"])
+
+    baseline = copy.deepcopy(report)
+    for result in baseline["results"]:
+        result["us_per_op"] = result["us_per_op"] / 2 or 1e-9
+    rows = compare(report, baseline, threshold=0.25)
+    assert {row["verdict"] for row in rows} == {"regression"}
+
+    for result in baseline["results"]:
+        result["us_per_op"] = 1e-9
+    baseline_path = tmp_path / "baseline.json"
+    baseline_path.write_text(json.dumps(baseline), encoding="utf-8")
+    output = tmp_path / "current.json"
+    status = main([
+        "--sizes", "60", "--ops", "3", "--repeat", "1", "--cases", "appointment.cancel",
+        "--baseline", str(baseline_path), "--output", str(output),
+    ])
+    saved = json.loads(output.read_text(encoding="utf-8"))
+    assert [r["case"] for r in saved["results"]] == ["appointment.setup", "appointment.cancel"]
+    assert [r["verdict"] for r in saved["comparison"]["rows"]] == ["regression"] * 2
+    assert status == 1